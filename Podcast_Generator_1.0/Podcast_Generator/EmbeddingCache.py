@@ -0,0 +1,196 @@
+"""
+EmbeddingCache.py
+=================
+
+Cache persistant des embeddings du projet Podcast Generator.
+
+`create_script_rag_modulaire` réencodait à chaque appel tous les résumés partiels et la requête, et la liste
+des tons était réencodée à chaque processus. Ce module conserve les vecteurs déjà calculés sur le disque :
+
+- Clé : empreinte SHA-256 du texte normalisé (Unicode NFC, espaces réduits), un dossier par modèle
+- Valeur : vecteur float16 rangé dans un fichier binaire lu par `numpy.memmap` (une ligne par texte)
+- Index JSON clé → ligne, écrit de façon atomique après les vecteurs : un index ne désigne jamais une ligne absente
+- Statistiques de succès / échecs pour mesurer les inférences évitées
+
+Utilisé par `EmbeddingService` entre son cache LRU en mémoire et le modèle : une exécution répétée
+(même document, mêmes tons) ne demande plus aucune inférence.
+
+Les écritures sont prévues pour un seul processus à la fois (le processus qui génère le script).
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+import numpy as np
+
+# Dossier du cache (surchargeable par la variable d'environnement PODCAST_EMBEDDING_CACHE_DIR).
+CACHE_DIR = Path(os.environ.get("PODCAST_EMBEDDING_CACHE_DIR", Path(__file__).resolve().parent / "Cache" / "Embeddings"))
+
+# Type des vecteurs stockés : moitié de la taille du float32, écart négligeable sur une similarité cosinus.
+VECTOR_DTYPE = np.float16
+
+
+def normalize_text(text):
+    """Normalise un texte avant hachage : forme Unicode NFC, espaces réduits, sans espaces de bord."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def text_key(text, variant=""):
+    """
+    Clé d'un texte dans le cache.
+
+    Args:
+        text (str): Texte encodé.
+        variant (str): Paramètre d'encodage qui change le vecteur (ex: "normalized").
+
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    return hashlib.sha256(f"{variant}|{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Vecteurs d'un modèle conservés sur le disque (float16, memmap) avec un index clé → ligne.
+
+    Exemple :
+        cache = EmbeddingCache("sentence-transformers/all-MiniLM-L6-v2")
+        vectors = cache.get_many(["sérieux", "joyeux"])   # [np.ndarray ou None, ...]
+        cache.put_many(["joyeux"], [vecteur])
+    """
+
+    def __init__(self, model_name, cache_dir=None):
+        """
+        Args:
+            model_name (str): Nom du modèle (un sous-dossier par modèle : les vecteurs ne se mélangent pas).
+            cache_dir (str, optional): Dossier du cache. Par défaut CACHE_DIR.
+        """
+        self.model_name = model_name
+        self.directory = Path(cache_dir or CACHE_DIR) / re.sub(r"[^\w.-]+", "_", model_name)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._load()
+
+    @property
+    def _index_path(self):
+        return self.directory / "index.json"
+
+    @property
+    def _vectors_path(self):
+        return self.directory / "vectors.f16"
+
+    def _load(self):
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        self.dimension = index.get("dimension")
+        self._rows = index.get("rows", {})
+        self._vectors = None
+        # Lignes écrites sans index (processus interrompu entre les deux écritures) : retirées.
+        if self._vectors_path.exists():
+            expected_size = len(self._rows) * (self.dimension or 0) * np.dtype(VECTOR_DTYPE).itemsize
+            if self._vectors_path.stat().st_size != expected_size:
+                with open(self._vectors_path, "r+b") as f:
+                    f.truncate(expected_size)
+
+    def _memmap(self):
+        if self._vectors is None or len(self._vectors) != len(self._rows):
+            self._vectors = np.memmap(self._vectors_path, dtype=VECTOR_DTYPE, mode="r", shape=(len(self._rows), self.dimension))
+        return self._vectors
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get_many(self, texts, variant=""):
+        """
+        Recherche les vecteurs de plusieurs textes.
+
+        Args:
+            texts (list[str]): Textes recherchés.
+            variant (str): Paramètre d'encodage (voir text_key).
+
+        Returns:
+            list: Vecteur float32 de chaque texte trouvé, None pour chaque texte absent.
+        """
+        with self._lock:
+            rows = [self._rows.get(text_key(text, variant)) for text in texts]
+            found = [row for row in rows if row is not None]
+            self.hits += len(found)
+            self.misses += len(rows) - len(found)
+            if not found:
+                return [None] * len(rows)
+            vectors = self._memmap()
+            return [None if row is None else np.asarray(vectors[row], dtype=np.float32) for row in rows]
+
+    def put_many(self, texts, vectors, variant=""):
+        """
+        Enregistre les vecteurs de plusieurs textes (les textes déjà présents sont ignorés).
+
+        Args:
+            texts (list[str]): Textes encodés.
+            vectors (np.ndarray): Matrice (len(texts), dimension) des vecteurs.
+            variant (str): Paramètre d'encodage (voir text_key).
+        """
+        vectors = np.asarray(vectors)
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = int(vectors.shape[1])
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(f"Dimension {vectors.shape[1]} incompatible avec le cache ({self.dimension})")
+
+            new_rows = {}
+            new_vectors = []
+            for text, vector in zip(texts, vectors):
+                key = text_key(text, variant)
+                if key not in self._rows and key not in new_rows:
+                    new_rows[key] = len(self._rows) + len(new_rows)
+                    new_vectors.append(vector)
+            if not new_rows:
+                return
+
+            # Vecteurs d'abord, index ensuite (écriture atomique) : l'index ne désigne jamais une ligne absente.
+            # Projection fermée avant l'ajout (Windows refuse d'agrandir un fichier projeté).
+            self._vectors = None
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.asarray(new_vectors, dtype=VECTOR_DTYPE).tobytes())
+            self._rows.update(new_rows)
+            tmp_path = self._index_path.with_name(f"index.json.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model_name, "dimension": self.dimension, "rows": self._rows}, f)
+            os.replace(tmp_path, self._index_path)
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'entries', 'hits', 'misses', 'hit_rate', 'bytes'} : vecteurs stockés, textes trouvés / absents
+                  depuis l'ouverture du cache, taux de succès et taille du fichier de vecteurs.
+        """
+        lookups = self.hits + self.misses
+        size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        return {"entries": len(self._rows), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0, "bytes": size}
+
+    def clear(self):
+        """
+        Supprime tous les vecteurs du modèle.
+
+        Returns:
+            int: Nombre de vecteurs supprimés.
+        """
+        with self._lock:
+            removed = len(self._rows)
+            self._vectors = None
+            self._vectors_path.unlink(missing_ok=True)
+            self._index_path.unlink(missing_ok=True)
+            self._rows = {}
+            self.dimension = None
+        return removed
@@ -0,0 +1,386 @@
+"""
+EmbeddingService.py
+===================
+
+Service d'embeddings partagé du projet Podcast Generator.
+
+`PodcastScriptGenerator` et `PodcastDialogueGenerator` chargeaient chacun leur propre `SentenceTransformer`
+dès l'import et y encodaient la liste des tons : deux chargements du modèle par processus, avant même
+qu'un embedding soit nécessaire. Ce module :
+
+- Charge le modèle une seule fois par processus, au premier `encode` (import de sentence-transformers compris)
+- Encode par lots, sur le périphérique et avec le nombre de threads configurés
+- Garde en mémoire (cache LRU) les vecteurs des textes déjà encodés : liste des tons, requêtes répétées...
+- Conserve aussi les vecteurs sur le disque d'une exécution à l'autre (voir EmbeddingCache.py)
+- Retourne des vecteurs NumPy normalisés : la similarité cosinus est un simple produit scalaire
+- Propose, pour les machines sans GPU, un moteur ONNX Runtime (export ONNX ou quantifié int8 du même modèle),
+  sans PyTorch : vecteurs compatibles à une tolérance près (voir tests/bench_embedding_backends.py)
+
+Configuration : constantes ci-dessous, surchargeables par les variables d'environnement PODCAST_EMBEDDING_*.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+# Modèle sentence-transformers utilisé pour tous les embeddings du projet.
+EMBEDDING_MODEL = os.environ.get("PODCAST_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Moteur d'inférence : "torch" (sentence-transformers) ou "onnx" (onnxruntime + tokenizers, sans PyTorch).
+EMBEDDING_BACKEND = os.environ.get("PODCAST_EMBEDDING_BACKEND", "torch")
+
+# Fichier ONNX du moteur "onnx", relatif au dossier (ou dépôt Hugging Face) du modèle ; les dépôts
+# sentence-transformers publient onnx/model.onnx (float32) et des versions quantifiées int8.
+EMBEDDING_ONNX_FILE = os.environ.get("PODCAST_EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+
+# Périphérique ("cpu", "cuda", "mps"...) ; None : choix automatique de sentence-transformers.
+EMBEDDING_DEVICE = os.environ.get("PODCAST_EMBEDDING_DEVICE") or None
+
+# Nombre de threads d'inférence sur CPU (PyTorch ou ONNX Runtime) ; None : valeur par défaut du moteur.
+EMBEDDING_THREADS = int(os.environ.get("PODCAST_EMBEDDING_THREADS", "0")) or None
+
+# Taille des lots envoyés au modèle, et nombre de vecteurs gardés dans le cache LRU.
+EMBEDDING_BATCH_SIZE = int(os.environ.get("PODCAST_EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_CACHE_SIZE = int(os.environ.get("PODCAST_EMBEDDING_CACHE_SIZE", "4096"))
+
+# Cache persistant des vecteurs (voir EmbeddingCache.py) ; PODCAST_EMBEDDING_PERSISTENT_CACHE=0 pour le désactiver.
+EMBEDDING_PERSISTENT_CACHE = os.environ.get("PODCAST_EMBEDDING_PERSISTENT_CACHE", "1") != "0"
+
+
+def mean_pooling(token_embeddings, attention_mask):
+    """
+    Moyenne des embeddings de tokens pondérée par le masque d'attention (pooling des modèles sentence-transformers).
+
+    Args:
+        token_embeddings (np.ndarray): Sortie du modèle (lot, tokens, dimension).
+        attention_mask (np.ndarray): Masque (lot, tokens), 1 pour les vrais tokens, 0 pour le remplissage.
+
+    Returns:
+        np.ndarray: Matrice (lot, dimension) en float32.
+    """
+    mask = np.asarray(attention_mask, dtype=np.float32)[:, :, None]
+    summed = (np.asarray(token_embeddings, dtype=np.float32) * mask).sum(axis=1)
+    return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+class OnnxSentenceEncoder:
+    """
+    Modèle sentence-transformers exporté en ONNX, exécuté par ONNX Runtime sur CPU (tokenizer Hugging Face
+    `tokenizers`, pooling moyen). Même méthode `encode` que `SentenceTransformer` : interchangeable dans
+    `EmbeddingService`.
+    """
+
+    def __init__(self, model_name, onnx_file=EMBEDDING_ONNX_FILE, threads=None):
+        """
+        Args:
+            model_name (str): Dossier local du modèle, ou nom du dépôt Hugging Face (fichiers téléchargés au besoin).
+            onnx_file (str): Chemin du fichier ONNX dans ce dossier.
+            threads (int, optional): Nombre de threads ONNX Runtime. None : valeur par défaut.
+        """
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        directory = Path(model_name)
+        if not directory.is_dir():
+            from huggingface_hub import snapshot_download
+            directory = Path(snapshot_download(model_name, allow_patterns=[onnx_file, "tokenizer.json", "sentence_bert_config.json"]))
+
+        if not (directory / onnx_file).is_file():
+            raise FileNotFoundError(f"Fichier ONNX introuvable : {directory / onnx_file}")
+
+        max_seq_length = 512
+        config_path = directory / "sentence_bert_config.json"
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                max_seq_length = json.load(f).get("max_seq_length", max_seq_length)
+
+        self.tokenizer = Tokenizer.from_file(str(directory / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(str(directory / onnx_file), sess_options=options,
+                                                    providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, convert_to_numpy=True, show_progress_bar=False):
+        """
+        Encode une liste de textes (mêmes arguments que `SentenceTransformer.encode`).
+
+        Returns:
+            np.ndarray: Matrice (len(texts), dimension) en float32.
+        """
+        # Lots de longueurs voisines (comme sentence-transformers) : moins de remplissage à calculer.
+        order = sorted(range(len(texts)), key=lambda position: -len(texts[position]))
+        vectors = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            encodings = self.tokenizer.encode_batch([texts[position] for position in batch])
+            inputs = {
+                "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+                "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+                "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+            }
+            token_embeddings = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+            pooled = mean_pooling(token_embeddings, inputs["attention_mask"])
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            for position, vector in zip(batch, pooled):
+                vectors[position] = vector
+        return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+
+class EmbeddingService:
+    """
+    Encodeur de textes avec chargement différé du modèle et cache LRU texte → vecteur.
+
+    Exemple :
+        service = get_embedding_service()
+        vectors = service.encode(["sérieux", "joyeux"])   # np.ndarray (2, dimension), lignes normalisées
+        scores = vectors @ service.encode("enthousiaste")
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL, device=EMBEDDING_DEVICE, threads=EMBEDDING_THREADS,
+                 batch_size=EMBEDDING_BATCH_SIZE, cache_size=EMBEDDING_CACHE_SIZE, persistent_cache=EMBEDDING_PERSISTENT_CACHE,
+                 backend=EMBEDDING_BACKEND, onnx_file=EMBEDDING_ONNX_FILE):
+        """
+        Args:
+            model_name (str): Nom ou chemin du modèle sentence-transformers.
+            device (str, optional): Périphérique d'inférence (moteur "torch"). None : choix automatique.
+            threads (int, optional): Nombre de threads d'inférence. None : valeur par défaut.
+            batch_size (int): Nombre de textes encodés par lot.
+            cache_size (int): Nombre de vecteurs gardés en mémoire (0 : pas de cache).
+            persistent_cache (bool or EmbeddingCache): Cache disque des vecteurs : True pour celui du modèle
+                                                       dans EmbeddingCache.CACHE_DIR, ou un cache déjà ouvert.
+            backend (str): "torch" (sentence-transformers) ou "onnx" (ONNX Runtime, fichier onnx_file du modèle).
+            onnx_file (str): Fichier ONNX du moteur "onnx".
+        """
+        self.model_name = model_name
+        self.backend = backend
+        self.onnx_file = onnx_file
+        self.device = device
+        self.threads = threads
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._model = None
+        self._persistent_cache = persistent_cache if persistent_cache is not False else None
+        self._cache = OrderedDict()
+        self._load_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def model(self):
+        """Modèle (SentenceTransformer ou OnnxSentenceEncoder), chargé au premier accès."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    @property
+    def persistent_cache(self):
+        """Cache disque des vecteurs (EmbeddingCache), ouvert au premier accès ; None s'il est désactivé."""
+        if self._persistent_cache is True:
+            with self._load_lock:
+                if self._persistent_cache is True:
+                    from Podcast_Generator.EmbeddingCache import EmbeddingCache
+                    # Un cache par moteur : les vecteurs ONNX / int8 ne diffèrent qu'à une tolérance près.
+                    cache_name = self.model_name if self.backend != "onnx" else f"{self.model_name}-{Path(self.onnx_file).stem}"
+                    self._persistent_cache = EmbeddingCache(cache_name)
+        return self._persistent_cache
+
+    def _load_model(self):
+        start_time = time.time()
+        print(f"Début chargement du modèle d'embedding {self.model_name} ({self.backend}) : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        if self.backend == "onnx":
+            model = OnnxSentenceEncoder(self.model_name, self.onnx_file, threads=self.threads)
+        else:
+            if self.threads:
+                import torch
+                torch.set_num_threads(self.threads)
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(self.model_name, device=self.device)
+        elapsed = time.time() - start_time
+        print(f"Fin chargement du modèle d'embedding: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
+        return model
+
+    def encode(self, texts, normalize=True):
+        """
+        Encode un texte ou une liste de textes. Les textes absents du cache LRU sont cherchés dans le cache disque,
+        et seuls les textes absents des deux sont envoyés au modèle, en un seul appel par lots
+        (un texte répété n'est encodé qu'une fois). Le modèle n'est pas chargé si tout est en cache.
+
+        Args:
+            texts (str or list[str]): Texte(s) à encoder.
+            normalize (bool): Normalise les vecteurs (norme 1).
+
+        Returns:
+            np.ndarray: Vecteur (dimension,) pour un texte seul, matrice (n, dimension) pour une liste
+                        (matrice (0, 0) pour une liste vide), en float32.
+        """
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        vectors = [None] * len(texts)
+        missing = {}
+        with self._cache_lock:
+            for position, text in enumerate(texts):
+                vector = self._cache.get((text, normalize))
+                if vector is not None:
+                    self._cache.move_to_end((text, normalize))
+                    vectors[position] = vector
+                    self.hits += 1
+                else:
+                    missing.setdefault(text, []).append(position)
+
+        if missing:
+            texts_missing = list(missing)
+            variant = "normalized" if normalize else "raw"
+            persistent_cache = self.persistent_cache
+            stored = persistent_cache.get_many(texts_missing, variant) if persistent_cache is not None else [None] * len(missing)
+            to_encode = [text for text, vector in zip(texts_missing, stored) if vector is None]
+            encoded = {}
+            if to_encode:
+                vectors_encoded = self.model.encode(to_encode, batch_size=self.batch_size, normalize_embeddings=normalize,
+                                                    convert_to_numpy=True, show_progress_bar=False)
+                vectors_encoded = np.asarray(vectors_encoded, dtype=np.float32)
+                if persistent_cache is not None:
+                    # Même précision que les vecteurs relus du disque : résultats identiques d'une exécution à l'autre.
+                    vectors_encoded = vectors_encoded.astype(np.float16).astype(np.float32)
+                    persistent_cache.put_many(to_encode, vectors_encoded, variant)
+                encoded = dict(zip(to_encode, vectors_encoded))
+            if persistent_cache is not None and normalize:
+                # Arrondi float16 : norme rétablie à 1 (produit scalaire = cosinus).
+                stored = [vector if vector is None else vector / np.linalg.norm(vector) for vector in stored]
+                encoded = {text: vector / np.linalg.norm(vector) for text, vector in encoded.items()}
+
+            with self._cache_lock:
+                self.misses += len(to_encode)
+                self.hits += len(missing) - len(to_encode)
+                for (text, positions), vector in zip(missing.items(), stored):
+                    if vector is None:
+                        vector = encoded[text]
+                    for position in positions:
+                        vectors[position] = vector
+                    if self.cache_size:
+                        self._cache[(text, normalize)] = vector
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        matrix = np.vstack(vectors)
+        return matrix[0] if single else matrix
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'hits', 'misses', 'cached', 'model_loaded', 'persistent'} : textes servis par un cache (mémoire
+                  ou disque), textes encodés par le modèle, vecteurs en mémoire, état du chargement du modèle
+                  et statistiques du cache disque (None s'il est désactivé).
+        """
+        persistent = self.persistent_cache.stats() if self.persistent_cache is not None else None
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._cache), "model_loaded": self._model is not None,
+                "persistent": persistent}
+
+    def clear_cache(self):
+        """Vide le cache LRU (le modèle reste chargé)."""
+        with self._cache_lock:
+            self._cache.clear()
+
+
+def semantic_search(query_vector, vectors, top_k=5):
+    """
+    Recherche les vecteurs les plus proches d'une requête (vecteurs normalisés : produit scalaire = cosinus).
+
+    Args:
+        query_vector (np.ndarray): Vecteur de la requête (dimension,).
+        vectors (np.ndarray): Matrice (n, dimension) des vecteurs candidats.
+        top_k (int): Nombre de résultats.
+
+    Returns:
+        list[tuple[int, float]]: Couples (position du vecteur, score), du plus proche au moins proche.
+    """
+    if top_k <= 0 or len(vectors) == 0:
+        return []
+    scores = np.asarray(vectors, dtype=np.float32) @ np.asarray(query_vector, dtype=np.float32)
+    top_k = min(top_k, len(scores))
+    best = np.argpartition(-scores, top_k - 1)[:top_k]
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return [(int(position), float(scores[position])) for position in best]
+
+
+def mmr_select(query_vector, vectors, costs, budget, diversity=0.5):
+    """
+    Sélection par pertinence marginale maximale (MMR) sous budget : à chaque étape, le candidat retenu maximise
+    (1 - diversity) × similarité à la requête - diversity × similarité maximale aux candidats déjà retenus,
+    parmi ceux dont le coût tient encore dans le budget.
+
+    Args:
+        query_vector (np.ndarray): Vecteur normalisé de la requête (dimension,).
+        vectors (np.ndarray): Matrice (n, dimension) des vecteurs normalisés des candidats.
+        costs (list[int]): Coût de chaque candidat (ex : nombre de tokens).
+        budget (int): Coût total maximal.
+        diversity (float): 0 : pertinence seule (ordre de semantic_search) ; 1 : diversité seule.
+
+    Returns:
+        list[int]: Positions des candidats retenus, dans l'ordre de sélection.
+    """
+    if len(vectors) == 0:
+        return []
+    vectors = np.asarray(vectors, dtype=np.float32)
+    relevance = vectors @ np.asarray(query_vector, dtype=np.float32)
+    costs = np.asarray(costs)
+    redundancy = np.zeros(len(vectors), dtype=np.float32)
+    available = costs <= budget
+    selected = []
+    while available.any():
+        scores = (1 - diversity) * relevance - diversity * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        budget -= int(costs[best])
+        available[best] = False
+        available &= costs <= budget
+        redundancy = np.maximum(redundancy, vectors @ vectors[best])
+    return selected
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service():
+    """
+    Retourne le service d'embeddings partagé du processus (créé au premier appel, modèle chargé au premier encode).
+
+    Returns:
+        EmbeddingService: Service partagé.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService()
+    return _service
+
+
+def set_embedding_service(service):
+    """
+    Remplace le service partagé (ex : autre modèle, autre périphérique, ou faux modèle dans les tests).
+
+    Args:
+        service (EmbeddingService or None): Nouveau service ; None pour recréer le service par défaut au prochain appel.
+    """
+    global _service
+    with _service_lock:
+        _service = service
@@ -0,0 +1,209 @@
+"""
+ExtractionCache.py
+==================
+
+Cache persistant des extractions de texte du projet Podcast Generator.
+
+Chaque appel du pipeline ou du menu (`mainTerminalUI`) relance `extract_file_handler` sur les mêmes fichiers,
+ce qui refait notamment l'OCR des documents scannés. Ce module conserve le résultat d'une extraction :
+
+- Clé : empreinte SHA-256 du contenu du fichier + version de l'extracteur + langues OCR + DPI
+- Valeur : texte extrait, métadonnées par page (rapport de `extract_text_from_pdf`) et, pour un PDF,
+  texte de chaque page (utilisé par `extract_sections_from_pdf` pour découper les signets sans refaire l'OCR)
+- Index chemin → (taille, mtime, empreinte), un petit fichier par chemin : tant que la taille et la date
+  de modification d'un fichier sont inchangées, son empreinte est réutilisée sans relire le fichier
+
+Les entrées et l'index sont des fichiers JSON indépendants écrits de façon atomique, ce qui permet plusieurs
+extractions en parallèle, y compris depuis plusieurs processus (ex : `summarize_corpus`, `ingest_path`).
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+# Version des extracteurs : à incrémenter quand le texte produit change, pour invalider les anciennes entrées.
+# 5 : en-têtes, pieds de page et numéros de page répétés retirés par défaut des PDF (strip_boilerplate=True).
+EXTRACTOR_VERSION = "5"
+
+
+def _user_cache_dir():
+    """Dossier de cache de l'utilisateur selon le système (hors de l'arborescence du projet)."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "PodcastGenerator"
+
+
+# Dossier du cache, dans le cache de l'utilisateur (surchargeable par la variable d'environnement PODCAST_EXTRACTION_CACHE_DIR).
+CACHE_DIR = Path(os.environ.get("PODCAST_EXTRACTION_CACHE_DIR", _user_cache_dir() / "Extraction"))
+
+# Taille des blocs lus pour calculer l'empreinte d'un fichier.
+HASH_BLOCK_SIZE = 1 << 20
+
+
+
+def _write_json_atomic(path, data):
+    """
+    Écrit un fichier JSON via un fichier temporaire puis un renommage, pour ne jamais laisser d'entrée tronquée.
+
+    Args:
+        path (Path): Fichier de destination.
+        data: Données sérialisables en JSON.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _index_entry_path(cache_dir, resolved):
+    # Une entrée d'index par chemin : aucun processus ne réécrit les entrées des autres.
+    return Path(cache_dir) / "index" / f"{hashlib.blake2b(resolved.encode('utf-8'), digest_size=16).hexdigest()}.json"
+
+
+def file_digest(path, cache_dir=None):
+    """
+    Retourne l'empreinte SHA-256 du contenu d'un fichier.
+    Si la taille et la date de modification correspondent à l'index, l'empreinte enregistrée est réutilisée
+    sans relire le fichier.
+
+    Args:
+        path (str): Chemin du fichier.
+        cache_dir (str, optional): Dossier du cache. Par défaut CACHE_DIR.
+
+    Returns:
+        str: Empreinte hexadécimale du contenu.
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    resolved = str(Path(path).resolve())
+    stat = os.stat(resolved)
+
+    index_path = _index_entry_path(cache_dir, resolved)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        entry = None
+    if entry and entry["path"] == resolved and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    sha256 = hashlib.sha256()
+    with open(resolved, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha256.update(block)
+    digest = sha256.hexdigest()
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(index_path, {"path": resolved, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest})
+    return digest
+
+
+def files_digest(paths, cache_dir=None):
+    """
+    Empreinte d'un ensemble de fichiers (ex : projet LaTeX), dans l'ordre donné : elle change dès que l'un d'eux change.
+
+    Args:
+        paths (iterable[str]): Chemins des fichiers.
+        cache_dir (str, optional): Dossier du cache (index des empreintes). Par défaut CACHE_DIR.
+
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    raw = "|".join(f"{Path(path).resolve()}:{file_digest(path, cache_dir)}" for path in paths)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def cache_key(digest, languages, dpi):
+    """
+    Construit la clé d'une entrée à partir de l'empreinte du fichier et des paramètres d'extraction.
+
+    Args:
+        digest (str): Empreinte du contenu du fichier (voir file_digest).
+        languages (str): Langues OCR (ex: 'eng+fra+jpn+chi_sim+chi_tra').
+        dpi (int): Résolution de rendu des pages OCR.
+
+    Returns:
+        str: Clé hexadécimale de l'entrée.
+    """
+    raw = f"{digest}|{EXTRACTOR_VERSION}|{languages}|{dpi}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def load_extraction(path, languages, dpi, cache_dir=None, digest=None):
+    """
+    Recherche l'extraction d'un fichier dans le cache.
+
+    Args:
+        path (str): Chemin du fichier source.
+        languages (str): Langues OCR utilisées pour l'extraction.
+        dpi (int): Résolution de rendu utilisée pour l'extraction.
+        cache_dir (str, optional): Dossier du cache. Par défaut CACHE_DIR.
+        digest (str, optional): Empreinte à utiliser à la place de celle du fichier (voir files_digest).
+
+    Returns:
+        dict or None: {"text": str, "pages": list[dict], ["page_texts": list[str]]} si l'entrée existe, sinon None.
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    key = cache_key(digest or file_digest(path, cache_dir), languages, dpi)
+    try:
+        with open(cache_dir / "entries" / f"{key}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_extraction(path, text, pages, languages, dpi, cache_dir=None, page_texts=None, digest=None):
+    """
+    Enregistre l'extraction d'un fichier dans le cache.
+
+    Args:
+        path (str): Chemin du fichier source.
+        text (str): Texte extrait.
+        pages (list[dict]): Métadonnées par page (vide pour les formats sans pages).
+        languages (str): Langues OCR utilisées pour l'extraction.
+        dpi (int): Résolution de rendu utilisée pour l'extraction.
+        cache_dir (str, optional): Dossier du cache. Par défaut CACHE_DIR.
+        page_texts (list[str], optional): Texte de chaque page (PDF), conservé avec l'entrée.
+        digest (str, optional): Empreinte à utiliser à la place de celle du fichier (voir files_digest).
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    key = cache_key(digest or file_digest(path, cache_dir), languages, dpi)
+    entries_dir = cache_dir / "entries"
+    entries_dir.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "source": Path(path).name,
+        "languages": languages,
+        "dpi": dpi,
+        "extractor_version": EXTRACTOR_VERSION,
+        "text": text,
+        "pages": pages,
+    }
+    if page_texts is not None:
+        entry["page_texts"] = page_texts
+    _write_json_atomic(entries_dir / f"{key}.json", entry)
+
+
+def clear_cache(cache_dir=None):
+    """
+    Supprime toutes les entrées du cache ainsi que l'index des empreintes.
+
+    Args:
+        cache_dir (str, optional): Dossier du cache. Par défaut CACHE_DIR.
+
+    Returns:
+        int: Nombre d'entrées supprimées.
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    removed = 0
+    for entry in (cache_dir / "entries").glob("*.json"):
+        entry.unlink()
+        removed += 1
+    for entry in (cache_dir / "index").glob("*.json"):
+        entry.unlink()
+    return removed
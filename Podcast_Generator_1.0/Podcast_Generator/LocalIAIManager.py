@@ -18,12 +18,11 @@ Utilisation :
 
 Notes :
 - Le serveur local attendu pour `server` est accessible par défaut sur `http://localhost:11434`.
+- llama-cpp et requests ne sont importés qu'au premier appel du backend concerné : importer ce module
+  (ex : depuis TextAnalyzer) ne charge pas la bibliothèque native de llama-cpp.
 """
 
 
-from llama_cpp import Llama
-import requests
-
 # FR transformer → 'sentence-transformers/all-MiniLM-L6-v2'
 # EN transformer → 'thenlper/gte-small'
 # CN/JP transformer → 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
@@ -54,6 +53,8 @@ def query_local_model(prompt: str, model_path: str, max_tokens: int = 1024) -> s
     Returns:
         str: Réponse textuelle du modèle.
     """
+    from llama_cpp import Llama
+
     llm = Llama(
         model_path=model_path,
         n_ctx=32768,
@@ -81,6 +82,8 @@ def query_server_local(prompt: str, max_tokens: int = 512, temperature: float =
     Returns:
         str: Réponse générée par le modèle actuellement chargé dans le serveur.
     """
+    import requests
+
     endpoint = "http://localhost:11434/v1/chat/completions"
     headers = {"Content-Type": "application/json"}
 
@@ -112,6 +115,8 @@ def get_context_limit_from_gguf(model_path: str) -> int:
     Returns:
         int: Nombre maximum de tokens en entrée (n_ctx).
     """
+    from llama_cpp import Llama
+
     llm = Llama(model_path=model_path, n_ctx=1)  # n_ctx ici ne change pas la vraie valeur lue
     return llm.n_ctx()
 
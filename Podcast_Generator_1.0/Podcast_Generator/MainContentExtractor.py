@@ -0,0 +1,188 @@
+"""
+MainContentExtractor.py
+=======================
+
+Extraction du contenu principal d'une page HTML (style "readability") pour le projet Podcast Generator.
+
+`soup.get_text()` sur une page entière renvoie aussi les menus, pieds de page, bandeaux de cookies
+et listes d'articles liés : autant de texte inutile découpé en chunks et envoyé au LLM.
+Ce module :
+
+- Retire les éléments de navigation et de mise en page (nav, footer, aside, formulaires, bandeaux de cookies...)
+- Note chaque bloc de texte (paragraphes) selon sa longueur et sa ponctuation, propage le score vers les
+  conteneurs parents, et pénalise les conteneurs chargés en liens (densité de liens)
+- Retient le meilleur conteneur et ses voisins pertinents, avec repli sur le texte complet si rien ne ressort
+- Mesure les octets et tokens retirés par rapport au texte complet de la page
+
+Utilisé par `SourceImporter` pour les pages web et les fichiers .html.
+"""
+
+import re
+from bs4 import BeautifulSoup, Tag
+import tiktoken
+
+# Balises jamais retenues comme contenu.
+REMOVED_TAGS = ["script", "style", "noscript", "template", "iframe", "svg", "canvas", "form", "button",
+                "input", "select", "nav", "footer", "aside"]
+
+# Motifs de classes/identifiants : pénalisés (navigation, commentaires, partage...) ou favorisés (article).
+NEGATIVE_PATTERN = re.compile(
+    r"comment|meta|footer|footnote|foot|menu|nav|sidebar|related|recommend|share|social|promo|advert|"
+    r"sponsor|banner|breadcrumb|cookie|consent|onetrust|popup|modal|newsletter|subscribe|widget|outbrain|taboola",
+    re.IGNORECASE,
+)
+POSITIVE_PATTERN = re.compile(r"article|body|content|entry|main|page|post|text|story|blog", re.IGNORECASE)
+
+# Balises dont le texte est noté comme un paragraphe.
+SCORED_TAGS = ["p", "pre", "td", "blockquote", "li", "h2", "h3"]
+
+# Longueur minimale (caractères) d'un bloc noté et du contenu retenu (en dessous : texte complet de la page).
+MIN_BLOCK_CHARS = 25
+MIN_CONTENT_CHARS = 140
+
+
+def count_tokens(text, tokenizer_model="gpt-3.5-turbo"):
+    """
+    Compte les tokens d'un texte avec l'encodeur tiktoken utilisé pour le découpage (voir TextAnalyzer).
+
+    Args:
+        text (str): Texte à mesurer.
+        tokenizer_model (str): Modèle pour tiktoken.
+
+    Returns:
+        int: Nombre de tokens.
+    """
+    return len(tiktoken.encoding_for_model(tokenizer_model).encode(text))
+
+
+def _class_weight(tag):
+    """Bonus/malus d'un élément selon ses classes et son identifiant."""
+    weight = 0
+    for value in (" ".join(tag.get("class") or []), tag.get("id") or ""):
+        if not value:
+            continue
+        if NEGATIVE_PATTERN.search(value):
+            weight -= 25
+        if POSITIVE_PATTERN.search(value):
+            weight += 25
+    return weight
+
+
+def _link_density(tag):
+    """Proportion du texte d'un élément contenue dans des liens."""
+    text_length = len(tag.get_text(" ", strip=True))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(link.get_text(" ", strip=True)) for link in tag.find_all("a"))
+    return link_length / text_length
+
+
+def _clean_soup(soup):
+    """Retire les éléments qui ne sont jamais du contenu principal."""
+    for tag in soup(REMOVED_TAGS):
+        tag.decompose()
+    # En-tête du site retiré, mais pas l'en-tête d'un article (titre, chapeau).
+    for tag in soup("header"):
+        if not tag.find_parent(["article", "main"]):
+            tag.decompose()
+    for tag in soup.find_all(True):
+        if tag.decomposed or tag.name in ("html", "body", "article", "main"):
+            continue
+        identity = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+        if NEGATIVE_PATTERN.search(identity) and not POSITIVE_PATTERN.search(identity):
+            tag.decompose()
+
+
+def _best_candidates(soup):
+    """
+    Note les blocs de texte et retourne le meilleur conteneur suivi de ses voisins pertinents.
+
+    Returns:
+        list[Tag]: Conteneurs retenus, dans l'ordre du document (liste vide si aucun bloc n'est noté).
+    """
+    scores = {}
+    for block in soup.find_all(SCORED_TAGS):
+        text = block.get_text(" ", strip=True)
+        if len(text) < MIN_BLOCK_CHARS:
+            continue
+        # Score du bloc : 1 + virgules + 1 point par tranche de 100 caractères (max 3).
+        score = 1 + text.count(",") + text.count("、") + text.count("，") + min(len(text) // 100, 3)
+        parent = block.parent
+        grandparent = parent.parent if isinstance(parent, Tag) else None
+        for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+            if not isinstance(ancestor, Tag) or ancestor.name in ("html", "[document]"):
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = _class_weight(ancestor) + (5 if ancestor.name in ("article", "main") else 0)
+            scores[ancestor] += score * share
+
+    if not scores:
+        return []
+
+    # Les conteneurs chargés en liens (menus, listes d'articles liés) perdent leur score.
+    for candidate in scores:
+        scores[candidate] *= 1 - _link_density(candidate)
+
+    top = max(scores, key=scores.get)
+    threshold = max(10, scores[top] * 0.2)
+    parent = top.parent
+    if not isinstance(parent, Tag):
+        return [top]
+
+    selected = []
+    for sibling in parent.children:
+        if sibling is top:
+            selected.append(sibling)
+        elif isinstance(sibling, Tag):
+            if scores.get(sibling, 0) >= threshold:
+                selected.append(sibling)
+            elif sibling.name == "p":
+                text = sibling.get_text(" ", strip=True)
+                if len(text) > 80 and _link_density(sibling) < 0.25:
+                    selected.append(sibling)
+    return selected
+
+
+def extract_main_content(html, report=None):
+    """
+    Extrait le texte du contenu principal d'une page HTML (article, billet, documentation...).
+
+    Args:
+        html (str or bytes): Code HTML de la page (bytes : l'encodage est détecté par BeautifulSoup).
+        report (dict, optional): Si fourni, reçoit {'bytes_before', 'bytes_after', 'bytes_removed',
+                                 'tokens_before', 'tokens_after', 'tokens_removed', 'fallback'}
+                                 par rapport au texte complet de la page.
+
+    Returns:
+        str: Texte du contenu principal (texte complet de la page si aucun contenu principal n'est identifié).
+    """
+    # Texte complet de la page (référence du rapport et repli), sans scripts ni bandeau de cookies OneTrust.
+    full_soup = BeautifulSoup(html, "html.parser")
+    for tag in full_soup(["script", "style", "noscript", "template"]) + full_soup.find_all(id="onetrust-banner-sdk"):
+        tag.decompose()
+    full_text = full_soup.get_text(separator=" ", strip=True)
+
+    soup = BeautifulSoup(html, "html.parser")
+    _clean_soup(soup)
+    candidates = _best_candidates(soup)
+    text = " ".join(candidate.get_text(separator=" ", strip=True) for candidate in candidates)
+
+    fallback = len(text) < MIN_CONTENT_CHARS
+    if fallback:
+        text = full_text
+
+    if report is not None:
+        bytes_before = len(full_text.encode("utf-8"))
+        bytes_after = len(text.encode("utf-8"))
+        tokens_before = count_tokens(full_text)
+        tokens_after = count_tokens(text)
+        report.update({
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_removed": bytes_before - bytes_after,
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_removed": tokens_before - tokens_after,
+            "fallback": fallback,
+        })
+    return text
@@ -0,0 +1,200 @@
+"""
+NearDuplicateIndex.py
+=====================
+
+Détection des passages quasi identiques (MinHash + LSH) pour le projet Podcast Generator.
+
+`SourceImporter.are_texts_similar` compare deux textes par un Jaccard complet sur leurs mots :
+pour repérer les doublons d'un corpus, il faudrait comparer chaque chunk à tous les autres.
+Ce module :
+
+- Résume chaque texte par une signature MinHash : `num_perm` minimums de hachages de ses shingles
+  (n-grammes de caractères, valables aussi pour le japonais ou le chinois sans espaces)
+- Range les signatures dans un index LSH : la signature est découpée en bandes, deux textes ne sont
+  comparés que s'ils partagent au moins une bande identique (recherche en temps sous-linéaire)
+- Confirme chaque candidat par la similarité de Jaccard estimée sur les signatures
+
+Utilisé par `TextAnalyzer` pour ne pas envoyer au LLM les passages répétés d'un document ou d'un corpus
+(pages dupliquées, annexes reprises, même article importé deux fois...).
+"""
+
+import re
+import threading
+import zlib
+import numpy as np
+
+# Nombre de permutations (longueur des signatures) et de bandes LSH (num_perm doit en être un multiple).
+NUM_PERM = 128
+LSH_BANDS = 16
+
+# Similarité de Jaccard estimée à partir de laquelle deux textes sont considérés comme doublons.
+DUPLICATE_THRESHOLD = 0.8
+
+# Taille des shingles (n-grammes de caractères).
+SHINGLE_SIZE = 5
+
+# Graine des permutations : des signatures calculées séparément restent comparables.
+MINHASH_SEED = 1
+
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def _shingles(text, shingle_size=SHINGLE_SIZE):
+    """Ensemble des n-grammes de caractères d'un texte normalisé (minuscules, espaces réduits)."""
+    normalized = re.sub(r"\s+", " ", text.lower()).strip()
+    if len(normalized) <= shingle_size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + shingle_size] for i in range(len(normalized) - shingle_size + 1)}
+
+
+class NearDuplicateIndex:
+    """
+    Index MinHash + LSH de textes, interrogeable au fil de l'eau.
+
+    Exemple :
+        index = NearDuplicateIndex()
+        index.add("doc1#0", chunk)
+        index.find_duplicate(autre_chunk)   # "doc1#0" si les deux chunks sont quasi identiques, sinon None
+    """
+
+    def __init__(self, threshold=DUPLICATE_THRESHOLD, num_perm=NUM_PERM, bands=LSH_BANDS,
+                 shingle_size=SHINGLE_SIZE, seed=MINHASH_SEED):
+        """
+        Args:
+            threshold (float): Similarité de Jaccard estimée minimale d'un doublon (0 à 1).
+            num_perm (int): Longueur des signatures MinHash.
+            bands (int): Nombre de bandes LSH (diviseur de num_perm). Plus de bandes : plus de candidats,
+                         donc des doublons plus éloignés retrouvés, au prix de plus de comparaisons.
+            shingle_size (int): Taille des n-grammes de caractères.
+            seed (int): Graine des permutations.
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) doit être un multiple de bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Hachage multiplicatif (a * x + b) >> 32 sur 64 bits : a impair, une paire (a, b) par permutation.
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = generator.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, key):
+        return key in self._signatures
+
+    def signature(self, text):
+        """
+        Calcule la signature MinHash d'un texte.
+
+        Args:
+            text (str): Texte à résumer.
+
+        Returns:
+            np.ndarray: Signature (num_perm entiers non signés).
+        """
+        shingles = _shingles(text, self.shingle_size)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key, text=None, signature=None):
+        """
+        Ajoute un texte à l'index.
+
+        Args:
+            key: Identifiant du texte (ex: "document.pdf#3").
+            text (str, optional): Texte à indexer (ignoré si signature est fournie).
+            signature (np.ndarray, optional): Signature déjà calculée par `signature`.
+
+        Returns:
+            np.ndarray: Signature indexée.
+        """
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            self._signatures[key] = signature
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(band_key, []).append(key)
+        return signature
+
+    def query(self, text=None, signature=None):
+        """
+        Recherche les textes indexés quasi identiques à un texte.
+
+        Args:
+            text (str, optional): Texte recherché (ignoré si signature est fournie).
+            signature (np.ndarray, optional): Signature déjà calculée par `signature`.
+
+        Returns:
+            list[tuple]: Couples (clé, similarité estimée) au-dessus du seuil, du plus proche au moins proche.
+        """
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(band_key, ()))
+            matches = []
+            for key in candidates:
+                similarity = float(np.mean(self._signatures[key] == signature))
+                if similarity >= self.threshold:
+                    matches.append((key, similarity))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def find_duplicate(self, text=None, signature=None):
+        """
+        Retourne la clé du texte indexé le plus proche s'il dépasse le seuil, sinon None.
+        """
+        matches = self.query(text, signature=signature)
+        return matches[0][0] if matches else None
+
+
+def deduplicate_chunks(chunks, index=None, key_prefix="", threshold=DUPLICATE_THRESHOLD, report=None):
+    """
+    Retire les chunks quasi identiques à un chunk déjà vu (dans la liste ou dans l'index fourni).
+
+    Args:
+        chunks (list[str]): Chunks dans l'ordre du document.
+        index (NearDuplicateIndex, optional): Index partagé entre plusieurs documents ; les chunks conservés y
+                                              sont ajoutés. Par défaut, un index propre à cet appel.
+        key_prefix (str): Préfixe des clés ajoutées à l'index (ex: nom du document).
+        threshold (float): Seuil de similarité si l'index est créé par cet appel.
+        report (dict, optional): Si fourni, reçoit {'chunks', 'kept', 'removed', 'duplicates'} où duplicates
+                                 liste les couples (position du chunk retiré, clé du chunk conservé).
+
+    Returns:
+        list[str]: Chunks conservés, dans l'ordre d'origine.
+    """
+    if index is None:
+        index = NearDuplicateIndex(threshold=threshold)
+    kept = []
+    duplicates = []
+    for position, chunk in enumerate(chunks):
+        signature = index.signature(chunk)
+        original = index.find_duplicate(signature=signature)
+        if original is not None:
+            duplicates.append((position, original))
+            continue
+        index.add(f"{key_prefix}#{position}", signature=signature)
+        kept.append(chunk)
+
+    if report is not None:
+        report.update({
+            "chunks": len(chunks),
+            "kept": len(kept),
+            "removed": len(duplicates),
+            "duplicates": duplicates,
+        })
+    return kept
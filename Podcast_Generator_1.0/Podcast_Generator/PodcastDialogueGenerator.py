@@ -17,7 +17,7 @@ import datetime
 
 from Podcast_Generator.PodcastGeneratorAudio import GenerateAndMux, sanitize_filename
 from Podcast_Generator.PodcastScriptGenerator import load_script_from_json, remplacer_et_sauver_fichier
-from sentence_transformers import util, SentenceTransformer
+from Podcast_Generator.EmbeddingService import get_embedding_service
 import os
 import re
 import json
@@ -32,11 +32,9 @@ import time
 from datetime import datetime
 
 # === CONFIGURATION
-EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
-model = SentenceTransformer(EMBEDDING_MODEL)
+# Les tons sont encodés au premier appel de resolve_best_tone, puis servis par le cache du service d'embeddings.
 tone_presets = load_tone_presets()
 tone_list = list(tone_presets.keys())
-tone_embeddings = model.encode(tone_list, normalize_embeddings=True)
 
 LANG_TO_LOCALE = {
     "fr": "fr_FR",
@@ -91,8 +89,8 @@ def resolve_best_tone(tone: str) -> str:
         str: Nom du ton existant le plus proche parmi les presets disponibles.
     """
 
-    query = model.encode([tone], normalize_embeddings=True)
-    scores = util.cos_sim(query, tone_embeddings)[0]
+    embedding_service = get_embedding_service()
+    scores = embedding_service.encode(tone_list) @ embedding_service.encode(tone)
     return tone_list[int(scores.argmax())]
 
 def _format_to_bracketed_lines(text: str) -> str:
@@ -16,7 +16,7 @@ Utilisation :
 - Les scripts générés sont utilisés ensuite par `PodcastDialogueGenerator.py` et `PodcastGeneratorAudio.py`.
 
 Notes :
-- Ce module utilise les embeddings `sentence-transformers` pour affiner les contenus choisis.
+- Ce module utilise les embeddings `sentence-transformers` (service partagé, voir EmbeddingService.py) pour affiner les contenus choisis.
 - Compatible multilingue (français, anglais, japonais, chinois).
 
 This module builds and manages podcast scripts based on RAG summaries, preparing them
@@ -35,22 +35,28 @@ from Podcast_Generator.SourceImporter import detect_main_language
 from Podcast_Generator.PromptTextAnalyzer import PROMPTS_RAG
 from Podcast_Generator.SystemEngine import save_text_to_file
 from Podcast_Generator.TonePresetManager import load_tone_presets
-from sentence_transformers import SentenceTransformer, util
+from Podcast_Generator.EmbeddingService import get_embedding_service, mmr_select
 import gender_guesser.detector as gender
+import tiktoken
 import time
 from datetime import datetime
 
 # === CONFIGURATION
-EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
-model = SentenceTransformer(EMBEDDING_MODEL)
+# Le modèle d'embedding est partagé et chargé au premier besoin (voir EmbeddingService.py).
 tone_presets = load_tone_presets()
 tone_list = list(tone_presets.keys())
-tone_embeddings = model.encode(tone_list, normalize_embeddings=True)
 
-# Initialisation du modèle d'embedding
-model = SentenceTransformer(EMBEDDING_MODEL)
+# Budget de tokens des extraits (top_chunks) repris dans chacun des six prompts du script, et poids de la
+# diversité dans leur sélection MMR (0 : pertinence seule, évite sinon les résumés partiels quasi identiques).
+TOP_CHUNKS_TOKEN_BUDGET = int(os.environ.get("PODCAST_TOP_CHUNKS_TOKEN_BUDGET", "2000"))
+TOP_CHUNKS_DIVERSITY = float(os.environ.get("PODCAST_TOP_CHUNKS_DIVERSITY", "0.5"))
 
-def create_script_rag_modulaire(folder_path: str, style: str = None, model_path: str = None, backend: str = "server", output_language: str = None, max_tokens: int = None) -> dict:
+# Candidats tirés de l'index vectoriel (corpus) avant la sélection MMR.
+TOP_CHUNKS_CANDIDATES = 50
+
+def create_script_rag_modulaire(folder_path: str, style: str = None, model_path: str = None, backend: str = "server", output_language: str = None, max_tokens: int = None,
+                                vector_index=None, sources: list[str] = None, top_chunks_token_budget: int = None,
+                                tokenizer_model: str = "gpt-3.5-turbo") -> dict:
     """
        Génère un script narratif structuré (INTRO, 4 PARTIES, OUTRO) à partir d'un dossier contenant un bundle de résumés RAG.
 
@@ -61,6 +67,11 @@ def create_script_rag_modulaire(folder_path: str, style: str = None, model_path:
            backend (str, optional): Mode d'exécution ("server" par défaut ou "local").
            output_language (str, optional): Langue de génération ("fr", "en", "ja", "zh-cn", "zh-tw"). Auto-détection si None.
            max_tokens (int, optional): Nombre maximal de tokens pour chaque génération. Déduit automatiquement si None.
+           vector_index (VectorIndex, optional): Index d'un corpus de dossiers de résumés (voir VectorIndex.py).
+               Le dossier y est ajouté ou mis à jour, et les extraits sont cherchés dans tout le corpus. None : ce dossier seul.
+           sources (list[str], optional): Dossiers de résumés du corpus autorisés (avec vector_index). None : tout l'index.
+           top_chunks_token_budget (int, optional): Tokens maximum des extraits repris dans les prompts. Par défaut TOP_CHUNKS_TOKEN_BUDGET.
+           tokenizer_model (str): Modèle pour tiktoken (pour compter les tokens des extraits).
 
        Returns:
            dict: Dictionnaire avec 3 clés :
@@ -69,7 +80,8 @@ def create_script_rag_modulaire(folder_path: str, style: str = None, model_path:
                - 'outro': Conclusion (str)
 
        Remarques:
-           - Optimise les extraits utilisés en fonction de leur similarité avec le résumé principal.
+           - Optimise les extraits utilisés en fonction de leur similarité avec le résumé principal
+             (sélection MMR : extraits pertinents et peu redondants, dans la limite du budget de tokens).
            - Utilise une génération multilingue avec fallback français.
        """
     #Timers Start
@@ -82,16 +94,31 @@ def create_script_rag_modulaire(folder_path: str, style: str = None, model_path:
     themes = bundle["themes"]
     chunks = bundle["summary"][1:]
 
-    # Choix dynamique du top_k basé sur le nombre de chunks
-    total_chunks = len(chunks)
-    top_k = min(5, max(1, total_chunks // 5)) if total_chunks > 0 else 0
-
+    query = f"{summary_main} {' '.join(themes)} {' '.join(keywords)}"
+    embeddings = query_embedding = None
+    if vector_index is not None:
+        # Corpus : le dossier est (ré)indexé s'il a changé, puis les candidats sont cherchés dans les sources autorisées.
+        from Podcast_Generator.VectorIndex import index_summary_folder
+        index_summary_folder(vector_index, folder_path, get_embedding_service())
+        if sources is not None:
+            sources = [str(Path(source).resolve()) for source in sources]
+        query_embedding = get_embedding_service().encode(query)
+        hits = vector_index.search(query_embedding, top_k=TOP_CHUNKS_CANDIDATES, sources=sources, with_vectors=True)
+        chunks = [hit["text"] for hit in hits]
+        # Vecteurs conservés par l'index : les candidats ne sont pas réencodés.
+        embeddings = [hit["vector"] for hit in hits]
+
+    # Extraits choisis par MMR jusqu'au budget de tokens (taille des prompts prévisible, quel que soit le nombre de chunks)
     if chunks:
-        embeddings = model.encode(chunks, convert_to_tensor=True, normalize_embeddings=True)
-        query = f"{summary_main} {' '.join(themes)} {' '.join(keywords)}"
-        query_embedding = model.encode(query, convert_to_tensor=True, normalize_embeddings=True)
-        hits = util.semantic_search(query_embedding, embeddings, top_k=top_k)
-        top_chunks = [chunks[hit["corpus_id"]] for hit in hits[0]]
+        if embeddings is None:
+            embedding_service = get_embedding_service()
+            embeddings = embedding_service.encode(chunks)
+            query_embedding = embedding_service.encode(query)
+        enc = tiktoken.encoding_for_model(tokenizer_model)
+        costs = [len(enc.encode(f"\n- {chunk}")) for chunk in chunks]
+        budget = TOP_CHUNKS_TOKEN_BUDGET if top_chunks_token_budget is None else top_chunks_token_budget
+        selected = mmr_select(query_embedding, embeddings, costs, budget, diversity=TOP_CHUNKS_DIVERSITY)
+        top_chunks = [chunks[position] for position in selected]
     else:
         top_chunks = []
 
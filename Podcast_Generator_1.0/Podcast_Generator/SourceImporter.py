@@ -7,51 +7,160 @@ pour le projet Podcast Generator.
 
 Rôles :
 - Détecter le type de fichier ou d'URL fourni et appliquer l'extraction adaptée.
-- Gérer l'extraction de texte pour : .txt, .pdf, .docx, .md, .tex, images (.jpg, .png, .webp), et pages web.
-- Appliquer de l'OCR automatique si nécessaire (PDF scannés, images).
+- Gérer l'extraction de texte pour : .txt, .pdf, .docx, .md, .tex, .html, .mhtml, .warc, images (.jpg, .png, .webp), et pages web
+  (requête HTTP simple d'abord, navigateur headless seulement pour les pages générées en JavaScript).
+- Importer un dossier ou une archive .zip entière en un seul corpus (extraction parallèle, provenance par fichier).
+- Importer un projet LaTeX entier (\\input, \\include... résolus, fichiers convertis en parallèle et mis en cache un par un).
+- Lire les DOCX en flux (analyse XML incrémentale, médias ignorés) pour borner la mémoire sur les longs documents.
+- Conserver la structure des documents (titres Markdown/DOCX, \\section LaTeX, signets PDF) sous forme d'arbre de sections.
+- Importer hors ligne des pages enregistrées (.html, .mhtml) et des collections de pages (archives WARC, lues en flux).
+- Ne conserver que le contenu principal des pages HTML (voir MainContentExtractor.py).
+- Appliquer de l'OCR automatique si nécessaire (PDF scannés, images), en écartant les pages blanches ou quasi vides.
+- Réutiliser les extractions déjà faites d'un fichier inchangé (cache d'extraction, voir ExtractionCache.py).
 - Détecter automatiquement la langue dominante du texte extrait.
 - Fournir des outils de comparaison textuelle basique (similarité).
 
 Principales bibliothèques utilisées :
-- PyPDF2, fitz (PyMuPDF), Tesseract OCR, BeautifulSoup, Selenium, langdetect, markdown.
+- PyPDF2, fitz (PyMuPDF), Tesseract OCR, requests, BeautifulSoup, Selenium, langdetect, markdown.
 
 Notes :
 - Tous les textes extraits sont retournés sous forme brute (str), sans enrichissement.
 - Ce module est conçu pour être multiplateforme (Windows/Linux/Mac).
+- Les bibliothèques propres à un format sont importées à la première extraction de ce format :
+  importer ce module (ex : depuis TextAnalyzer pour `detect_main_language`) reste rapide.
 
 This module extracts raw text content from various sources (files or URLs) for further processing
 in the Podcast Generator project.
 """
 
 import re
-import PyPDF2
-import fitz
-from PIL import Image
-from pytesseract import pytesseract
 from pathlib import Path
-import io
 from langdetect import detect
-import markdown
-import docx2txt
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
 import time
+import io
+import os
+import zipfile
+import threading
+import itertools
+import math
+import queue
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
 from datetime import datetime
+from Podcast_Generator import ExtractionCache
+
+# Nombre de processus utilisés par défaut pour l'OCR des PDF scannés (un par cœur).
+# Default number of processes used to OCR scanned PDFs (one per core).
+OCR_WORKERS = os.cpu_count() or 1
+
+# Pages PDF en attente par worker OCR (voir iter_pdf_pages) : borne la lecture anticipée de la couche texte
+# tout en gardant le pool occupé.
+# Pending PDF pages per OCR worker (see iter_pdf_pages): bounds the read-ahead of the text layer
+# while keeping the pool busy.
+OCR_PAGES_WINDOW = 4
+
+# Extensions prises en charge par l'extraction de fichiers, et nombre de processus d'extraction pour un dossier ou une archive.
+# Extensions supported by file extraction, and number of extraction processes for a folder or an archive.
+SUPPORTED_EXTENSIONS = ('.txt', '.pdf', '.docx', '.md', '.html', '.htm', '.mhtml', '.mht', '.warc', '.tex',
+                        '.jpeg', '.jpg', '.png', '.webp')
+INGEST_WORKERS = OCR_WORKERS
+
+# Nombre minimal de lettres pour qu'une couche texte de page soit conservée (sinon OCR) : un titre court
+# (« Introduction », « 第三章 ») suffit, un numéro de page seul non.
+# Minimum number of letters for a page text layer to be kept (otherwise OCR): a short title
+# ("Introduction", "第三章") is enough, a lone page number is not.
+MIN_TEXT_LAYER_LETTERS = 1
+
+# En-têtes et pieds de page répétés : nombre de lignes non vides examinées en haut et en bas de chaque page,
+# proportion minimale de pages (et nombre minimal de pages) où la ligne doit réapparaître au même endroit,
+# longueur minimale d'une ligne candidate (hors numéros de page), pages échantillonnées en mode flux.
+# Repeated headers and footers: number of non-empty lines examined at the top and bottom of each page,
+# minimal ratio of pages (and minimal number of pages) where the line must reappear at the same place,
+# minimal length of a candidate line (page numbers aside), pages sampled in streaming mode.
+REPEATED_LINE_ZONE = 3
+REPEATED_LINE_RATIO = 0.4
+REPEATED_LINE_MIN_PAGES = 3
+REPEATED_LINE_MIN_CHARS = 4
+REPEATED_LINE_SAMPLE_PAGES = 20
+
+# Résolution de rendu des pages PDF pour l'OCR (72 = rendu par défaut de PyMuPDF ; 300 recommandé pour les petites polices).
+# Rendering resolution of PDF pages for OCR (72 = PyMuPDF default rendering; 300 recommended for small fonts).
+OCR_DPI = 72
+
+# Import web : délai par URL, nombre minimal de caractères de texte pour se passer du navigateur,
+# URLs traitées en parallèle par extract_urls, navigateurs simultanés du WebDriverPool,
+# et en-tête User-Agent (certains sites refusent le client par défaut de requests).
+# Web import: per-URL timeout, minimal number of text characters to skip the browser,
+# URLs processed concurrently by extract_urls, concurrent browsers of the WebDriverPool,
+# and User-Agent header (some sites reject the default requests client).
+WEB_TIMEOUT = 15
+WEB_MIN_TEXT_CHARS = 200
+WEB_WORKERS = 8
+WEB_BROWSER_WORKERS = 2
+WEB_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# Langues OCR utilisées par extract_file_handler (et dans la clé du cache d'extraction).
+# OCR languages used by extract_file_handler (and in the extraction cache key).
+OCR_LANGUAGES = 'eng+fra+jpn+chi_sim+chi_tra'
+
+# Moteur OCR : "auto" (tesserocr si installé, sinon pytesseract), "tesserocr" ou "pytesseract".
+# OCR engine: "auto" (tesserocr when installed, otherwise pytesseract), "tesserocr" or "pytesseract".
+OCR_BACKEND = os.environ.get("PODCAST_OCR_BACKEND", "auto")
+
+# Pré-filtre des pages avant OCR : taille max (px) de l'image réduite analysée, seuil d'encre,
+# écart-type minimal des niveaux de gris, proportion d'encre minimale, et pour les pages peu encrées
+# (moins de SPARSE_INK_RATIO), nombre minimal de composantes connexes (trait de séparation, numéro de page).
+# Pre-filter of pages before OCR: max size (px) of the analyzed downsampled image, ink threshold,
+# minimal grayscale standard deviation, minimal ink ratio, and for lightly inked pages
+# (below SPARSE_INK_RATIO), minimal number of connected components (separator line, page number).
+PAGE_SAMPLE_SIZE = 400
+INK_THRESHOLD = 128
+BLANK_MIN_STD = 2.0
+BLANK_INK_RATIO = 0.0005
+SPARSE_INK_RATIO = 0.02
+SPARSE_MIN_COMPONENTS = 4
+
+# Taille max (px) de la miniature utilisée pour détecter la langue avant l'OCR.
+# Max size (px) of the thumbnail used to detect the language before OCR.
+OCR_SAMPLE_SIZE = 1000
+
+# Langues Tesseract candidates selon le script détecté par l'OSD.
+# Candidate Tesseract languages according to the script detected by OSD.
+OSD_SCRIPT_LANGUAGES = {
+    "Latin": ["eng", "fra"],
+    "Japanese": ["jpn"],
+    "Katakana": ["jpn"],
+    "Hiragana": ["jpn"],
+    "Han": ["chi_sim", "chi_tra", "jpn"],
+}
+
+def _file_extension(path):
+    """
+    Description:
+        Extension d'un fichier en minuscules (".warc" pour une archive WARC compressée ".warc.gz").
+        Lowercase extension of a file (".warc" for a compressed ".warc.gz" WARC archive).
+    """
+    name = Path(path).name.lower()
+    return '.warc' if name.endswith('.warc.gz') else Path(name).suffix
 
-def extract_file_handler(path):
+def extract_file_handler(path, use_cache=True, report=None):
     """
     Description:
         Sélectionne la fonction d'extraction adaptée en fonction du type de fichier ou de l'URL et retourne le texte extrait.
+        Les extractions de fichiers locaux sont conservées dans le cache d'extraction (voir ExtractionCache.py) :
+        un fichier inchangé n'est pas extrait (ni passé à l'OCR) une seconde fois.
         Selects the appropriate extraction function based on the file type or URL and returns the extracted text.
+        Local file extractions are kept in the extraction cache (see ExtractionCache.py):
+        an unchanged file is not extracted (nor OCRed) a second time.
 
     Args:
-        path (str): Chemin vers le fichier ou URL.
-                    Path to the file or URL.
+        path (str): Chemin vers le fichier, le dossier ou l'archive .zip (voir ingest_path), ou URL.
+                    Path to the file, folder or .zip archive (see ingest_path), or URL.
+        use_cache (bool): Utilise le cache d'extraction pour les fichiers locaux.
+                          Uses the extraction cache for local files.
+        report (list, optional): Si fourni, reçoit les métadonnées par page (PDF), y compris depuis le cache.
+                                 If given, receives the per-page metadata (PDF), including from the cache.
 
     Returns:
         str or None: Texte extrait si l'extraction aboutit, sinon None.
@@ -68,61 +177,95 @@ def extract_file_handler(path):
         elapsed = end_time - start_time
         print(f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
         return extract_text_from_web(path)
-    else:
-        extension = Path(path).suffix.lower()
-        if extension == '.txt':
-            # Timers End
-            end_time = time.time()
-            elapsed = end_time - start_time
-            print(f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
-            return extract_text_from_txt(path)
-        elif extension == '.pdf':
+
+    # Un projet LaTeX est mis en cache selon tous ses fichiers (voir extract_text_from_latex) : l'entrée du seul
+    # fichier principal ne verrait pas la modification d'un chapitre inclus.
+    # A LaTeX project is cached by all of its files (see extract_text_from_latex): an entry for the main file
+    # alone would not see a change in an included chapter.
+    cache_enabled = use_cache and Path(path).is_file() and Path(path).suffix.lower() != '.tex'
+    if cache_enabled:
+        cached = ExtractionCache.load_extraction(path, OCR_LANGUAGES, OCR_DPI)
+        if cached is not None:
+            print(f"[Cache] Extraction réutilisée : {Path(path).name}")
+            if report is not None:
+                report.extend(cached["pages"])
             # Timers End
-            end_time = time.time()
-            elapsed = end_time - start_time
+            elapsed = time.time() - start_time
             print(f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
-            return extract_text_from_pdf(path)
-        elif extension == '.docx':
-            # Timers End
-            end_time = time.time()
-            elapsed = end_time - start_time
-            print(
-                f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
-            return extract_text_from_docx(path)
-        elif extension == '.md':
-            # Timers End
-            end_time = time.time()
-            elapsed = end_time - start_time
-            print(
-                f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
-            return extract_text_from_markdown(path)
-        elif extension == '.tex':
-            # Timers End
-            end_time = time.time()
-            elapsed = end_time - start_time
-            print(
-                f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
-            return extract_text_from_latex(path)
-        elif extension in ['.jpeg', '.jpg','.png', '.webp']:
-            # Timers End
-            end_time = time.time()
-            elapsed = end_time - start_time
-            print(
-                f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
-            return extract_text_from_image(path)
-    print(path,"n'est pas valide.")
+            return cached["text"]
+
+    pages = []
+    page_texts = []
+    text = _extract_local_file(path, pages, use_cache=use_cache, page_texts=page_texts)
+    if cache_enabled and text:
+        ExtractionCache.save_extraction(path, text, pages, OCR_LANGUAGES, OCR_DPI, page_texts=page_texts or None)
+    if report is not None:
+        report.extend(pages)
+
     # Timers End
     end_time = time.time()
     elapsed = end_time - start_time
     print(
         f"Fin extract_file_handler: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
+    return text
+
+def _extract_local_file(path, report=None, use_cache=True, page_texts=None):
+    """
+    Description:
+        Appelle l'extracteur correspondant à l'extension d'un fichier local.
+        Calls the extractor matching the extension of a local file.
+
+    Args:
+        path (str): Chemin du fichier.
+                    Path to the file.
+        report (list, optional): Reçoit les métadonnées par page (PDF uniquement).
+                                 Receives the per-page metadata (PDF only).
+        use_cache (bool): Utilise le cache d'extraction pour chaque fichier d'un projet LaTeX.
+                          Uses the extraction cache for each file of a LaTeX project.
+        page_texts (list, optional): Reçoit le texte de chaque page (PDF uniquement).
+                                     Receives the text of each page (PDF only).
+
+    Returns:
+        str or None: Texte extrait (texte fusionné pour un dossier ou une archive .zip, voir ingest_path),
+                     ou None si l'extension n'est pas prise en charge.
+                     Extracted text (merged text for a folder or a .zip archive, see ingest_path),
+                     or None if the extension is not supported.
+    """
+    if Path(path).is_dir():
+        return ingest_path(path)["text"]
+    extension = _file_extension(path)
+    if extension == '.zip':
+        return ingest_path(path)["text"]
+    elif extension == '.txt':
+        return extract_text_from_txt(path)
+    elif extension == '.pdf':
+        return extract_text_from_pdf(path, languages=OCR_LANGUAGES, report=report, dpi=OCR_DPI, page_texts=page_texts)
+    elif extension == '.docx':
+        return extract_text_from_docx(path)
+    elif extension == '.md':
+        return extract_text_from_markdown(path)
+    elif extension in ['.html', '.htm']:
+        return extract_text_from_html(path)
+    elif extension in ['.mhtml', '.mht']:
+        return extract_text_from_mhtml(path)
+    elif extension == '.warc':
+        return extract_text_from_warc(path)
+    elif extension == '.tex':
+        return extract_text_from_latex(path, use_cache=use_cache)
+    elif extension in ['.jpeg', '.jpg','.png', '.webp']:
+        return extract_text_from_image(path, languages=OCR_LANGUAGES)
+    print(path,"n'est pas valide.")
     return None
 
-def extract_text_from_web(url):
+def extract_text_from_web(url, force_browser=False, main_content=True, report=None):
     """
     Description:
-        Extraction du texte à partir d'une URL en gérant les pop-ups de cookies.
-        Extracts text from a URL handling dynamic cookies pop-ups.
+        Extraction du texte à partir d'une URL, par paliers :
+        1. Requête HTTP simple et analyse du HTML avec BeautifulSoup (suffisant pour la plupart des articles).
+        2. Navigateur headless (Selenium) uniquement si la page semble générée en JavaScript, vide ou inaccessible.
+        Extracts text from a URL, in tiers:
+        1. Plain HTTP request and HTML parsing with BeautifulSoup (enough for most articles).
+        2. Headless browser (Selenium) only if the page looks JavaScript-rendered, empty or unreachable.
 
     Notes:
         S'il n'y a pas de résultat après l'extraction, il est préférable de générer un PDF de la page (Ctrl + P) et d'effectuer l'extraction sur le fichier PDF.
@@ -131,17 +274,199 @@ def extract_text_from_web(url):
     Args:
         url (str): L'URL à traiter.
                    The URL to process.
+        force_browser (bool): Passe directement par le navigateur.
+                              Goes straight to the browser.
+        main_content (bool): Ne garde que le contenu principal (sans menus, pieds de page, articles liés...).
+                             Keeps only the main content (no menus, footers, related articles...).
+        report (dict, optional): Si fourni, reçoit les octets et tokens retirés (voir MainContentExtractor.extract_main_content).
+                                 If given, receives the bytes and tokens removed (see MainContentExtractor.extract_main_content).
 
     Returns:
         str: Texte extrait de la page web.
              The extracted text from the web page.
     """
+    if not force_browser:
+        text = extract_text_from_web_static(url, main_content=main_content, report=report)
+        if text is not None:
+            return text
+        print(f"[Web] Contenu généré en JavaScript ou inaccessible, passage au navigateur : {url}")
+    return extract_text_from_web_browser(url, main_content=main_content, report=report)
+
+
+def extract_text_from_web_static(url, timeout=None, main_content=True, report=None):
+    """
+    Description:
+        Récupère une page par une simple requête HTTP et en extrait le texte, sans navigateur.
+        Fetches a page with a plain HTTP request and extracts its text, without a browser.
+
+    Args:
+        url (str): L'URL à traiter.
+                   The URL to process.
+        timeout (float, optional): Délai maximal de la requête en secondes. Par défaut WEB_TIMEOUT.
+                                   Request timeout in seconds. Defaults to WEB_TIMEOUT.
+        main_content (bool): Ne garde que le contenu principal de la page.
+                             Keeps only the main content of the page.
+        report (dict, optional): Si fourni, reçoit les octets et tokens retirés par l'extraction du contenu principal.
+                                 If given, receives the bytes and tokens removed by the main-content extraction.
+
+    Returns:
+        str or None: Texte de la page, ou None si la page doit être rendue par un navigateur
+                     (erreur HTTP, contenu non HTML, page générée en JavaScript).
+                     Page text, or None if the page has to be rendered by a browser
+                     (HTTP error, non-HTML content, JavaScript-rendered page).
+    """
+    import requests
+
+    try:
+        response = requests.get(url, headers={"User-Agent": WEB_USER_AGENT}, timeout=timeout or WEB_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"[Web] Requête HTTP impossible ({e})")
+        return None
+
+    content_type = response.headers.get("Content-Type", "")
+    if response.status_code >= 400 or "html" not in content_type.lower():
+        return None
+
+    html = response.text
+    text = html_to_text(html)
+    if looks_js_rendered(html, text):
+        return None
+    if main_content:
+        from Podcast_Generator import MainContentExtractor
+        return MainContentExtractor.extract_main_content(html, report)
+    return text
+
+
+def html_to_text(html):
+    """
+    Description:
+        Convertit du HTML en texte brut (bandeau de cookies OneTrust retiré).
+        Converts HTML to plain text (OneTrust cookie banner removed).
+
+    Args:
+        html (str): Code HTML de la page.
+                    HTML source of the page.
+
+    Returns:
+        str: Texte brut de la page.
+             Plain text of the page.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Supprimer le bandeau de cookies s'il existe (exemple avec OneTrust).
+    # Remove the cookie banner if it exists (e.g., OneTrust).
+    cookie_banner = soup.find('div', id='onetrust-banner-sdk')
+    if cookie_banner:
+        cookie_banner.decompose()
+
+    # Scripts et styles ne sont pas du texte (le navigateur ne les affiche pas non plus).
+    # Scripts and styles are not text (the browser does not display them either).
+    for tag in soup(['script', 'style', 'noscript', 'template']):
+        tag.decompose()
+
+    # Retourne le texte brut extrait.
+    # Return the extracted plain text.
+    return soup.get_text(separator=' ', strip=True)
+
+
+def looks_js_rendered(html, text):
+    """
+    Description:
+        Indique si une page récupérée sans navigateur semble dépendre du JavaScript pour afficher son contenu :
+        texte quasi absent, message "activez JavaScript", ou conteneur d'application vide (React, Vue, Next...)
+        alors que la page est dominée par des scripts.
+        Tells whether a page fetched without a browser seems to rely on JavaScript to display its content:
+        almost no text, an "enable JavaScript" message, or an empty application container (React, Vue, Next...)
+        while the page is dominated by scripts.
+
+    Args:
+        html (str): Code HTML de la page.
+                    HTML source of the page.
+        text (str): Texte extrait par html_to_text.
+                    Text extracted by html_to_text.
+
+    Returns:
+        bool: True s'il faut passer par un navigateur.
+              True if a browser is needed.
+    """
+    if len(text) < WEB_MIN_TEXT_CHARS:
+        return True
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for noscript in soup.find_all('noscript'):
+        if re.search(r'javascript', noscript.get_text(), re.IGNORECASE) and len(text) < 4 * WEB_MIN_TEXT_CHARS:
+            return True
+
+    for app_id in ('root', 'app', '__next', '__nuxt'):
+        container = soup.find(id=app_id)
+        if container is not None and not container.get_text(strip=True):
+            script_chars = sum(len(script.get_text()) for script in soup.find_all('script'))
+            if script_chars > len(text):
+                return True
+    return False
+
+
+def _new_chrome_driver():
+    """
+    Description:
+        Démarre une session Chrome headless.
+        Starts a headless Chrome session.
+
+    Returns:
+        selenium.webdriver.Chrome: Session du navigateur.
+                                   Browser session.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     # Configuration du navigateur en mode headless pour ne pas afficher d'interface graphique.
     # Configure the browser in headless mode to avoid GUI display.
     options = Options()
     options.add_argument('--headless')
     options.add_argument('--disable-gpu')
-    driver = webdriver.Chrome(options=options)
+    return webdriver.Chrome(options=options)
+
+
+def extract_text_from_web_browser(url, driver=None, timeout=None, main_content=True, report=None):
+    """
+    Description:
+        Extraction du texte d'une URL avec un navigateur headless (Chrome), en gérant les pop-ups de cookies.
+        Réservée aux pages dont le contenu est généré en JavaScript (voir extract_text_from_web).
+        Extracts text from a URL with a headless browser (Chrome), handling dynamic cookies pop-ups.
+        Meant for pages whose content is generated by JavaScript (see extract_text_from_web).
+
+    Args:
+        url (str): L'URL à traiter.
+                   The URL to process.
+        driver (selenium.webdriver.Chrome, optional): Session existante (ex : WebDriverPool), laissée ouverte.
+                                                      Sans session, un navigateur est lancé puis fermé.
+                                                      Existing session (e.g. WebDriverPool), left open.
+                                                      Without a session, a browser is started then closed.
+        timeout (float, optional): Attente maximale du chargement de la page, en secondes (10 par défaut).
+                                   Maximum wait for the page to load, in seconds (10 by default).
+        main_content (bool): Ne garde que le contenu principal de la page.
+                             Keeps only the main content of the page.
+        report (dict, optional): Si fourni, reçoit les octets et tokens retirés par l'extraction du contenu principal.
+                                 If given, receives the bytes and tokens removed by the main-content extraction.
+
+    Returns:
+        str: Texte extrait de la page web.
+             The extracted text from the web page.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    from Podcast_Generator import MainContentExtractor
+
+    own_driver = driver is None
+    if own_driver:
+        driver = _new_chrome_driver()
+    wait = timeout or 10
 
     try:
         # Chargement de la page
@@ -150,18 +475,18 @@ def extract_text_from_web(url):
 
         # Attendre que le document soit complètement chargé
         # Wait until the document is fully loaded.
-        WebDriverWait(driver, 10).until(lambda d: d.execute_script('return document.readyState') == 'complete')
+        WebDriverWait(driver, wait).until(lambda d: d.execute_script('return document.readyState') == 'complete')
 
         # Tenter de trouver et cliquer sur le bouton d'acceptation des cookies si présent.
         # Attempt to find and click the cookie acceptance button if present.
         try:
-            accept_button = WebDriverWait(driver, 5).until(
+            accept_button = WebDriverWait(driver, min(5, wait)).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Accepter')]"))
             )
             accept_button.click()
             # Attendre que le pop-up disparaisse
             # Wait for the pop-up to disappear.
-            WebDriverWait(driver, 5).until(
+            WebDriverWait(driver, min(5, wait)).until(
                 EC.invisibility_of_element((By.XPATH, "//button[contains(text(), 'Accepter')]"))
             )
         except TimeoutException:
@@ -171,262 +496,2557 @@ def extract_text_from_web(url):
 
         # Attendre que le corps de la page soit visible (contenu principal chargé).
         # Wait until the page body is visible (main content loaded).
-        WebDriverWait(driver, 10).until(
+        WebDriverWait(driver, wait).until(
             EC.visibility_of_element_located((By.TAG_NAME, 'body'))
         )
 
         # Récupérer le contenu rendu par le navigateur.
         # Retrieve the rendered content from the browser.
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Supprimer le bandeau de cookies s'il existe (exemple avec OneTrust).
-        # Remove the cookie banner if it exists (e.g., OneTrust).
-        cookie_banner = soup.find('div', id='onetrust-banner-sdk')
-        if cookie_banner:
-            cookie_banner.decompose()
-
-        # Retourne le texte brut extrait.
-        # Return the extracted plain text.
-        return soup.get_text(separator=' ', strip=True)
+        if main_content:
+            return MainContentExtractor.extract_main_content(driver.page_source, report)
+        return html_to_text(driver.page_source)
     finally:
-        # Fermer le navigateur pour libérer les ressources.
-        # Quit the browser to free resources.
-        driver.quit()
+        # Fermer le navigateur pour libérer les ressources (sauf session prêtée par un pool).
+        # Quit the browser to free resources (unless the session was lent by a pool).
+        if own_driver:
+            driver.quit()
 
-#TXT
-def extract_text_from_txt(file_path):
+
+class WebDriverPool:
     """
     Description:
-        Extraction du texte à partir d'un fichier .txt.
-        Extracts text from a .txt file.
+        Pool de sessions Chrome headless réutilisées d'une URL à l'autre, au lieu de démarrer et arrêter
+        un navigateur par page. Les sessions sont créées à la demande (au plus `size`), et nettoyées
+        entre deux pages (cookies, stockage, onglets) pour qu'une page n'influence pas la suivante.
+        Pool of headless Chrome sessions reused from one URL to the next, instead of starting and stopping
+        a browser per page. Sessions are created on demand (at most `size`) and cleaned between two pages
+        (cookies, storage, tabs) so that one page does not affect the next.
 
     Args:
-        file_path (str): Chemin du fichier texte.
-                         Path to the text file.
-
-    Returns:
-        str: Texte contenu dans le fichier.
-             Text content from the file.
+        size (int): Nombre maximal de navigateurs ouverts simultanément.
+                    Maximum number of browsers open at the same time.
+        page_load_timeout (float, optional): Délai maximal de chargement d'une page. Par défaut WEB_TIMEOUT.
+                                             Maximum page load time. Defaults to WEB_TIMEOUT.
+        driver_factory (callable, optional): Fonction créant une session. Par défaut Chrome headless.
+                                             Function creating a session. Defaults to headless Chrome.
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return file.read()
 
+    def __init__(self, size=WEB_BROWSER_WORKERS, page_load_timeout=None, driver_factory=None):
+        self.size = size
+        self.page_load_timeout = page_load_timeout or WEB_TIMEOUT
+        self.driver_factory = driver_factory or _new_chrome_driver
+        self._idle = queue.Queue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._drivers = []
+
+    def acquire(self):
+        """
+        Emprunte une session (bloque si `size` sessions sont déjà prêtées).
+        Borrows a session (blocks if `size` sessions are already lent).
+        """
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            driver = self.driver_factory()
+            driver.set_page_load_timeout(self.page_load_timeout)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def release(self, driver, broken=False):
+        """
+        Rend une session au pool ; une session en erreur est fermée.
+        Returns a session to the pool; a failed session is closed.
+        """
+        try:
+            if not broken:
+                try:
+                    self._reset(driver)
+                except Exception:
+                    broken = True
+            if broken:
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        """
+        Contexte : emprunte une session puis la rend, fermée si une exception survient.
+        Context: borrows a session then returns it, closed if an exception occurs.
+        """
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, broken=True)
+            raise
+        self.release(driver)
+
+    def close(self):
+        """
+        Ferme toutes les sessions ouvertes.
+        Quits every open session.
+        """
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._idle = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _reset(driver):
+        # Isolation entre pages : un seul onglet, cookies et stockage effacés, page vide.
+        # Isolation between pages: a single tab, cookies and storage cleared, blank page.
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        driver.get("about:blank")
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
 
-#PDF
-def extract_text_from_pdf_text(file_path):
+
+def extract_urls(urls, max_workers=None, timeout=None, driver_pool=None, force_browser=False, main_content=True):
     """
     Description:
-        Extraction du texte d'un PDF contenant du texte sélectionnable.
-        Extracts text from a PDF with selectable text.
+        Importe une liste d'URLs en parallèle (concurrence bornée). Chaque URL passe d'abord par la requête HTTP
+        simple, puis, si nécessaire, par un navigateur emprunté à un WebDriverPool partagé. Une URL en échec
+        n'interrompt pas le lot.
+        Imports a list of URLs concurrently (bounded concurrency). Each URL first goes through the plain HTTP
+        request, then, if needed, through a browser borrowed from a shared WebDriverPool. A failing URL does not
+        stop the batch.
 
     Args:
-        file_path (str): Chemin du fichier PDF.
-                         Path to the PDF file.
+        urls (list[str]): URLs à importer.
+                          URLs to import.
+        max_workers (int, optional): Nombre d'URLs traitées simultanément. Par défaut WEB_WORKERS.
+                                     Number of URLs processed at the same time. Defaults to WEB_WORKERS.
+        timeout (float, optional): Délai maximal par URL (requête HTTP et chargement dans le navigateur). Par défaut WEB_TIMEOUT.
+                                   Per-URL timeout (HTTP request and browser page load). Defaults to WEB_TIMEOUT.
+        driver_pool (WebDriverPool, optional): Pool de navigateurs à utiliser (laissé ouvert). Sinon un pool
+                                               de WEB_BROWSER_WORKERS sessions est créé puis fermé.
+                                               Browser pool to use (left open). Otherwise a pool
+                                               of WEB_BROWSER_WORKERS sessions is created then closed.
+        force_browser (bool): Passe directement par le navigateur.
+                              Goes straight to the browser.
+        main_content (bool): Ne garde que le contenu principal des pages.
+                             Keeps only the main content of the pages.
 
     Returns:
-        str: Texte extrait du PDF.
-             Text extracted from the PDF.
+        dict: {url: {"text", "method" ("http" ou "browser"), "seconds", "error"}}, dans l'ordre de `urls`.
+              {url: {"text", "method" ("http" or "browser"), "seconds", "error"}}, in `urls` order.
     """
-    with open(file_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        return "".join([page.extract_text() for page in reader.pages])
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    #Timers Start
+    start_time = time.time()
+    print(f"Début extract_urls : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+    timeout = timeout or WEB_TIMEOUT
+    urls = list(dict.fromkeys(urls))
+    own_pool = driver_pool is None
+    if own_pool:
+        # Le pool ne lance Chrome qu'à la première page qui en a besoin.
+        # The pool only starts Chrome for the first page that needs it.
+        driver_pool = WebDriverPool(page_load_timeout=timeout)
+
+    def fetch(url):
+        url_start = time.time()
+        result = {"text": None, "method": "http", "seconds": 0.0, "error": None}
+        try:
+            text = None if force_browser else extract_text_from_web_static(url, timeout=timeout, main_content=main_content)
+            if text is None:
+                result["method"] = "browser"
+                with driver_pool.driver() as driver:
+                    driver.set_page_load_timeout(timeout)
+                    text = extract_text_from_web_browser(url, driver=driver, timeout=timeout, main_content=main_content)
+            result["text"] = text
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.time() - url_start
+        return result
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or WEB_WORKERS) as pool:
+            futures = {pool.submit(fetch, url): url for url in urls}
+            for done, future in enumerate(as_completed(futures), start=1):
+                url = futures[future]
+                results[url] = future.result()
+                status = "erreur" if results[url]["error"] else results[url]["method"]
+                print(f"[Web] URLs {done}/{len(urls)} — {status} — {results[url]['seconds']:.2f} s — {url}")
+    finally:
+        if own_pool:
+            driver_pool.close()
 
+    failed = sum(1 for result in results.values() if result["error"])
+    # Timers End
+    elapsed = time.time() - start_time
+    print(f"Fin extract_urls: {datetime.now().strftime('%Y-%m-%d %H:%M')} — {len(urls) - failed}/{len(urls)} URLs importées — Temps écoulé : {elapsed:.2f} secondes")
+    return {url: results[url] for url in urls}
 
-def extract_text_from_pdf_scanned(file_path, languages='eng+fra+jpn+chi_sim+chi_tra'):
+#HTML
+def extract_text_from_html(file_path, main_content=True, report=None):
     """
     Description:
-        Extrait le texte d'un PDF scanné en utilisant l'OCR et ajuste la reconnaissance selon la langue détectée.
-        Extracts text from a scanned PDF using OCR and adjusts recognition based on the detected language.
+        Extrait le texte d'une page HTML enregistrée (encodage détecté depuis la balise meta ou le contenu).
+        Extracts text from a saved HTML page (encoding detected from the meta tag or the content).
 
     Args:
-        file_path (str): Chemin du PDF.
-                         Path to the PDF file.
-        languages (str): Langues initiales pour Tesseract (ex: 'eng+fra+jpn+chi_sim+chi_tra').
-                         Initial languages for Tesseract (e.g., 'eng+fra+jpn+chi_sim+chi_tra').
+        file_path (str): Chemin du fichier HTML.
+                         Path to the HTML file.
+        main_content (bool): Ne garde que le contenu principal de la page.
+                             Keeps only the main content of the page.
+        report (dict, optional): Si fourni, reçoit les octets et tokens retirés par l'extraction du contenu principal.
+                                 If given, receives the bytes and tokens removed by the main-content extraction.
 
     Returns:
-        str: Texte extrait du PDF.
-             Text extracted from the PDF.
+        str: Texte extrait de la page.
+             Text extracted from the page.
     """
-    text = ""
-    pdf_document = fitz.open(file_path)
+    with open(file_path, "rb") as f:
+        html = f.read()
+    if main_content:
+        from Podcast_Generator import MainContentExtractor
+        return MainContentExtractor.extract_main_content(html, report)
+    return html_to_text(html)
+
+#Archives web (MHTML / WARC)
+def extract_text_from_mhtml(file_path, main_content=True, report=None):
+    """
+    Description:
+        Extrait le texte d'une page enregistrée au format MHTML (« Page web, fichier unique » : .mhtml, .mht).
+        La page principale (première partie text/html) est décodée ; images, feuilles de style et scripts sont ignorés.
+        Extracts text from a page saved as MHTML ("Web page, single file": .mhtml, .mht).
+        The main page (first text/html part) is decoded; images, stylesheets and scripts are ignored.
 
-    for page_num in range(pdf_document.page_count):
-        page = pdf_document.load_page(page_num)
-        pix = page.get_pixmap()
+    Args:
+        file_path (str or bytes): Chemin du fichier MHTML, ou contenu du fichier (ex : membre d'une archive).
+                                  Path to the MHTML file, or file content (e.g., archive member).
+        main_content (bool): Ne garde que le contenu principal de la page.
+                             Keeps only the main content of the page.
+        report (dict, optional): Si fourni, reçoit les octets et tokens retirés par l'extraction du contenu principal.
+                                 If given, receives the bytes and tokens removed by the main-content extraction.
 
-        # Convertir en image PIL.
-        # Convert to a PIL image.
-        image_bytes = pix.tobytes("png")
-        image = Image.open(io.BytesIO(image_bytes))
-        image = image.convert('L')
+    Returns:
+        str: Texte extrait de la page (vide si l'archive ne contient aucune page HTML).
+             Text extracted from the page (empty if the archive contains no HTML page).
+    """
+    import email
+    from email import policy
 
-        # Premier OCR avec toutes les langues.
-        # First OCR with all specified languages.
-        page_text = pytesseract.image_to_string(image, lang=languages).strip()
-        text += page_text + "\n"
+    if isinstance(file_path, (bytes, bytearray)):
+        message = email.message_from_bytes(file_path, policy=policy.default)
+    else:
+        with open(file_path, "rb") as f:
+            message = email.message_from_binary_file(f, policy=policy.default)
 
-        # Détection de la langue dominante.
-        # Detect the dominant language.
-        main_lang = detect_main_language(page_text)
+    for part in message.walk():
+        if part.get_content_type() == "text/html":
+            return _html_bytes_to_text(part.get_payload(decode=True), part.get_content_charset(), main_content, report)
+    return ""
 
-        # Si la langue détectée est différente, refaire un OCR plus précis.
-        # If the detected language differs, perform a more precise OCR.
-        if main_lang != languages:
-            page_text = pytesseract.image_to_string(image, lang=main_lang).strip()
-            text += page_text + "\n"
 
-    pdf_document.close()
-    return text.strip()
+def _html_bytes_to_text(html, charset=None, main_content=True, report=None):
+    """
+    Description:
+        Texte d'une page HTML lue en octets : décodée avec le jeu de caractères annoncé s'il est connu,
+        sinon détecté par BeautifulSoup.
+        Text of an HTML page read as bytes: decoded with the announced charset when known,
+        otherwise detected by BeautifulSoup.
+    """
+    if charset:
+        try:
+            html = html.decode(charset, errors="replace")
+        except LookupError:
+            pass
+    if main_content:
+        from Podcast_Generator import MainContentExtractor
+        return MainContentExtractor.extract_main_content(html, report)
+    return html_to_text(html)
 
 
-def extract_text_from_pdf(file_path):
-    """"
+def _open_warc(file_path):
+    """
     Description:
-        Extraction générale du texte d'un PDF.
-        Utilise la fonction d'extraction de texte sélectionnable[extract_text_from_pdf_text(file_path)], si c'est un echec, utilisation de extract_text_from_pdf_scanned(file_path, languages='eng+fra+jpn+chi_sim+chi_tra').
-        General extraction of text from a PDF.
-        Attempts to extract selectable text using extract_text_from_pdf_text(file_path). If this fails, it falls back to OCR processing with extract_text_from_pdf_scanned(file_path, languages='eng+fra+jpn+chi_sim+chi_tra').        Uses standard extraction if possible, otherwise falls back to OCR.
+        Ouvre une archive WARC en lecture binaire, décompressée à la volée si elle est compressée (.warc.gz :
+        un membre gzip par enregistrement).
+        Opens a WARC archive for binary reading, decompressed on the fly when compressed (.warc.gz:
+        one gzip member per record).
 
     Args:
-        file_path (str): Chemin du PDF.
-                         Path to the PDF file.
+        file_path (str or bytes): Chemin de l'archive, ou contenu de l'archive.
+                                  Path to the archive, or archive content.
 
     Returns:
-        str: Texte extrait du PDF.
-             Text extracted from the PDF.
+        file-like: Flux binaire de l'archive décompressée.
+                   Binary stream of the decompressed archive.
     """
-    extracted_text = extract_text_from_pdf_text(file_path)
-    if not extracted_text.strip():
-        extracted_text = extract_text_from_pdf_scanned(file_path)
-    return extracted_text
+    import gzip
 
-#DOCX
-def extract_text_from_docx(file_path):
+    stream = io.BytesIO(file_path) if isinstance(file_path, (bytes, bytearray)) else open(file_path, "rb")
+    magic = stream.read(2)
+    stream.seek(0)
+    return gzip.GzipFile(fileobj=stream) if magic == b"\x1f\x8b" else stream
+
+
+def _parse_headers(lines):
     """
     Description:
-        Extrait le texte d'un fichier DOCX.
-        Extracts text from a DOCX file.
+        En-têtes "Nom: valeur" (WARC ou HTTP) en dictionnaire aux noms en minuscules.
+        "Name: value" headers (WARC or HTTP) as a dictionary with lowercase names.
+    """
+    headers = {}
+    for line in lines:
+        name, separator, value = line.decode("latin-1").partition(":")
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+    return headers
 
-    Args:
-        file_path (str): Chemin du fichier DOCX.
-                         Path to the DOCX file.
 
-    Returns:
-        str: Texte extrait du DOCX.
-             Text extracted from the DOCX.
+def iter_warc_records(file_path, record_types=("response", "resource")):
     """
-    return docx2txt.process(file_path)
+    Description:
+        Générateur de lecture en flux d'une archive WARC (.warc ou .warc.gz) : lit un enregistrement à la fois
+        et ne charge en mémoire que le bloc des enregistrements retenus (les autres sont sautés par morceaux).
+        Streaming reader of a WARC archive (.warc or .warc.gz): reads one record at a time
+        and only loads the block of the kept records in memory (the others are skipped in pieces).
 
-#Markdown/MD
-def extract_text_from_markdown(file_path):
+    Args:
+        file_path (str or bytes): Chemin de l'archive, ou contenu de l'archive.
+                                  Path to the archive, or archive content.
+        record_types (tuple[str]): Types d'enregistrements retournés (WARC-Type).
+                                   Record types yielded (WARC-Type).
+
+    Yields:
+        dict: {'type': WARC-Type, 'uri': WARC-Target-URI, 'headers': en-têtes WARC, 'block': contenu brut}.
+              {'type': WARC-Type, 'uri': WARC-Target-URI, 'headers': WARC headers, 'block': raw content}.
+    """
+    with _open_warc(file_path) as stream:
+        while True:
+            line = stream.readline()
+            if not line:
+                return
+            if not line.startswith(b"WARC/"):
+                # Lignes vides séparant deux enregistrements.
+                # Blank lines separating two records.
+                continue
+
+            header_lines = []
+            for line in iter(stream.readline, b""):
+                if line in (b"\r\n", b"\n"):
+                    break
+                header_lines.append(line.rstrip(b"\r\n"))
+            headers = _parse_headers(header_lines)
+            length = int(headers.get("content-length", 0))
+            record_type = headers.get("warc-type", "")
+
+            if record_type in record_types:
+                yield {"type": record_type, "uri": headers.get("warc-target-uri", ""), "headers": headers,
+                       "block": stream.read(length)}
+            else:
+                while length > 0:
+                    skipped = stream.read(min(length, 1 << 20))
+                    if not skipped:
+                        break
+                    length -= len(skipped)
+
+
+def _decode_chunked(body):
     """
     Description:
-        Extraction du texte à partir d'un fichier Markdown.
-        Convertit le Markdown en HTML puis en texte brut.
-        Extracts text from a Markdown file.
-        Converts Markdown to HTML and then extracts plain text.
+        Décode un corps HTTP transmis par morceaux (Transfer-Encoding: chunked).
+        Decodes an HTTP body sent in chunks (Transfer-Encoding: chunked).
+    """
+    decoded = []
+    position = 0
+    while position < len(body):
+        line_end = body.find(b"\r\n", position)
+        if line_end < 0:
+            break
+        size = int(body[position:line_end].split(b";")[0].strip() or b"0", 16)
+        if size == 0:
+            break
+        decoded.append(body[line_end + 2:line_end + 2 + size])
+        position = line_end + 2 + size + 2
+    return b"".join(decoded)
+
+
+def warc_record_html(record):
+    """
+    Description:
+        Page HTML contenue dans un enregistrement WARC : réponse HTTP 2xx de type HTML (corps décodé si transmis
+        par morceaux ou compressé), ou ressource de type HTML.
+        HTML page held in a WARC record: 2xx HTTP response of HTML type (body decoded when sent in chunks
+        or compressed), or resource of HTML type.
 
     Args:
-        file_path (str): Chemin du fichier Markdown.
-                         Path to the Markdown file.
+        record (dict): Enregistrement retourné par iter_warc_records.
+                       Record yielded by iter_warc_records.
 
     Returns:
-        str: Texte extrait du Markdown.
-             Text extracted from the Markdown.
+        tuple or None: (HTML en octets, jeu de caractères ou None), ou None si l'enregistrement n'est pas une page HTML.
+                       (HTML as bytes, charset or None), or None if the record is not an HTML page.
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        markdown_content = file.read()
+    import zlib
 
-    # Convertir le markdown en HTML.
-    # Convert Markdown to HTML.
-    html = markdown.markdown(markdown_content)
+    block = record["block"]
+    if record["type"] == "resource":
+        content_type = record["headers"].get("content-type", "")
+        body = block
+    else:
+        if not record["headers"].get("content-type", "").startswith("application/http"):
+            return None
+        head, _, body = block.partition(b"\r\n\r\n")
+        head_lines = head.split(b"\r\n")
+        status = head_lines[0].split()
+        if len(status) < 2 or not status[1].startswith(b"2"):
+            return None
+        http_headers = _parse_headers(head_lines[1:])
+        content_type = http_headers.get("content-type", "")
+        if "chunked" in http_headers.get("transfer-encoding", "").lower():
+            body = _decode_chunked(body)
+        encoding = http_headers.get("content-encoding", "").lower()
+        try:
+            if encoding in ("gzip", "x-gzip"):
+                body = zlib.decompress(body, zlib.MAX_WBITS | 16)
+            elif encoding == "deflate":
+                body = zlib.decompress(body)
+        except zlib.error:
+            return None
 
-    # Utiliser BeautifulSoup pour retirer les balises HTML.
-    # Use BeautifulSoup to remove HTML tags.
-    soup = BeautifulSoup(html, 'html.parser')
-    return soup.get_text()
+    if "html" not in content_type.lower():
+        return None
+    charset = re.search(r'charset=["\']?([\w.:-]+)', content_type, re.IGNORECASE)
+    return body, charset.group(1) if charset else None
 
 
-#Latex/TEX
-def extract_text_from_latex(file_path):
+def _warc_page_text(task):
     """
     Description:
-        Extraction du texte à partir d'un fichier LaTeX.
-        Tente d'utiliser pylatexenc pour une conversion précise, sinon applique un nettoyage basique.
-        Extracts text from a LaTeX file.
-        Tries to use pylatexenc for precise conversion, otherwise applies basic cleanup.
+        Texte d'une page HTML d'une archive WARC. Fonction de niveau module pour pouvoir être envoyée à un pool de processus.
+        Text of an HTML page of a WARC archive. Module-level function so that it can be sent to a process pool.
 
     Args:
-        file_path (str): Chemin du fichier LaTeX.
-                         Path to the LaTeX file.
+        task (tuple): (HTML en octets, jeu de caractères ou None, contenu principal uniquement).
+                      (HTML as bytes, charset or None, main content only).
 
     Returns:
-        str: Texte extrait du LaTeX.
-             Text extracted from the LaTeX.
+        str: Texte de la page.
+             Text of the page.
     """
-    # Lecture du fichier.
-    # Read the file.
-    with open(file_path, 'r', encoding='utf-8') as file:
-        latex_content = file.read()
+    html, charset, main_content = task
+    return _html_bytes_to_text(html, charset, main_content)
 
-    try:
-        from pylatexenc.latex2text import LatexNodes2Text
-        text = LatexNodes2Text().latex_to_text(latex_content)
-    except ImportError:
-        # Si pylatexenc n'est pas installé, appliquer un nettoyage basique.
-        # If pylatexenc is not installed, perform basic cleanup.
-        text = re.sub(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?(?:\{[^\}]*\})?', '', latex_content)
 
-    return text
+def iter_warc_texts(file_path, main_content=True, workers=None, report=None):
+    """
+    Description:
+        Générateur d'extraction d'une archive WARC : retourne le texte de chaque page HTML, dans l'ordre de l'archive,
+        sans navigateur ni accès réseau. Les enregistrements sont lus en flux et les pages converties dans un pool de
+        processus avec une fenêtre bornée (la mémoire ne dépend pas de la taille de l'archive).
+        Extraction generator of a WARC archive: yields the text of each HTML page, in archive order,
+        without browser or network access. Records are streamed and pages converted in a process pool
+        with a bounded window (memory does not depend on the size of the archive).
 
+    Args:
+        file_path (str or bytes): Chemin de l'archive (.warc ou .warc.gz), ou contenu de l'archive.
+                                  Path to the archive (.warc or .warc.gz), or archive content.
+        main_content (bool): Ne garde que le contenu principal de chaque page (menus, pieds de page... retirés).
+                             Keeps only the main content of each page (menus, footers... removed).
+        workers (int, optional): Nombre de processus de conversion. Par défaut OCR_WORKERS ; 1 = séquentiel.
+                                 Number of conversion processes. Defaults to OCR_WORKERS; 1 = sequential.
+        report (list, optional): Si fourni, reçoit {'uri', 'bytes', 'chars'} pour chaque page retenue.
+                                 If given, receives {'uri', 'bytes', 'chars'} for each kept page.
+
+    Yields:
+        str: Texte de chaque page non vide.
+             Text of each non-empty page.
+    """
+    def pages():
+        for record in iter_warc_records(file_path):
+            page = warc_record_html(record)
+            if page is not None:
+                yield record["uri"], page[0], page[1]
+
+    workers = workers or OCR_WORKERS
+    if workers <= 1:
+        results = ((uri, len(html), _warc_page_text((html, charset, main_content))) for uri, html, charset in pages())
+        pool = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = _iter_bounded_map(pool, pages(), main_content, window=workers * 4)
 
-#Image
-def extract_text_from_image(file_path, languages='eng+fra+jpn+chi_sim+chi_tra'):
+    try:
+        for uri, size, text in results:
+            if report is not None:
+                report.append({"uri": uri, "bytes": size, "chars": len(text)})
+            if text.strip():
+                yield text
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def _iter_bounded_map(pool, pages, main_content, window):
     """
     Description:
-        Extrait le texte d'une image en utilisant l'OCR avec optimisation linguistique.
-        Extracts text from an image using OCR with language optimization.
+        Convertit les pages dans le pool en gardant au plus `window` pages en attente, et retourne les résultats dans l'ordre.
+        Converts the pages in the pool keeping at most `window` pending pages, and yields the results in order.
 
-    Notes:
-        Il faut des images propres et sans trop de bruit et avec une seule langue.
-        For good text extraction from images, you need clean images with minimal noise and a single language.
+    Yields:
+        tuple: (URI, taille du HTML en octets, texte).
+               (URI, HTML size in bytes, text).
+    """
+    pending = deque()
+    for uri, html, charset in pages:
+        pending.append((uri, len(html), pool.submit(_warc_page_text, (html, charset, main_content))))
+        if len(pending) >= window:
+            uri, size, future = pending.popleft()
+            yield uri, size, future.result()
+    while pending:
+        uri, size, future = pending.popleft()
+        yield uri, size, future.result()
+
+
+def extract_text_from_warc(file_path, main_content=True, workers=None, separator="\n\n", report=None):
+    """
+    Description:
+        Extrait le texte de toutes les pages HTML d'une archive WARC (collection de pages collectées par un crawler),
+        hors ligne et sans navigateur (voir iter_warc_texts).
+        Extracts the text of all HTML pages of a WARC archive (collection of pages gathered by a crawler),
+        offline and without a browser (see iter_warc_texts).
 
     Args:
-        file_path (str): Chemin vers l'image.
-                         Path to the image file.
-        languages (str): Langues initiales pour Tesseract (ex: 'eng+fra+jpn+chi_sim+chi_tra').
-                         Initial languages for Tesseract (e.g., 'eng+fra+jpn+chi_sim+chi_tra').
+        file_path (str or bytes): Chemin de l'archive (.warc ou .warc.gz), ou contenu de l'archive.
+                                  Path to the archive (.warc or .warc.gz), or archive content.
+        main_content (bool): Ne garde que le contenu principal de chaque page.
+                             Keeps only the main content of each page.
+        workers (int, optional): Nombre de processus de conversion. Par défaut OCR_WORKERS ; 1 = séquentiel.
+                                 Number of conversion processes. Defaults to OCR_WORKERS; 1 = sequential.
+        separator (str): Séparateur inséré entre deux pages.
+                         Separator inserted between two pages.
+        report (list, optional): Si fourni, reçoit {'uri', 'bytes', 'chars'} pour chaque page retenue.
+                                 If given, receives {'uri', 'bytes', 'chars'} for each kept page.
 
     Returns:
-        str: Texte extrait de l'image.
-             Text extracted from the image.
+        str: Texte des pages, dans l'ordre de l'archive.
+             Text of the pages, in archive order.
     """
-    try:
-        image = Image.open(file_path)
-        # Améliorer la reconnaissance en convertissant en niveaux de gris.
-        # Enhance recognition by converting the image to grayscale.
-        image = image.convert('L')
+    #Timers Start
+    start_time = time.time()
+    print(f"Début extract_text_from_warc : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
-        # Premier OCR avec toutes les langues spécifiées.
-        # First OCR using all specified languages.
-        text = pytesseract.image_to_string(image, lang=languages).strip()
+    pages = [] if report is None else report
+    text = separator.join(iter_warc_texts(file_path, main_content=main_content, workers=workers, report=pages))
+
+    # Timers End
+    elapsed = time.time() - start_time
+    total_bytes = sum(page["bytes"] for page in pages)
+    print(f"Fin extract_text_from_warc: {datetime.now().strftime('%Y-%m-%d %H:%M')} — {len(pages)} pages, "
+          f"{total_bytes / 1e6:.1f} Mo HTML — Temps écoulé : {elapsed:.2f} secondes")
+    return text
+
+#TXT
+def extract_text_from_txt(file_path):
+    """
+    Description:
+        Extraction du texte à partir d'un fichier .txt.
+        Extracts text from a .txt file.
 
-        # Détection de la langue dominante.
-        # Detect the dominant language.
-        main_lang = detect_main_language(text)
+    Args:
+        file_path (str): Chemin du fichier texte.
+                         Path to the text file.
 
-        # Si la langue détectée diffère, refaire l'OCR avec la langue détectée.
-        # If the detected language differs, redo OCR using the detected language.
-        if main_lang != languages:
-            text = pytesseract.image_to_string(image, lang=main_lang).strip()
+    Returns:
+        str: Texte contenu dans le fichier.
+             Text content from the file.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return file.read()
 
-        return text
 
-    except Exception as e:
-        print(f"Erreur lors du traitement de l'image : {e}")
-        return ""
+#PDF
+def iter_pdf_pages_text(file_path):
+    """
+    Description:
+        Générateur qui retourne le texte sélectionnable d'un PDF page par page.
+        Generator yielding the selectable text of a PDF page by page.
+
+    Args:
+        file_path (str or bytes): Chemin du fichier PDF, ou contenu du PDF (ex : membre d'une archive).
+                                  Path to the PDF file, or content of the PDF (e.g., archive member).
+
+    Yields:
+        str: Texte de la page (chaîne vide si la page n'a pas de couche texte).
+             Page text (empty string if the page has no text layer).
+    """
+    import PyPDF2
+
+    with (io.BytesIO(file_path) if isinstance(file_path, bytes) else open(file_path, 'rb')) as file:
+        reader = PyPDF2.PdfReader(file)
+        for page in reader.pages:
+            yield page.extract_text()
+
+
+def extract_text_from_pdf_text(file_path):
+    """
+    Description:
+        Extraction du texte d'un PDF contenant du texte sélectionnable.
+        Extracts text from a PDF with selectable text.
+
+    Args:
+        file_path (str): Chemin du fichier PDF.
+                         Path to the PDF file.
+
+    Returns:
+        str: Texte extrait du PDF.
+             Text extracted from the PDF.
+    """
+    return "".join(iter_pdf_pages_text(file_path))
+
+
+def _open_pdf(file_path):
+    """
+    Description:
+        Ouvre un PDF avec PyMuPDF depuis son chemin ou depuis son contenu en mémoire.
+        Opens a PDF with PyMuPDF from its path or from its in-memory content.
+
+    Args:
+        file_path (str or bytes): Chemin du PDF ou contenu du PDF.
+                                  Path to the PDF or content of the PDF.
+
+    Returns:
+        fitz.Document: Document ouvert.
+                       Opened document.
+    """
+    import fitz
+
+    if isinstance(file_path, bytes):
+        return fitz.open(stream=file_path, filetype="pdf")
+    return fitz.open(file_path)
+
+
+def _init_ocr_worker():
+    """
+    Description:
+        Initialise un processus du pool OCR : limite Tesseract à un thread pour éviter la sur-souscription des cœurs.
+        Initializes an OCR pool process: limits Tesseract to one thread to avoid oversubscribing the cores.
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+# Moteurs tesserocr ouverts, par thread (PyTessBaseAPI n'est pas thread-safe) et par processus.
+# Open tesserocr engines, per thread (PyTessBaseAPI is not thread-safe) and per process.
+_ocr_engines = threading.local()
+
+
+def _get_tesserocr_api(lang, osd=False, required=False):
+    """
+    Description:
+        Retourne le moteur tesserocr persistant du thread courant pour une langue, en le créant au premier appel
+        (les modèles de langue ne sont chargés qu'une fois par worker).
+        Returns the current thread's persistent tesserocr engine for a language, creating it on first call
+        (language models are only loaded once per worker).
+
+    Args:
+        lang (str): Langue(s) Tesseract (ex: 'fra', 'eng+fra').
+                    Tesseract language(s) (e.g., 'fra', 'eng+fra').
+        osd (bool): Moteur dédié à la détection d'orientation et de script.
+                    Engine dedicated to orientation and script detection.
+        required (bool): Lève l'erreur si tesserocr est indisponible, au lieu de retourner None.
+                         Raises the error if tesserocr is unavailable, instead of returning None.
+
+    Returns:
+        tesserocr.PyTessBaseAPI or None: Moteur prêt à l'emploi, ou None si tesserocr est indisponible.
+                                         Ready-to-use engine, or None if tesserocr is unavailable.
+    """
+    # Un processus forké hérite des moteurs du parent : on repart de zéro.
+    # A forked process inherits the parent's engines: start from scratch.
+    if getattr(_ocr_engines, "pid", None) != os.getpid():
+        _ocr_engines.pid = os.getpid()
+        _ocr_engines.apis = {}
+        _ocr_engines.failed = set()
+
+    key = (lang, osd)
+    api = _ocr_engines.apis.get(key)
+    if api is not None or (key in _ocr_engines.failed and not required):
+        return api
+
+    try:
+        import tesserocr
+        if osd:
+            api = tesserocr.PyTessBaseAPI(lang=lang, psm=tesserocr.PSM.OSD_ONLY)
+        else:
+            api = tesserocr.PyTessBaseAPI(lang=lang)
+    except (ImportError, RuntimeError):
+        # tesserocr absent ou données de langue introuvables : repli sur pytesseract.
+        # tesserocr missing or language data not found: fall back to pytesseract.
+        if required:
+            raise
+        _ocr_engines.failed.add(key)
+        return None
+
+    _ocr_engines.apis[key] = api
+    return api
+
+
+def close_ocr_engines():
+    """
+    Description:
+        Libère les moteurs tesserocr ouverts par le thread courant.
+        Releases the tesserocr engines opened by the current thread.
+    """
+    for api in getattr(_ocr_engines, "apis", {}).values():
+        api.End()
+    _ocr_engines.apis = {}
+
+
+def ocr_image(image, lang, backend=None):
+    """
+    Description:
+        Applique l'OCR à une image avec le moteur configuré : tesserocr (moteur persistant en mémoire)
+        ou pytesseract (un processus tesseract et des fichiers temporaires par appel).
+        Applies OCR to an image with the configured engine: tesserocr (persistent in-memory engine)
+        or pytesseract (one tesseract process and temporary files per call).
+
+    Args:
+        image (PIL.Image.Image): Image à lire.
+                                 Image to read.
+        lang (str): Langue(s) Tesseract (ex: 'fra', 'eng+fra').
+                    Tesseract language(s) (e.g., 'fra', 'eng+fra').
+        backend (str, optional): "auto", "tesserocr" ou "pytesseract". Par défaut OCR_BACKEND.
+                                 "auto", "tesserocr" or "pytesseract". Defaults to OCR_BACKEND.
+
+    Returns:
+        str: Texte reconnu.
+             Recognized text.
+    """
+    backend = backend or OCR_BACKEND
+    if backend != "pytesseract":
+        api = _get_tesserocr_api(lang, required=backend == "tesserocr")
+        if api is not None:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+    from pytesseract import pytesseract
+    return pytesseract.image_to_string(image, lang=lang)
+
+
+def ocr_image_script(image, backend=None):
+    """
+    Description:
+        Détecte le script d'écriture d'une image (OSD), avec le même moteur que ocr_image.
+        Detects the writing script of an image (OSD), with the same engine as ocr_image.
+
+    Args:
+        image (PIL.Image.Image): Image à analyser.
+                                 Image to analyze.
+        backend (str, optional): "auto", "tesserocr" ou "pytesseract". Par défaut OCR_BACKEND.
+                                 "auto", "tesserocr" or "pytesseract". Defaults to OCR_BACKEND.
+
+    Returns:
+        str or None: Nom du script (ex: 'Latin', 'Japanese').
+                     Script name (e.g., 'Latin', 'Japanese').
+    """
+    backend = backend or OCR_BACKEND
+    if backend != "pytesseract":
+        api = _get_tesserocr_api("osd", osd=True, required=backend == "tesserocr")
+        if api is not None:
+            api.SetImage(image)
+            return (api.DetectOrientationScript() or {}).get("script_name")
+    from pytesseract import pytesseract
+    return pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT).get("script")
+
+
+def _render_pdf_page(pdf_document, page_num, dpi=None):
+    """
+    Description:
+        Rastérise une page de PDF directement en niveaux de gris et l'expose comme image PIL sans copie
+        (l'image partage le buffer `samples` du pixmap, pas d'encodage/décodage PNG).
+        Rasterizes a PDF page directly in grayscale and exposes it as a PIL image without copying
+        (the image shares the pixmap `samples` buffer, no PNG encode/decode).
+
+    Args:
+        pdf_document (fitz.Document): Document PyMuPDF ouvert.
+                                      Open PyMuPDF document.
+        page_num (int): Index de la page (à partir de 0).
+                        Page index (0-based).
+        dpi (int, optional): Résolution de rendu. Par défaut OCR_DPI.
+                             Rendering resolution. Defaults to OCR_DPI.
+
+    Returns:
+        PIL.Image.Image: Image de la page en niveaux de gris (lecture seule).
+                         Grayscale page image (read-only).
+    """
+    import fitz
+    from PIL import Image
+
+    page = pdf_document.load_page(page_num)
+    pix = page.get_pixmap(colorspace=fitz.csGRAY, dpi=dpi or OCR_DPI, alpha=False)
+    image = Image.frombuffer("L", (pix.width, pix.height), pix.samples_mv, "raw", "L", pix.stride, 1)
+
+    # samples_mv pointe sur la mémoire du pixmap : il doit vivre aussi longtemps que l'image.
+    # samples_mv points to the pixmap memory: it must live as long as the image.
+    image._pixmap = pix
+    return image
+
+
+def page_information(image):
+    """
+    Description:
+        Mesure à faible coût (calcul vectorisé sur une image réduite) la quantité d'information d'une page
+        avant l'OCR : proportion d'encre, écart-type des niveaux de gris et nombre de composantes connexes
+        (estimé par le nombre d'Euler du masque d'encre, sans étiquetage).
+        Cheaply measures (vectorized computation on a downsampled image) the amount of information on a page
+        before OCR: ink ratio, grayscale standard deviation and number of connected components
+        (estimated through the Euler number of the ink mask, without labeling).
+
+    Args:
+        image (PIL.Image.Image): Page ou image à analyser.
+                                 Page or image to analyze.
+
+    Returns:
+        dict: {'ink_ratio', 'std', 'components', 'low_information'} ; low_information vaut True pour une page
+              blanche, un trait de séparation ou un numéro de page seul, à ne pas envoyer à l'OCR.
+              {'ink_ratio', 'std', 'components', 'low_information'}; low_information is True for a blank page,
+              a separator line or a lone page number, not worth sending to OCR.
+    """
+    import numpy as np
+
+    sample = image.convert('L')
+    sample.thumbnail((PAGE_SAMPLE_SIZE, PAGE_SAMPLE_SIZE))
+    pixels = np.asarray(sample, dtype=np.float32)
+
+    std = float(pixels.std())
+    ink = pixels < INK_THRESHOLD
+    # Page inversée (texte clair sur fond sombre) : l'encre est la partie claire.
+    # Inverted page (light text on dark background): ink is the light part.
+    if ink.mean() > 0.5:
+        ink = ~ink
+    ink_ratio = float(ink.mean())
+
+    # Nombre d'Euler en 8-connexité à partir des motifs 2x2 : composantes - trous.
+    # 8-connectivity Euler number from 2x2 patterns: components - holes.
+    padded = np.pad(ink, 1)
+    top_left, top_right = padded[:-1, :-1], padded[:-1, 1:]
+    bottom_left, bottom_right = padded[1:, :-1], padded[1:, 1:]
+    filled = top_left.astype(np.int8) + top_right + bottom_left + bottom_right
+    single = int((filled == 1).sum())
+    triple = int((filled == 3).sum())
+    diagonal = int(((filled == 2) & (top_left == bottom_right)).sum())
+    components = max(0, (single - triple - 2 * diagonal) // 4)
+
+    low_information = (
+        std < BLANK_MIN_STD
+        or ink_ratio < BLANK_INK_RATIO
+        or (ink_ratio < SPARSE_INK_RATIO and components < SPARSE_MIN_COMPONENTS)
+    )
+    return {"ink_ratio": ink_ratio, "std": std, "components": components, "low_information": low_information}
+
+
+def _ocr_pdf_page(file_path, page_num, lang='eng', dpi=None):
+    """
+    Description:
+        Rastérise et applique l'OCR (une seule passe) à une page d'un PDF. Fonction de niveau module pour pouvoir être envoyée à un pool de processus.
+        Les pages sans information (voir page_information) ne passent pas par Tesseract.
+        Rasterizes and OCRs (single pass) one PDF page. Module-level function so that it can be sent to a process pool.
+        Pages without information (see page_information) skip Tesseract.
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        page_num (int): Index de la page (à partir de 0).
+                        Page index (0-based).
+        lang (str): Langue(s) Tesseract retenue(s) pour le document (voir detect_ocr_language).
+                    Tesseract language(s) selected for the document (see detect_ocr_language).
+        dpi (int, optional): Résolution de rendu. Par défaut OCR_DPI.
+                             Rendering resolution. Defaults to OCR_DPI.
+
+    Returns:
+        tuple[str, float, bool]: Texte OCR de la page (terminé par un retour à la ligne), durée en secondes
+                                 et True si la page a été écartée sans OCR.
+                                 OCR text of the page (ending with a newline), duration in seconds
+                                 and True if the page was skipped without OCR.
+    """
+    start_time = time.time()
+    pdf_document = _open_pdf(file_path)
+    try:
+        image = _render_pdf_page(pdf_document, page_num, dpi)
+    finally:
+        pdf_document.close()
+
+    if page_information(image)["low_information"]:
+        return "\n", time.time() - start_time, True
+
+    page_text = ocr_image(image, lang).strip()
+    return page_text + "\n", time.time() - start_time, False
+
+
+def detect_ocr_language(image, languages='eng+fra+jpn+chi_sim+chi_tra'):
+    """
+    Description:
+        Choisit la langue Tesseract d'une image avant l'OCR, pour n'effectuer ensuite qu'une seule passe.
+        1. Détection du script par OSD (peu coûteuse) pour restreindre les langues candidates.
+        2. S'il reste plusieurs candidates, OCR d'une miniature avec ces langues puis détection de la langue du texte.
+        Picks the Tesseract language of an image before OCR, so that a single pass is needed afterwards.
+        1. Script detection through OSD (cheap) to narrow down the candidate languages.
+        2. If several candidates remain, OCR of a thumbnail with those languages, then language detection on the text.
+
+    Notes:
+        Si `languages` ne contient qu'une langue, elle est retournée telle quelle.
+        Si l'OSD n'est pas disponible (osd.traineddata absent), seule l'étape 2 est appliquée.
+        If `languages` holds a single language, it is returned as is.
+        If OSD is not available (missing osd.traineddata), only step 2 is applied.
+
+    Args:
+        image (PIL.Image.Image): Image (page ou photo) à analyser.
+                                 Image (page or photo) to analyze.
+        languages (str): Langues autorisées (ex: 'eng+fra+jpn+chi_sim+chi_tra').
+                         Allowed languages (e.g., 'eng+fra+jpn+chi_sim+chi_tra').
+
+    Returns:
+        str or None: Code de langue Tesseract (ex: 'fra'), ou None si aucun texte n'a été trouvé.
+                     Tesseract language code (e.g., 'fra'), or None if no text was found.
+    """
+    allowed = languages.split('+')
+    if len(allowed) == 1:
+        return languages
+
+    candidates = allowed
+    try:
+        script = ocr_image_script(image)
+        script_langs = [lang for lang in OSD_SCRIPT_LANGUAGES.get(script, []) if lang in allowed]
+        if script_langs:
+            candidates = script_langs
+    except Exception:
+        # OSD indisponible ou trop peu de texte : on garde toutes les langues.
+        # OSD unavailable or too little text: keep every language.
+        pass
+
+    if len(candidates) == 1:
+        return candidates[0]
+
+    sample = image.copy()
+    sample.thumbnail((OCR_SAMPLE_SIZE, OCR_SAMPLE_SIZE))
+    sample_text = ocr_image(sample, '+'.join(candidates)).strip()
+    if not sample_text:
+        return None
+    main_lang = detect_main_language(sample_text)
+    return main_lang if main_lang in candidates else '+'.join(candidates)
+
+
+def detect_pdf_ocr_language(file_path, languages='eng+fra+jpn+chi_sim+chi_tra', max_sample_pages=3, page_nums=None, dpi=None):
+    """
+    Description:
+        Choisit une seule fois la langue OCR d'un PDF à partir des premières pages contenant du texte
+        (les pages blanches ou quasi vides ne comptent pas comme échantillons).
+        Picks the OCR language of a PDF once, from the first pages containing text
+        (blank or nearly empty pages do not count as samples).
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        languages (str): Langues autorisées.
+                         Allowed languages.
+        max_sample_pages (int): Nombre maximal de pages échantillons essayées.
+                                Maximum number of sample pages tried.
+        page_nums (list[int], optional): Pages parmi lesquelles choisir les échantillons (toutes par défaut).
+                                         Pages to pick the samples from (all by default).
+        dpi (int, optional): Résolution de rendu. Par défaut OCR_DPI.
+                             Rendering resolution. Defaults to OCR_DPI.
+
+    Returns:
+        str: Code de langue Tesseract à utiliser pour tout le document (`languages` si rien n'est détecté).
+             Tesseract language code to use for the whole document (`languages` if nothing is detected).
+    """
+    if '+' not in languages:
+        return languages
+    with _open_pdf(file_path) as pdf_document:
+        if page_nums is None:
+            page_nums = range(pdf_document.page_count)
+        sampled = 0
+        for page_num in page_nums:
+            image = _render_pdf_page(pdf_document, page_num, dpi)
+            if page_information(image)["low_information"]:
+                continue
+            lang = detect_ocr_language(image, languages)
+            if lang:
+                return lang
+            sampled += 1
+            if sampled >= max_sample_pages:
+                break
+    return languages
+
+
+def iter_pdf_pages_scanned(file_path, languages='eng+fra+jpn+chi_sim+chi_tra', workers=None, report=None, dpi=None):
+    """
+    Description:
+        Générateur qui applique l'OCR à un PDF scanné page par page, pour que le traitement en aval
+        (découpage, résumés) puisse commencer avant la fin de l'OCR du document.
+        Avec plusieurs workers, les pages sont rastérisées et traitées en parallèle dans un pool de processus
+        (Tesseract n'utilise qu'un cœur par appel) puis retournées dans l'ordre des pages.
+        Generator applying OCR to a scanned PDF page by page, so that downstream processing
+        (chunking, summaries) can start before the whole document has been OCRed.
+        With several workers, pages are rasterized and processed in parallel in a process pool
+        (Tesseract only uses one core per call) and yielded back in page order.
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        languages (str): Langues initiales pour Tesseract (ex: 'eng+fra+jpn+chi_sim+chi_tra').
+                         Initial languages for Tesseract (e.g., 'eng+fra+jpn+chi_sim+chi_tra').
+        workers (int, optional): Nombre de processus OCR. Par défaut OCR_WORKERS ; 1 = séquentiel.
+                                 Number of OCR processes. Defaults to OCR_WORKERS; 1 = sequential.
+        report (list, optional): Si fourni, reçoit un dict par page {'page', 'method' ('ocr' ou 'skipped'), 'lang', 'seconds', 'chars'}.
+                                 If given, receives one dict per page {'page', 'method' ('ocr' or 'skipped'), 'lang', 'seconds', 'chars'}.
+        dpi (int, optional): Résolution de rendu des pages OCR. Par défaut OCR_DPI.
+                             Rendering resolution of OCR pages. Defaults to OCR_DPI.
+
+    Yields:
+        str: Texte OCR de la page, terminé par un retour à la ligne.
+             OCR text of the page, ending with a newline.
+    """
+    with _open_pdf(file_path) as pdf_document:
+        page_count = pdf_document.page_count
+
+    # Langue choisie une fois pour tout le document : une seule passe OCR par page ensuite.
+    # Language picked once for the whole document: a single OCR pass per page afterwards.
+    lang = detect_pdf_ocr_language(file_path, languages, dpi=dpi)
+    print(f"[OCR] Langue retenue pour le document : {lang}")
+
+    for page_num, (page_block, elapsed, skipped) in enumerate(_iter_ocr_pdf_pages(file_path, range(page_count), lang, workers, dpi)):
+        if skipped:
+            print(f"[OCR] Page {page_num + 1}/{page_count} — page vide, OCR ignoré")
+        else:
+            print(f"[OCR] Page {page_num + 1}/{page_count} — Temps écoulé : {elapsed:.2f} secondes")
+        if report is not None:
+            if skipped:
+                report.append({"page": page_num + 1, "method": "skipped", "seconds": elapsed, "chars": 0})
+            else:
+                report.append({"page": page_num + 1, "method": "ocr", "lang": lang, "seconds": elapsed, "chars": len(page_block.strip())})
+        yield page_block
+
+
+def _iter_ocr_pdf_pages(file_path, page_nums, lang, workers=None, dpi=None):
+    """
+    Description:
+        Applique l'OCR à une liste de pages, en parallèle si plusieurs workers sont disponibles, et retourne les résultats dans l'ordre de `page_nums`.
+        OCRs a list of pages, in parallel when several workers are available, and yields the results in `page_nums` order.
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        page_nums (list[int]): Index des pages à traiter (à partir de 0).
+                               Indexes of the pages to process (0-based).
+        lang (str): Langue Tesseract du document.
+                    Tesseract language of the document.
+        workers (int, optional): Nombre de processus OCR. Par défaut OCR_WORKERS ; 1 = séquentiel.
+                                 Number of OCR processes. Defaults to OCR_WORKERS; 1 = sequential.
+        dpi (int, optional): Résolution de rendu des pages OCR. Par défaut OCR_DPI.
+                             Rendering resolution of OCR pages. Defaults to OCR_DPI.
+
+    Yields:
+        tuple[str, float, bool]: Texte OCR de la page, durée en secondes et True si la page a été écartée sans OCR.
+                                 OCR text of the page, duration in seconds and True if the page was skipped without OCR.
+    """
+    page_nums = list(page_nums)
+    workers = min(workers or OCR_WORKERS, len(page_nums)) if page_nums else 1
+
+    if workers <= 1:
+        for page_num in page_nums:
+            yield _ocr_pdf_page(file_path, page_num, lang, dpi)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker)
+    try:
+        yield from pool.map(_ocr_pdf_page, [file_path] * len(page_nums), page_nums, [lang] * len(page_nums), [dpi] * len(page_nums))
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def extract_text_from_pdf_scanned(file_path, languages='eng+fra+jpn+chi_sim+chi_tra', workers=None, report=None, dpi=None):
+    """
+    Description:
+        Extrait le texte d'un PDF scanné en utilisant l'OCR et ajuste la reconnaissance selon la langue détectée.
+        Les pages sont traitées en parallèle si plusieurs workers sont disponibles.
+        Extracts text from a scanned PDF using OCR and adjusts recognition based on the detected language.
+        La langue est choisie une fois par document, puis chaque page ne subit qu'une seule passe OCR.
+        The language is picked once per document, then each page goes through a single OCR pass.
+        Pages are processed in parallel when several workers are available.
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        languages (str): Langues initiales pour Tesseract (ex: 'eng+fra+jpn+chi_sim+chi_tra').
+                         Initial languages for Tesseract (e.g., 'eng+fra+jpn+chi_sim+chi_tra').
+        workers (int, optional): Nombre de processus OCR. Par défaut OCR_WORKERS ; 1 = séquentiel.
+                                 Number of OCR processes. Defaults to OCR_WORKERS; 1 = sequential.
+        report (list, optional): Si fourni, reçoit le temps de traitement de chaque page.
+                                 If given, receives the processing time of each page.
+        dpi (int, optional): Résolution de rendu des pages OCR. Par défaut OCR_DPI.
+                             Rendering resolution of OCR pages. Defaults to OCR_DPI.
+
+    Returns:
+        str: Texte extrait du PDF.
+             Text extracted from the PDF.
+    """
+    #Timers Start
+    start_time = time.time()
+    text = "".join(iter_pdf_pages_scanned(file_path, languages=languages, workers=workers, report=report, dpi=dpi)).strip()
+    # Timers End
+    elapsed = time.time() - start_time
+    print(f"Fin extract_text_from_pdf_scanned: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
+    return text
+
+
+def is_usable_text_layer(text, min_letters=None):
+    """
+    Description:
+        Indique si la couche texte d'une page est exploitable, ou si la page doit passer par l'OCR.
+        Seul le texte inutilisable est écarté (page vide, chiffres ou ponctuation seuls, glyphes non décodés) :
+        un texte court mais lisible (titre de chapitre, page de garde) est conservé.
+        Tells whether the text layer of a page is usable, or whether the page has to go through OCR.
+        Only unusable text is rejected (empty page, digits or punctuation alone, undecoded glyphs):
+        short but readable text (chapter title, divider page) is kept.
+
+    Args:
+        text (str): Texte de la couche texte de la page.
+                    Text-layer content of the page.
+        min_letters (int, optional): Nombre minimal de lettres. Par défaut MIN_TEXT_LAYER_LETTERS.
+                                     Minimum number of letters. Defaults to MIN_TEXT_LAYER_LETTERS.
+
+    Returns:
+        bool: True si le texte peut être conservé tel quel.
+              True if the text can be kept as is.
+    """
+    if min_letters is None:
+        min_letters = MIN_TEXT_LAYER_LETTERS
+    compact = "".join((text or "").split())
+    if not compact or sum(1 for c in compact if c.isalpha()) < min_letters:
+        return False
+
+    # Glyphes non décodés : caractère de remplacement, "(cid:123)", zone d'usage privé.
+    # Undecoded glyphs: replacement character, "(cid:123)", private use area.
+    undecoded = compact.count("\ufffd") + 8 * compact.count("(cid:") + sum(1 for c in compact if "\ue000" <= c <= "\uf8ff")
+    alnum = sum(1 for c in compact if c.isalnum())
+    return undecoded / len(compact) < 0.1 and alnum / len(compact) >= 0.4
+
+
+def iter_pdf_pages(file_path, languages='eng+fra+jpn+chi_sim+chi_tra', workers=None, report=None, dpi=None):
+    """
+    Description:
+        Extraction hybride page par page : la couche texte est conservée là où elle est exploitable,
+        et seules les pages sans texte (ou avec un texte inexploitable) passent par l'OCR.
+        La couche texte est lue au fil de l'eau : chaque page est classée à sa lecture, une page texte est retournée
+        dès que les pages OCR qui la précèdent sont prêtes, et les pages OCR sont traitées en parallèle
+        avec au plus OCR_PAGES_WINDOW pages en attente par worker. Le tout est retourné dans l'ordre du document.
+        Hybrid page-by-page extraction: the text layer is kept wherever it is usable,
+        and only pages with no (or unusable) text go through OCR.
+        The text layer is read as it goes: each page is classified when it is read, a text page is yielded
+        as soon as the OCR pages before it are ready, and OCR pages are processed in parallel
+        with at most OCR_PAGES_WINDOW pending pages per worker. Everything is yielded in document order.
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        languages (str): Langues autorisées pour l'OCR.
+                         Languages allowed for OCR.
+        workers (int, optional): Nombre de processus OCR. Par défaut OCR_WORKERS.
+                                 Number of OCR processes. Defaults to OCR_WORKERS.
+        report (list, optional): Si fourni, reçoit un dict par page {'page', 'method' ('text', 'ocr' ou 'skipped'), 'seconds', 'chars'}.
+                                 If given, receives one dict per page {'page', 'method' ('text', 'ocr' or 'skipped'), 'seconds', 'chars'}.
+        dpi (int, optional): Résolution de rendu des pages OCR. Par défaut OCR_DPI.
+                             Rendering resolution of OCR pages. Defaults to OCR_DPI.
+
+    Yields:
+        str: Texte de chaque page.
+             Text of each page.
+    """
+    workers = workers or OCR_WORKERS
+    lang = None
+    pool = None
+    window = 0
+    # Pages lues mais pas encore retournées : (index, couche texte, durée de lecture, tâche OCR ou None).
+    # Pages read but not yet yielded: (index, text layer, reading time, OCR task or None).
+    pending = deque()
+
+    def finish(page_num, layer_text, text_time, task):
+        if task is None:
+            return layer_text, "text", text_time
+        page_text, elapsed, skipped = task()
+        # La lecture de la couche texte fait aussi partie du coût de la page.
+        # Reading the text layer is also part of the page cost.
+        elapsed += text_time
+        method = "skipped" if skipped else "ocr"
+        if not skipped:
+            print(f"[PDF] Page {page_num + 1} — OCR — Temps écoulé : {elapsed:.2f} secondes")
+        if not page_text.strip() and layer_text.strip():
+            # Page écartée ou OCR vide : la couche texte, même jugée inexploitable, n'est pas perdue.
+            # Skipped page or empty OCR: the text layer, even if judged unusable, is not lost.
+            return layer_text, "text", elapsed
+        return page_text, method, elapsed
+
+    def release():
+        page_num, layer_text, text_time, task = pending.popleft()
+        page_text, method, elapsed = finish(page_num, layer_text, text_time, task)
+        if report is not None:
+            entry = {"page": page_num + 1, "method": method, "seconds": elapsed, "chars": len(page_text.strip())}
+            if method == "ocr":
+                entry["lang"] = lang
+            report.append(entry)
+        return page_text
+
+    try:
+        start_time = time.time()
+        for page_num, layer_text in enumerate(iter_pdf_pages_text(file_path)):
+            text_time = time.time() - start_time
+            task = None
+            if not is_usable_text_layer(layer_text):
+                if lang is None:
+                    # Langue choisie à la première page OCR, à partir d'elle et des suivantes.
+                    # Language picked at the first OCR page, from it and the following ones.
+                    with _open_pdf(file_path) as pdf_document:
+                        page_count = pdf_document.page_count
+                    lang = detect_pdf_ocr_language(file_path, languages, page_nums=range(page_num, page_count), dpi=dpi)
+                    print(f"[PDF] Page {page_num + 1} sans texte exploitable → OCR ({lang})")
+                    if workers > 1:
+                        from concurrent.futures import ProcessPoolExecutor
+                        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker)
+                        window = workers * OCR_PAGES_WINDOW
+                if pool is None:
+                    task = partial(_ocr_pdf_page, file_path, page_num, lang, dpi)
+                else:
+                    task = pool.submit(_ocr_pdf_page, file_path, page_num, lang, dpi).result
+            pending.append((page_num, layer_text, text_time, task))
+            # Retourne tout ce qui est prêt sans attendre : pages texte en tête, ou fenêtre OCR pleine.
+            # Yields whatever is ready without waiting: text pages at the head, or full OCR window.
+            while pending and (pending[0][3] is None or len(pending) > window):
+                yield release()
+            start_time = time.time()
+        while pending:
+            yield release()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def extract_text_from_pdf(file_path, languages='eng+fra+jpn+chi_sim+chi_tra', workers=None, report=None, dpi=None,
+                          strip_boilerplate=True, boilerplate_report=None, page_texts=None):
+    """
+    Description:
+        Extraction générale du texte d'un PDF, page par page (voir iter_pdf_pages) :
+        couche texte sélectionnable là où elle existe, OCR uniquement pour les pages vides ou illisibles.
+        Par défaut, les en-têtes, pieds de page et numéros de page répétés sont retirés (voir strip_repeated_page_lines) ;
+        avec strip_boilerplate=False, un PDF entièrement textuel donne le même résultat que extract_text_from_pdf_text(file_path).
+        General extraction of text from a PDF, page by page (see iter_pdf_pages):
+        selectable text layer where it exists, OCR only for empty or unreadable pages.
+        By default, repeated headers, footers and page numbers are removed (see strip_repeated_page_lines);
+        with strip_boilerplate=False, a fully textual PDF gives the same result as extract_text_from_pdf_text(file_path).
+
+    Args:
+        file_path (str or bytes): Chemin du PDF, ou contenu du PDF (ex : membre d'une archive).
+                                  Path to the PDF file, or content of the PDF (e.g., archive member).
+        languages (str): Langues autorisées pour l'OCR.
+                         Languages allowed for OCR.
+        workers (int, optional): Nombre de processus OCR. Par défaut OCR_WORKERS.
+                                 Number of OCR processes. Defaults to OCR_WORKERS.
+        report (list, optional): Si fourni, reçoit le chemin suivi (texte/OCR/page vide ignorée) et la durée de chaque page.
+                                 If given, receives the path taken (text/OCR/skipped blank page) and the duration of each page.
+        dpi (int, optional): Résolution de rendu des pages OCR. Par défaut OCR_DPI.
+                             Rendering resolution of OCR pages. Defaults to OCR_DPI.
+        strip_boilerplate (bool): Retire les en-têtes et pieds de page répétés (True par défaut ; False pour le texte brut des pages).
+                                  Removes repeated headers and footers (True by default; False for the raw page text).
+        boilerplate_report (dict, optional): Si fourni, reçoit les lignes, caractères et tokens retirés.
+                                             If given, receives the lines, characters and tokens removed.
+        page_texts (list, optional): Si fourni, reçoit le texte de chaque page (voir extract_sections_from_pdf).
+                                     If given, receives the text of each page (see extract_sections_from_pdf).
+
+    Returns:
+        str: Texte extrait du PDF.
+             Text extracted from the PDF.
+    """
+    pages_report = [] if report is None else report
+    pages = list(iter_pdf_pages(file_path, languages=languages, workers=workers, report=pages_report, dpi=dpi))
+    if strip_boilerplate:
+        stripped_report = {} if boilerplate_report is None else boilerplate_report
+        pages = strip_repeated_page_lines(pages, report=stripped_report)
+        if stripped_report["lines_removed"]:
+            print(f"[PDF] En-têtes/pieds de page répétés retirés : {stripped_report['lines_removed']} lignes, "
+                  f"{stripped_report['tokens_removed']} tokens économisés")
+    if page_texts is not None:
+        page_texts.extend(pages)
+    extracted_text = "".join(pages)
+
+    ocr_count = sum(1 for entry in pages_report if entry["method"] == "ocr")
+    skipped_count = sum(1 for entry in pages_report if entry["method"] == "skipped")
+    ocr_time = sum(entry["seconds"] for entry in pages_report if entry["method"] == "ocr")
+    print(f"[PDF] {len(pages_report)} pages : {len(pages_report) - ocr_count - skipped_count} couche texte, "
+          f"{ocr_count} OCR ({ocr_time:.2f} secondes), {skipped_count} vides ignorées")
+    return extracted_text
+
+
+def _normalize_page_line(line):
+    """
+    Description:
+        Forme normalisée d'une ligne pour repérer ses répétitions : minuscules, espaces réduits, nombres remplacés par '#'
+        (« Page 3 / 12 » et « Page 4 / 12 » deviennent identiques).
+        Normalized form of a line to spot its repetitions: lowercase, collapsed spaces, numbers replaced by '#'
+        ("Page 3 / 12" and "Page 4 / 12" become identical).
+    """
+    return re.sub(r'\s+', ' ', re.sub(r'\d+', '#', line.strip().lower()))
+
+
+def _is_page_number_line(normalized):
+    """
+    Description:
+        Indique si une ligne normalisée est un numéro de page seul (« # », « - # - », « page # », « # / # », « # of # »).
+        Tells whether a normalized line is a lone page number ("#", "- # -", "page #", "# / #", "# of #").
+    """
+    return re.fullmatch(r'(page|p\.|seite|pagina)?\s*[-–—(\[]?\s*#\s*([/|]\s*#|(of|sur|de) #)?\s*[-–—)\]]?', normalized) is not None
+
+
+def _iter_page_line_zones(lines):
+    """
+    Description:
+        Parcourt les premières et dernières lignes non vides d'une page (zones d'en-tête et de pied de page),
+        avec leur rang compté depuis le bord de la page.
+        Iterates over the first and last non-empty lines of a page (header and footer zones),
+        with their rank counted from the edge of the page.
+
+    Yields:
+        tuple[str, int, int]: Zone ('top' ou 'bottom'), rang depuis le bord, index de la ligne.
+                              Zone ('top' or 'bottom'), rank from the edge, line index.
+    """
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    for rank, index in enumerate(filled[:REPEATED_LINE_ZONE]):
+        yield "top", rank, index
+    for rank, index in enumerate(reversed(filled[-REPEATED_LINE_ZONE:])):
+        yield "bottom", rank, index
+
+
+def find_repeated_page_lines(pages):
+    """
+    Description:
+        Repère les lignes qui reviennent au même endroit (même rang depuis le haut ou le bas de la page)
+        sur une grande partie des pages : en-têtes et pieds de page courants, numéros de page, mentions légales.
+        Finds the lines that come back at the same place (same rank from the top or bottom of the page)
+        on a large share of the pages: running headers and footers, page numbers, legal notices.
+
+    Args:
+        pages (list[str]): Texte de chaque page.
+                           Text of each page.
+
+    Returns:
+        set[tuple[str, int, str]]: Triplets (zone 'top'/'bottom', rang, ligne normalisée) à retirer.
+                                   (zone 'top'/'bottom', rank, normalized line) triples to remove.
+    """
+    counts = {}
+    for page in pages:
+        lines = page.split("\n")
+        seen = set()
+        for zone, rank, index in _iter_page_line_zones(lines):
+            normalized = _normalize_page_line(lines[index])
+            if len(normalized.replace(" ", "")) >= REPEATED_LINE_MIN_CHARS or _is_page_number_line(normalized):
+                seen.add((zone, rank, normalized))
+        for key in seen:
+            counts[key] = counts.get(key, 0) + 1
+
+    min_pages = max(REPEATED_LINE_MIN_PAGES, math.ceil(len(pages) * REPEATED_LINE_RATIO))
+    return {key for key, count in counts.items() if count >= min_pages}
+
+
+def find_pdf_repeated_lines(file_path, sample_pages=REPEATED_LINE_SAMPLE_PAGES):
+    """
+    Description:
+        Repère les lignes répétées d'un PDF sur la couche texte de ses `sample_pages` premières pages (voir find_repeated_page_lines).
+        Lecture peu coûteuse et sans OCR : en mode flux, les pages OCR n'ont pas à être mises en attente pour apprendre les répétitions.
+        Un PDF entièrement scanné n'a pas de couche texte : rien n'est alors retiré en mode flux.
+        Finds the repeated lines of a PDF on the text layer of its first `sample_pages` pages (see find_repeated_page_lines).
+        Cheap reading without OCR: in streaming mode, OCR pages do not have to be held back to learn the repetitions.
+        A fully scanned PDF has no text layer: nothing is removed in streaming mode then.
+
+    Args:
+        file_path (str or bytes): Chemin du PDF, ou contenu du PDF.
+                                  Path to the PDF file, or content of the PDF.
+        sample_pages (int): Nombre de pages examinées.
+                            Number of pages examined.
+
+    Returns:
+        set[tuple[str, int, str]]: Triplets (zone 'top'/'bottom', rang, ligne normalisée) à retirer.
+                                   (zone 'top'/'bottom', rank, normalized line) triples to remove.
+    """
+    return find_repeated_page_lines(list(itertools.islice(iter_pdf_pages_text(file_path), sample_pages)))
+
+
+def iter_strip_repeated_page_lines(pages, sample_pages=REPEATED_LINE_SAMPLE_PAGES, report=None, repeated=None):
+    """
+    Description:
+        Retire des pages les en-têtes, pieds de page et numéros de page répétés (voir find_repeated_page_lines),
+        avant le découpage en chunks. Les lignes répétées sont apprises sur les `sample_pages` premières pages,
+        puis retirées de toutes les pages au fil de l'eau. Si `repeated` est fourni (ex : find_pdf_repeated_lines),
+        aucune page n'est mise en attente : chaque page est retournée dès qu'elle arrive.
+        Removes repeated headers, footers and page numbers from the pages (see find_repeated_page_lines),
+        before chunking. Repeated lines are learned on the first `sample_pages` pages,
+        then removed from every page as they come. If `repeated` is given (e.g., find_pdf_repeated_lines),
+        no page is held back: each page is yielded as soon as it arrives.
+
+    Args:
+        pages (iterable[str]): Texte de chaque page, dans l'ordre.
+                               Text of each page, in order.
+        sample_pages (int or None): Pages utilisées pour repérer les répétitions (None : toutes).
+                                    Pages used to detect repetitions (None: all of them).
+        report (dict, optional): Si fourni, reçoit {'pages', 'lines_removed', 'chars_removed', 'tokens_removed'}.
+                                 If given, receives {'pages', 'lines_removed', 'chars_removed', 'tokens_removed'}.
+        repeated (set, optional): Lignes répétées déjà connues ; `sample_pages` est alors ignoré.
+                                  Already known repeated lines; `sample_pages` is then ignored.
+
+    Yields:
+        str: Texte de chaque page sans les lignes répétées.
+             Text of each page without the repeated lines.
+    """
+    pages = iter(pages)
+    buffered = []
+    if repeated is None:
+        for page in pages:
+            buffered.append(page)
+            if sample_pages is not None and len(buffered) >= sample_pages:
+                break
+        repeated = find_repeated_page_lines(buffered)
+
+    if report is not None:
+        report.update({"pages": 0, "lines_removed": 0, "chars_removed": 0, "tokens_removed": 0})
+
+    for page in itertools.chain(buffered, pages):
+        stripped = page
+        if repeated:
+            lines = page.split("\n")
+            removed = {index for zone, rank, index in _iter_page_line_zones(lines)
+                       if (zone, rank, _normalize_page_line(lines[index])) in repeated}
+            if removed:
+                stripped = "\n".join(line for index, line in enumerate(lines) if index not in removed)
+                if report is not None:
+                    from Podcast_Generator import MainContentExtractor
+                    report["lines_removed"] += len(removed)
+                    report["chars_removed"] += len(page) - len(stripped)
+                    report["tokens_removed"] += MainContentExtractor.count_tokens(page) - MainContentExtractor.count_tokens(stripped)
+        if report is not None:
+            report["pages"] += 1
+        yield stripped
+
+
+def strip_repeated_page_lines(pages, report=None):
+    """
+    Description:
+        Version non incrémentale de iter_strip_repeated_page_lines : les répétitions sont cherchées sur toutes les pages.
+        Non-incremental version of iter_strip_repeated_page_lines: repetitions are searched over every page.
+
+    Args:
+        pages (list[str]): Texte de chaque page.
+                           Text of each page.
+        report (dict, optional): Si fourni, reçoit les lignes, caractères et tokens retirés.
+                                 If given, receives the lines, characters and tokens removed.
+
+    Returns:
+        list[str]: Pages sans les lignes répétées.
+                   Pages without the repeated lines.
+    """
+    return list(iter_strip_repeated_page_lines(pages, sample_pages=None, report=report))
+
+
+def iter_file_sections(path):
+    """
+    Description:
+        Générateur d'extraction incrémentale : retourne le texte d'une source par morceaux
+        (pages pour les PDF et les archives WARC, paragraphes pour les DOCX, document entier pour les autres formats)
+        dès qu'ils sont disponibles.
+        Incremental extraction generator: yields the text of a source in pieces
+        (pages for PDFs and WARC archives, paragraphs for DOCX, the whole document for other formats)
+        as soon as they are available.
+
+    Args:
+        path (str): Chemin vers le fichier ou URL.
+                    Path to the file or URL.
+
+    Yields:
+        str: Sections de texte, dans l'ordre du document.
+             Text sections, in document order.
+    """
+    extension = None if re.match(r'^https?://', path) else _file_extension(path)
+    if extension == '.pdf':
+        # PDF déjà extrait (voir extract_file_handler) : ses pages sont servies par le cache, sans nouvel OCR.
+        # PDF already extracted (see extract_file_handler): its pages are served by the cache, without new OCR.
+        cached = ExtractionCache.load_extraction(path, OCR_LANGUAGES, OCR_DPI)
+        if cached is not None and "page_texts" in cached:
+            print(f"[Cache] Pages réutilisées : {Path(path).name}")
+            yield from cached["page_texts"]
+            return
+        # Répétitions apprises sur la couche texte : les pages OCR sont retournées dès qu'elles sont prêtes.
+        # Repetitions learned on the text layer: OCR pages are yielded as soon as they are ready.
+        yield from iter_strip_repeated_page_lines(iter_pdf_pages(path, languages=OCR_LANGUAGES, dpi=OCR_DPI),
+                                                  repeated=find_pdf_repeated_lines(path))
+        return
+    if extension == '.warc':
+        yield from iter_warc_texts(path)
+        return
+    if extension == '.docx':
+        for paragraph in iter_docx_paragraphs(path):
+            if paragraph["text"].strip():
+                yield paragraph["text"]
+        return
+
+    text = extract_file_handler(path)
+    if text:
+        yield text
+
+#DOCX
+def extract_text_from_docx(file_path):
+    """
+    Description:
+        Extrait le texte d'un fichier DOCX, paragraphes séparés par une ligne vide.
+        Lecture en flux (voir iter_docx_paragraphs) : les médias ne sont jamais lus et l'arbre XML complet
+        n'est jamais construit. Les en-têtes et pieds de page (numéros de page) ne font pas partie du texte.
+        Extracts text from a DOCX file, paragraphs separated by a blank line.
+        Streamed (see iter_docx_paragraphs): media are never read and the full XML tree
+        is never built. Headers and footers (page numbers) are not part of the text.
+
+    Args:
+        file_path (str or file-like): Chemin du fichier DOCX, ou fichier ouvert.
+                                      Path to the DOCX file, or open file.
+
+    Returns:
+        str: Texte extrait du DOCX.
+             Text extracted from the DOCX.
+    """
+    return "\n\n".join(paragraph["text"] for paragraph in iter_docx_paragraphs(file_path)).strip()
+
+#Markdown/MD
+def extract_text_from_markdown(file_path):
+    """
+    Description:
+        Extraction du texte à partir d'un fichier Markdown.
+        Convertit le Markdown en HTML puis en texte brut.
+        Extracts text from a Markdown file.
+        Converts Markdown to HTML and then extracts plain text.
+
+    Args:
+        file_path (str): Chemin du fichier Markdown.
+                         Path to the Markdown file.
+
+    Returns:
+        str: Texte extrait du Markdown.
+             Text extracted from the Markdown.
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        markdown_content = file.read()
+    return markdown_to_text(markdown_content)
+
+
+def markdown_to_text(markdown_content):
+    """
+    Description:
+        Convertit du Markdown en texte brut (via HTML).
+        Converts Markdown to plain text (through HTML).
+
+    Args:
+        markdown_content (str): Contenu Markdown.
+                                Markdown content.
+
+    Returns:
+        str: Texte brut.
+             Plain text.
+    """
+    import markdown
+    from bs4 import BeautifulSoup
+
+    # Convertir le markdown en HTML.
+    # Convert Markdown to HTML.
+    html = markdown.markdown(markdown_content)
+
+    # Utiliser BeautifulSoup pour retirer les balises HTML.
+    # Use BeautifulSoup to remove HTML tags.
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.get_text()
+
+
+#Latex/TEX
+# Commandes d'inclusion LaTeX : \input{f}, \include{f}, \subfile{f}, \import{dossier}{f}, \subimport{dossier}{f}.
+# LaTeX inclusion commands: \input{f}, \include{f}, \subfile{f}, \import{folder}{f}, \subimport{folder}{f}.
+LATEX_INCLUDE_PATTERN = re.compile(
+    r'\\(input|include|subfile)\s*\{([^{}]*)\}|\\(import|subimport)\*?\s*\{([^{}]*)\}\s*\{([^{}]*)\}')
+
+# Paramètres des entrées LaTeX dans le cache d'extraction (ni langues OCR ni résolution de rendu).
+# Parameters of the LaTeX entries in the extraction cache (no OCR languages nor rendering resolution).
+LATEX_CACHE_LANGUAGES = "latex"
+LATEX_CACHE_DPI = 0
+
+
+def extract_text_from_latex(file_path, use_cache=True):
+    """
+    Description:
+        Extraction du texte d'un projet LaTeX à partir de son fichier principal.
+        Les fichiers inclus (\\input, \\include, \\subfile, \\import, \\subimport) sont résolus récursivement
+        et remplacés dans le source (voir expand_latex_source), qui est converti en une seule fois : un environnement
+        ouvert avant une inclusion et fermé après (document, verbatim, équation...) reste équilibré.
+        Le résultat est mis en cache selon l'empreinte de chaque fichier du projet : la modification d'un chapitre invalide l'entrée.
+        Le source est converti avec pylatexenc si installé, sinon avec un nettoyage basique (voir latex_to_text).
+        Extracts the text of a LaTeX project from its main file.
+        Included files (\\input, \\include, \\subfile, \\import, \\subimport) are resolved recursively
+        and replaced in the source (see expand_latex_source), which is converted in one go: an environment
+        opened before an inclusion and closed after it (document, verbatim, equation...) stays balanced.
+        The result is cached by the digest of every file of the project: a change in a chapter invalidates the entry.
+        The source is converted with pylatexenc when installed, otherwise with a basic cleanup (see latex_to_text).
+
+    Args:
+        file_path (str): Chemin du fichier LaTeX principal.
+                         Path to the main LaTeX file.
+        use_cache (bool): Réutiliser / enregistrer la conversion du projet dans le cache d'extraction.
+                          Reuse / store the conversion of the project in the extraction cache.
+
+    Returns:
+        str: Texte extrait du LaTeX.
+             Text extracted from the LaTeX.
+    """
+    project = resolve_latex_project(file_path)
+    main_path = str(Path(file_path).resolve())
+
+    digest = None
+    if use_cache:
+        digest = ExtractionCache.files_digest(project)
+        cached = ExtractionCache.load_extraction(main_path, LATEX_CACHE_LANGUAGES, LATEX_CACHE_DPI, digest=digest)
+        if cached is not None:
+            print(f"[Cache] Extraction réutilisée : {Path(file_path).name}")
+            return cached["text"]
+
+    text = latex_to_text(_assemble_latex_project(project, main_path, lambda path: project[path]["segments"], "\n", []))
+    if use_cache:
+        ExtractionCache.save_extraction(main_path, text, [], LATEX_CACHE_LANGUAGES, LATEX_CACHE_DPI, digest=digest)
+    return text
+
+
+def latex_to_text(latex_content):
+    """
+    Description:
+        Convertit du code LaTeX en texte brut (pylatexenc si installé, sinon nettoyage basique).
+        Converts LaTeX code to plain text (pylatexenc when installed, otherwise basic cleanup).
+
+    Args:
+        latex_content (str): Code LaTeX.
+                             LaTeX code.
+
+    Returns:
+        str: Texte brut.
+             Plain text.
+    """
+    try:
+        from pylatexenc.latex2text import LatexNodes2Text
+        text = LatexNodes2Text().latex_to_text(latex_content)
+    except ImportError:
+        # Si pylatexenc n'est pas installé, appliquer un nettoyage basique.
+        # If pylatexenc is not installed, perform basic cleanup.
+        text = re.sub(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?(?:\{[^\}]*\})?', '', latex_content)
+
+    return text
+
+
+def _split_latex_includes(latex_content):
+    """
+    Description:
+        Découpe un fichier LaTeX autour de ses commandes d'inclusion (hors commentaires, jusqu'à \\endinput).
+        Splits a LaTeX file around its inclusion commands (comments aside, up to \\endinput).
+
+    Returns:
+        tuple: (segments, inclusions) avec len(segments) == len(inclusions) + 1 ;
+               chaque inclusion est (commande, dossier ou None, fichier).
+               (segments, inclusions) with len(segments) == len(inclusions) + 1;
+               each inclusion is (command, folder or None, file).
+    """
+    # Commentaires masqués par des espaces : les positions restent celles du texte d'origine.
+    # Comments masked with spaces: positions stay those of the original text.
+    masked = re.sub(r'(?<!\\)%.*', lambda match: " " * len(match.group()), latex_content)
+    end_input = re.search(r'\\endinput(?![a-zA-Z])', masked)
+    if end_input:
+        latex_content = latex_content[:end_input.start()]
+        masked = masked[:end_input.start()]
+
+    segments = []
+    inclusions = []
+    position = 0
+    for match in LATEX_INCLUDE_PATTERN.finditer(masked):
+        segments.append(latex_content[position:match.start()])
+        if match.group(1):
+            inclusions.append((match.group(1), None, match.group(2).strip()))
+        else:
+            inclusions.append((match.group(3), match.group(4).strip(), match.group(5).strip()))
+        position = match.end()
+    segments.append(latex_content[position:])
+    return segments, inclusions
+
+
+def _resolve_latex_include(command, folder, name, file_dir, base_dir, root_dir):
+    """
+    Description:
+        Chemin d'un fichier inclus, ou None s'il est introuvable. Comme LaTeX : \\input et \\include
+        depuis le dossier du fichier principal (ou celui fixé par \\import), \\subfile et \\subimport
+        depuis le dossier du fichier courant ; l'extension .tex est ajoutée si nécessaire.
+        Path of an included file, or None when not found. As in LaTeX: \\input and \\include
+        from the folder of the main file (or the one set by \\import), \\subfile and \\subimport
+        from the folder of the current file; the .tex extension is added when needed.
+
+    Returns:
+        tuple: (chemin résolu ou None, dossier de base des inclusions du fichier inclus).
+               (resolved path or None, base folder for the inclusions of the included file).
+    """
+    if command == "import":
+        base_dir = root_dir / folder
+        candidates = [base_dir]
+    elif command == "subimport":
+        base_dir = file_dir / folder
+        candidates = [base_dir]
+    elif command == "subfile":
+        candidates = [file_dir]
+    else:
+        candidates = [base_dir, file_dir]
+
+    for directory in candidates:
+        for candidate in (directory / name, directory / f"{name}.tex"):
+            if candidate.is_file():
+                return str(candidate.resolve()), base_dir
+    return None, base_dir
+
+
+def resolve_latex_project(file_path):
+    """
+    Description:
+        Résout le graphe d'inclusion d'un projet LaTeX à partir de son fichier principal.
+        Les fichiers introuvables sont signalés et ignorés ; les inclusions circulaires sont coupées à l'assemblage.
+        Resolves the inclusion graph of a LaTeX project from its main file.
+        Missing files are reported and skipped; circular inclusions are cut during assembly.
+
+    Args:
+        file_path (str): Chemin du fichier LaTeX principal.
+                         Path to the main LaTeX file.
+
+    Returns:
+        dict: {chemin absolu: {'segments': list[str], 'includes': list[str or None]}}, dans l'ordre de première
+              apparition ; includes[i] est le fichier inclus entre segments[i] et segments[i + 1].
+              {absolute path: {'segments': list[str], 'includes': list[str or None]}}, in order of first
+              appearance; includes[i] is the file included between segments[i] and segments[i + 1].
+    """
+    main_path = Path(file_path).resolve()
+    root_dir = main_path.parent
+    project = {}
+    pending = [(main_path, root_dir)]
+    while pending:
+        path, base_dir = pending.pop()
+        if str(path) in project:
+            continue
+        with open(path, 'r', encoding='utf-8') as file:
+            segments, inclusions = _split_latex_includes(file.read())
+
+        includes = []
+        children = []
+        for command, folder, name in inclusions:
+            child, child_base = _resolve_latex_include(command, folder, name, path.parent, base_dir, root_dir)
+            if child is None:
+                print(f"[LaTeX] Fichier inclus introuvable : {name} ({path.name})")
+            else:
+                children.append((Path(child), child_base))
+            includes.append(child)
+        project[str(path)] = {"segments": segments, "includes": includes}
+        # Pile : les fichiers sont découverts dans l'ordre du document.
+        # Stack: files are discovered in document order.
+        pending.extend(reversed(children))
+    return project
+
+
+def _assemble_latex_project(project, path, segments_of, separator, stack):
+    """
+    Description:
+        Assemble récursivement les segments d'un fichier et de ses inclusions dans l'ordre du document.
+        Recursively assembles the segments of a file and of its inclusions in document order.
+
+    Args:
+        project (dict): Graphe d'inclusion (voir resolve_latex_project).
+        path (str): Fichier à assembler.
+        segments_of (callable): Segments (source ou texte converti) d'un fichier.
+        separator (str): Séparateur inséré autour de chaque fichier inclus.
+        stack (list): Fichiers en cours d'assemblage (détection des inclusions circulaires).
+
+    Returns:
+        str: Contenu assemblé.
+    """
+    segments = segments_of(path)
+    parts = [segments[0]]
+    for child, segment in zip(project[path]["includes"], segments[1:]):
+        if child is not None and child in stack + [path]:
+            print(f"[LaTeX] Inclusion circulaire ignorée : {Path(child).name} ({Path(path).name})")
+        elif child is not None:
+            parts.append(separator + _assemble_latex_project(project, child, segments_of, separator, stack + [path]) + separator)
+        parts.append(segment)
+    return "".join(parts)
+
+
+def expand_latex_source(file_path):
+    """
+    Description:
+        Source LaTeX d'un projet avec chaque commande d'inclusion remplacée par le fichier inclus.
+        LaTeX source of a project with each inclusion command replaced by the included file.
+
+    Args:
+        file_path (str): Chemin du fichier LaTeX principal.
+                         Path to the main LaTeX file.
+
+    Returns:
+        str: Source LaTeX assemblée.
+             Assembled LaTeX source.
+    """
+    project = resolve_latex_project(file_path)
+    return _assemble_latex_project(project, str(Path(file_path).resolve()),
+                                   lambda path: project[path]["segments"], "\n", [])
+
+
+#Image
+def extract_text_from_image(file_path, languages='eng+fra+jpn+chi_sim+chi_tra'):
+    """
+    Description:
+        Extrait le texte d'une image en utilisant l'OCR avec optimisation linguistique.
+        Extracts text from an image using OCR with language optimization.
+
+    Notes:
+        Il faut des images propres et sans trop de bruit et avec une seule langue.
+        For good text extraction from images, you need clean images with minimal noise and a single language.
+
+    Args:
+        file_path (str or file-like): Chemin vers l'image, ou image ouverte en mémoire (ex : membre d'une archive).
+                                      Path to the image file, or in-memory image (e.g., archive member).
+        languages (str): Langues initiales pour Tesseract (ex: 'eng+fra+jpn+chi_sim+chi_tra').
+                         Initial languages for Tesseract (e.g., 'eng+fra+jpn+chi_sim+chi_tra').
+
+    Returns:
+        str: Texte extrait de l'image.
+             Text extracted from the image.
+    """
+    from PIL import Image
+
+    try:
+        image = Image.open(file_path)
+        # Améliorer la reconnaissance en convertissant en niveaux de gris.
+        # Enhance recognition by converting the image to grayscale.
+        image = image.convert('L')
+
+        # Image blanche ou quasi vide : inutile de lancer Tesseract.
+        # Blank or nearly empty image: no need to run Tesseract.
+        if page_information(image)["low_information"]:
+            print(f"[OCR] Image sans contenu exploitable, OCR ignoré : {Path(getattr(file_path, 'name', file_path)).name}")
+            return ""
+
+        # Choix de la langue (OSD / miniature) puis une seule passe OCR complète.
+        # Pick the language (OSD / thumbnail) then a single full OCR pass.
+        # Si la miniature ne contient pas de texte lisible, une passe avec toutes les langues.
+        # If the thumbnail holds no readable text, one pass with every language.
+        main_lang = detect_ocr_language(image, languages) or languages
+        text = ocr_image(image, main_lang).strip()
+
+        return text
+
+    except Exception as e:
+        print(f"Erreur lors du traitement de l'image : {e}")
+        return ""
+
+#Structure (arbre de sections)
+def _new_section(title=None, level=0, text=""):
+    """
+    Description:
+        Crée un nœud de l'arbre de sections : {'title', 'level', 'text', 'children'}.
+        La racine (level 0, sans titre) porte le texte placé avant le premier titre.
+        Creates a node of the section tree: {'title', 'level', 'text', 'children'}.
+        The root (level 0, no title) holds the text placed before the first heading.
+    """
+    return {"title": title, "level": level, "text": text, "children": []}
+
+
+def build_section_tree(preamble, headings):
+    """
+    Description:
+        Construit l'arbre de sections à partir de la liste des titres dans l'ordre du document :
+        chaque titre devient l'enfant du dernier titre de niveau inférieur.
+        Builds the section tree from the list of headings in document order:
+        each heading becomes the child of the last heading with a lower level.
+
+    Args:
+        preamble (str): Texte placé avant le premier titre.
+                        Text placed before the first heading.
+        headings (list[tuple[int, str, str]]): (niveau, titre, texte propre à la section), niveau >= 1.
+                                               (level, title, text of the section itself), level >= 1.
+
+    Returns:
+        dict: Racine de l'arbre {'title': None, 'level': 0, 'text', 'children'}.
+              Root of the tree {'title': None, 'level': 0, 'text', 'children'}.
+    """
+    root = _new_section(text=preamble)
+    stack = [root]
+    for level, title, text in headings:
+        while stack[-1]["level"] >= level:
+            stack.pop()
+        section = _new_section(title, level, text)
+        stack[-1]["children"].append(section)
+        stack.append(section)
+    return root
+
+
+def section_tree_text(section):
+    """
+    Description:
+        Texte complet d'une section (titre, texte propre puis sous-sections), dans l'ordre du document.
+        Full text of a section (title, own text then subsections), in document order.
+
+    Args:
+        section (dict): Nœud de l'arbre de sections (voir build_section_tree).
+                        Section tree node (see build_section_tree).
+
+    Returns:
+        str: Texte de la section.
+             Text of the section.
+    """
+    parts = []
+    if section["title"]:
+        parts.append(section["title"])
+    if section["text"].strip():
+        parts.append(section["text"].strip())
+    parts.extend(section_tree_text(child) for child in section["children"])
+    return "\n\n".join(part for part in parts if part)
+
+
+def extract_sections_from_markdown(file_path):
+    """
+    Description:
+        Arbre de sections d'un fichier Markdown à partir de ses titres (# à ######), hors blocs de code.
+        Section tree of a Markdown file from its headings (# to ######), code blocks aside.
+
+    Args:
+        file_path (str): Chemin du fichier Markdown.
+                         Path to the Markdown file.
+
+    Returns:
+        dict: Racine de l'arbre de sections (voir build_section_tree).
+              Root of the section tree (see build_section_tree).
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        lines = file.read().split("\n")
+
+    preamble = []
+    headings = []
+    body = preamble
+    in_code = False
+    for line in lines:
+        if re.match(r'^\s{0,3}(```|~~~)', line):
+            in_code = not in_code
+        heading = None if in_code else re.match(r'^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$', line)
+        if heading:
+            body = []
+            headings.append((len(heading.group(1)), heading.group(2), body))
+        else:
+            body.append(line)
+
+    return build_section_tree(
+        markdown_to_text("\n".join(preamble)),
+        [(level, title, markdown_to_text("\n".join(body))) for level, title, body in headings],
+    )
+
+
+# Niveaux des commandes de sectionnement LaTeX.
+# Levels of the LaTeX sectioning commands.
+LATEX_SECTION_LEVELS = {"part": 1, "chapter": 2, "section": 3, "subsection": 4, "subsubsection": 5, "paragraph": 6}
+
+
+def extract_sections_from_latex(file_path):
+    """
+    Description:
+        Arbre de sections d'un projet LaTeX (fichiers inclus compris, voir expand_latex_source)
+        à partir de \\part, \\chapter, \\section, \\subsection... (étoilés ou non).
+        Section tree of a LaTeX project (included files too, see expand_latex_source)
+        from \\part, \\chapter, \\section, \\subsection... (starred or not).
+
+    Args:
+        file_path (str): Chemin du fichier LaTeX principal.
+                         Path to the main LaTeX file.
+
+    Returns:
+        dict: Racine de l'arbre de sections (voir build_section_tree).
+              Root of the section tree (see build_section_tree).
+    """
+    latex_content = expand_latex_source(file_path)
+
+    pattern = re.compile(r'\\(' + '|'.join(LATEX_SECTION_LEVELS) + r')\*?\s*(?:\[[^\]]*\])?\s*\{((?:[^{}]|\{[^{}]*\})*)\}')
+    matches = list(pattern.finditer(latex_content))
+    headings = []
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(latex_content)
+        title = latex_to_text(match.group(2)).strip()
+        headings.append((LATEX_SECTION_LEVELS[match.group(1)], title, latex_to_text(latex_content[match.end():end])))
+
+    preamble_end = matches[0].start() if matches else len(latex_content)
+    return build_section_tree(latex_to_text(latex_content[:preamble_end]), headings)
+
+
+# Espace de noms WordprocessingML (document.xml, styles.xml).
+# WordprocessingML namespace (document.xml, styles.xml).
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _docx_heading_styles(docx_file):
+    """
+    Description:
+        Niveau de titre de chaque style de paragraphe d'un DOCX (niveau hiérarchique du style,
+        ou nom "heading N" / "titre N" pour les styles traduits).
+        Heading level of each paragraph style of a DOCX (outline level of the style,
+        or "heading N" / "titre N" name for translated styles).
+
+    Returns:
+        dict: {identifiant du style: niveau}.
+              {style id: level}.
+    """
+    import xml.etree.ElementTree as ET
+
+    levels = {}
+    try:
+        root = ET.fromstring(docx_file.read("word/styles.xml"))
+    except KeyError:
+        return levels
+    for style in root.iter(WORD_NAMESPACE + "style"):
+        style_id = style.get(WORD_NAMESPACE + "styleId")
+        outline = style.find(f"{WORD_NAMESPACE}pPr/{WORD_NAMESPACE}outlineLvl")
+        name = style.find(WORD_NAMESPACE + "name")
+        name = name.get(WORD_NAMESPACE + "val", "").lower() if name is not None else ""
+        heading = re.fullmatch(r'(?:heading|titre)\s*(\d)', name)
+        if outline is not None and int(outline.get(WORD_NAMESPACE + "val")) < 9:
+            levels[style_id] = int(outline.get(WORD_NAMESPACE + "val")) + 1
+        elif heading:
+            levels[style_id] = int(heading.group(1))
+    return levels
+
+
+def _docx_paragraph_text(paragraph):
+    """
+    Description:
+        Texte d'un paragraphe WordprocessingML (passages, tabulations et sauts de ligne).
+        Text of a WordprocessingML paragraph (runs, tabs and line breaks).
+    """
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == WORD_NAMESPACE + "t":
+            parts.append(node.text or "")
+        elif node.tag == WORD_NAMESPACE + "tab":
+            parts.append("\t")
+        elif node.tag in (WORD_NAMESPACE + "br", WORD_NAMESPACE + "cr"):
+            parts.append("\n")
+    return "".join(parts)
+
+
+def iter_docx_paragraphs(file_path):
+    """
+    Description:
+        Générateur de lecture en flux d'un DOCX : analyse word/document.xml de façon incrémentale (iterparse)
+        et retourne chaque paragraphe dès qu'il est lu, avec son style et son niveau de titre.
+        Les images et autres médias de l'archive ne sont jamais lus, et chaque paragraphe est libéré
+        une fois retourné : la mémoire reste bornée quelle que soit la taille du document.
+        Streaming DOCX reader: parses word/document.xml incrementally (iterparse)
+        and yields each paragraph as soon as it is read, with its style and heading level.
+        Images and other media of the archive are never read, and each paragraph is released
+        once yielded: memory stays bounded whatever the size of the document.
+
+    Args:
+        file_path (str or file-like): Chemin du fichier DOCX, ou fichier ouvert.
+                                      Path to the DOCX file, or open file.
+
+    Yields:
+        dict: {'text': texte du paragraphe, 'style': identifiant du style ou None,
+               'level': niveau de titre (1 = plus haut) ou None}.
+              {'text': paragraph text, 'style': style id or None,
+               'level': heading level (1 = highest) or None}.
+    """
+    import xml.etree.ElementTree as ET
+
+    with zipfile.ZipFile(file_path) as docx_file:
+        style_levels = _docx_heading_styles(docx_file)
+        with docx_file.open("word/document.xml") as document:
+            # Pile des éléments ouverts : permet de détacher un élément de son parent une fois traité.
+            # Stack of open elements: used to detach an element from its parent once processed.
+            stack = []
+            for event, element in ET.iterparse(document, events=("start", "end")):
+                if event == "start":
+                    stack.append(element)
+                    continue
+                stack.pop()
+                parent = stack[-1] if stack else None
+
+                if element.tag == WORD_NAMESPACE + "p":
+                    level = None
+                    style_id = None
+                    properties = element.find(WORD_NAMESPACE + "pPr")
+                    if properties is not None:
+                        outline = properties.find(WORD_NAMESPACE + "outlineLvl")
+                        style = properties.find(WORD_NAMESPACE + "pStyle")
+                        style_id = style.get(WORD_NAMESPACE + "val") if style is not None else None
+                        if outline is not None and int(outline.get(WORD_NAMESPACE + "val")) < 9:
+                            level = int(outline.get(WORD_NAMESPACE + "val")) + 1
+                        else:
+                            level = style_levels.get(style_id)
+                    yield {"text": _docx_paragraph_text(element), "style": style_id, "level": level}
+
+                # Paragraphes (y compris ceux des tableaux et zones de texte) et éléments du corps libérés.
+                # Paragraphs (including those of tables and text boxes) and body elements released.
+                if parent is not None and (element.tag == WORD_NAMESPACE + "p" or parent.tag == WORD_NAMESPACE + "body"):
+                    parent.remove(element)
+
+
+def extract_sections_from_docx(file_path):
+    """
+    Description:
+        Arbre de sections d'un fichier DOCX à partir des paragraphes de style titre (Titre 1, Heading 2...)
+        ou ayant un niveau hiérarchique (lecture en flux, voir iter_docx_paragraphs).
+        Section tree of a DOCX file from the paragraphs with a heading style (Heading 1, Titre 2...)
+        or an outline level (streamed, see iter_docx_paragraphs).
+
+    Args:
+        file_path (str or file-like): Chemin du fichier DOCX, ou fichier ouvert.
+                                      Path to the DOCX file, or open file.
+
+    Returns:
+        dict: Racine de l'arbre de sections (voir build_section_tree).
+              Root of the section tree (see build_section_tree).
+    """
+    preamble = []
+    headings = []
+    lines = preamble
+    for paragraph in iter_docx_paragraphs(file_path):
+        if paragraph["level"] and paragraph["text"].strip():
+            lines = []
+            headings.append((paragraph["level"], paragraph["text"].strip(), lines))
+        else:
+            lines.append(paragraph["text"])
+
+    return build_section_tree("\n".join(preamble), [(level, title, "\n".join(lines)) for level, title, lines in headings])
+
+
+def _find_heading(text, title):
+    """
+    Description:
+        Position (début, fin) d'un titre de signet dans le texte d'une page (casse et espaces ignorés), ou None.
+        Position (start, end) of a bookmark title in the text of a page (case and whitespace ignored), or None.
+    """
+    words = title.split()
+    if not words:
+        return None
+    match = re.search(r'\s+'.join(re.escape(word) for word in words), text, re.IGNORECASE)
+    return match.span() if match else None
+
+
+def _pdf_page_texts(file_path, use_cache=True):
+    """
+    Description:
+        Texte de chaque page d'un PDF (en-têtes répétés retirés), lu dans le cache d'extraction quand il y figure :
+        un PDF déjà extrait (par extract_file_handler ou un appel précédent) n'est pas repassé à l'OCR.
+        Text of each page of a PDF (repeated headers removed), read from the extraction cache when present:
+        a PDF already extracted (by extract_file_handler or a previous call) is not OCRed again.
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        use_cache (bool): Utilise le cache d'extraction.
+                          Uses the extraction cache.
+
+    Returns:
+        list[str]: Texte de chaque page.
+                   Text of each page.
+    """
+    if use_cache:
+        cached = ExtractionCache.load_extraction(file_path, OCR_LANGUAGES, OCR_DPI)
+        if cached is not None and "page_texts" in cached:
+            print(f"[Cache] Pages réutilisées : {Path(file_path).name}")
+            return cached["page_texts"]
+
+    pages = []
+    page_texts = []
+    text = extract_text_from_pdf(file_path, languages=OCR_LANGUAGES, report=pages, dpi=OCR_DPI, page_texts=page_texts)
+    if use_cache and text:
+        ExtractionCache.save_extraction(file_path, text, pages, OCR_LANGUAGES, OCR_DPI, page_texts=page_texts)
+    return page_texts
+
+
+def extract_sections_from_pdf(file_path, use_cache=True):
+    """
+    Description:
+        Arbre de sections d'un PDF à partir de ses signets (table des matières du PDF).
+        Le texte des pages (couche texte ou OCR, en-têtes répétés retirés) est réparti entre les signets ;
+        quand plusieurs signets commencent sur la même page, la page est coupée à l'endroit de chaque titre.
+        Section tree of a PDF from its bookmarks (PDF outline).
+        The page text (text layer or OCR, repeated headers removed) is distributed between the bookmarks;
+        when several bookmarks start on the same page, the page is cut where each title appears.
+
+    Args:
+        file_path (str): Chemin du PDF.
+                         Path to the PDF file.
+        use_cache (bool): Utilise le cache d'extraction pour le texte des pages (voir _pdf_page_texts).
+                          Uses the extraction cache for the page text (see _pdf_page_texts).
+
+    Returns:
+        dict or None: Racine de l'arbre de sections (voir build_section_tree), ou None si le PDF n'a pas de signets.
+                      Root of the section tree (see build_section_tree), or None if the PDF has no bookmarks.
+    """
+    with _open_pdf(file_path) as pdf_document:
+        toc = [(level, title.strip(), page) for level, title, page in pdf_document.get_toc(simple=True)
+               if page >= 1 and title.strip()]
+    if not toc:
+        return None
+
+    entries_by_page = {}
+    for level, title, page in toc:
+        entries_by_page.setdefault(page - 1, []).append((level, title))
+
+    pages = _pdf_page_texts(file_path, use_cache=use_cache)
+    preamble = []
+    headings = []
+    body = preamble
+    for page_num, page_text in enumerate(pages):
+        for level, title in entries_by_page.get(page_num, []):
+            # Titre retiré du texte de la page : il devient le titre de la section.
+            # Title removed from the page text: it becomes the section title.
+            start, end = _find_heading(page_text, title) or (0, 0)
+            body.append(page_text[:start])
+            page_text = page_text[end:]
+            body = []
+            headings.append((level, title, body))
+        body.append(page_text)
+
+    return build_section_tree("".join(preamble), [(level, title, "".join(body)) for level, title, body in headings])
+
+
+def extract_sections(path, use_cache=True):
+    """
+    Description:
+        Arbre de sections d'une source : titres Markdown, styles de titre DOCX, \\section LaTeX, signets PDF.
+        Les autres sources (et les PDF sans signets) donnent une racine seule contenant tout le texte
+        (voir extract_file_handler).
+        Section tree of a source: Markdown headings, DOCX heading styles, LaTeX \\section, PDF bookmarks.
+        Other sources (and PDFs without bookmarks) give a single root holding the whole text
+        (see extract_file_handler).
+
+    Args:
+        path (str): Chemin du fichier ou URL.
+                    Path to the file or URL.
+        use_cache (bool): Utilise le cache d'extraction (PDF et sources sans structure).
+                          Uses the extraction cache (PDFs and sources without structure).
+
+    Returns:
+        dict: Racine de l'arbre de sections {'title', 'level', 'text', 'children'} (voir build_section_tree).
+              Root of the section tree {'title', 'level', 'text', 'children'} (see build_section_tree).
+    """
+    extension = "" if re.match(r'^https?://', path) else _file_extension(path)
+    tree = None
+    if extension == '.md':
+        tree = extract_sections_from_markdown(path)
+    elif extension == '.tex':
+        tree = extract_sections_from_latex(path)
+    elif extension == '.docx':
+        tree = extract_sections_from_docx(path)
+    elif extension == '.pdf':
+        tree = extract_sections_from_pdf(path, use_cache=use_cache)
+    if tree is None:
+        tree = _new_section(text=extract_file_handler(path, use_cache=use_cache) or "")
+    return tree
+
+
+#Dossier / Archive
+def _extract_in_memory_file(name, data):
+    """
+    Description:
+        Appelle l'extracteur correspondant à l'extension d'un fichier lu en mémoire (membre d'une archive),
+        sans l'écrire sur le disque.
+        Calls the extractor matching the extension of a file read in memory (archive member),
+        without writing it to disk.
+
+    Args:
+        name (str): Nom du fichier (seule l'extension est utilisée).
+                    File name (only the extension is used).
+        data (bytes): Contenu du fichier.
+                      File content.
+
+    Returns:
+        str or None: Texte extrait, ou None si l'extension n'est pas prise en charge.
+                     Extracted text, or None if the extension is not supported.
+    """
+    extension = _file_extension(name)
+    if extension == '.txt':
+        return data.decode('utf-8')
+    elif extension == '.pdf':
+        return extract_text_from_pdf(data, languages=OCR_LANGUAGES, dpi=OCR_DPI)
+    elif extension == '.docx':
+        return extract_text_from_docx(io.BytesIO(data))
+    elif extension == '.md':
+        return markdown_to_text(data.decode('utf-8'))
+    elif extension in ['.html', '.htm']:
+        from Podcast_Generator import MainContentExtractor
+        return MainContentExtractor.extract_main_content(data)
+    elif extension in ['.mhtml', '.mht']:
+        return extract_text_from_mhtml(data)
+    elif extension == '.warc':
+        return extract_text_from_warc(data)
+    elif extension == '.tex':
+        return latex_to_text(data.decode('utf-8'))
+    elif extension in ['.jpeg', '.jpg', '.png', '.webp']:
+        image_file = io.BytesIO(data)
+        image_file.name = name
+        return extract_text_from_image(image_file, languages=OCR_LANGUAGES)
+    return None
+
+
+def _init_ingest_worker():
+    """
+    Description:
+        Initialise un processus d'extraction de dossier : le parallélisme vient du pool d'extraction,
+        l'OCR d'un PDF y reste donc séquentiel et Tesseract limité à un thread.
+        Initializes a folder extraction process: parallelism comes from the extraction pool,
+        so the OCR of a PDF stays sequential there and Tesseract is limited to one thread.
+    """
+    global OCR_WORKERS
+    OCR_WORKERS = 1
+    _init_ocr_worker()
+
+
+def _ingest_task(task):
+    """
+    Description:
+        Extrait un fichier d'un dossier ou un membre d'une archive. Fonction de niveau module pour pouvoir être
+        envoyée à un pool de processus ; les erreurs sont retournées au lieu d'interrompre le lot.
+        Extracts a file of a folder or a member of an archive. Module-level function so that it can be sent
+        to a process pool; errors are returned instead of stopping the batch.
+
+    Args:
+        task (tuple): (source, chemin du fichier ou de l'archive, nom du membre ou None).
+                      (source, path of the file or archive, member name or None).
+
+    Returns:
+        dict: {'source', 'bytes', 'chars', 'seconds', 'text', 'error'}.
+    """
+    source, path, member = task
+    start_time = time.time()
+    result = {"source": source, "bytes": 0, "chars": 0, "seconds": 0.0, "text": "", "error": None}
+    try:
+        if member is None:
+            result["bytes"] = os.path.getsize(path)
+            text = extract_file_handler(path)
+        else:
+            # Membre décompressé en mémoire uniquement.
+            # Member decompressed in memory only.
+            with zipfile.ZipFile(path) as archive:
+                data = archive.read(member)
+            result["bytes"] = len(data)
+            text = _extract_in_memory_file(member, data)
+        if text is None:
+            raise ValueError("aucun texte extrait")
+        result["text"] = text
+        result["chars"] = len(text)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.time() - start_time
+    return result
+
+
+def iter_ingest_tasks(path):
+    """
+    Description:
+        Parcourt un dossier (récursivement, dans l'ordre alphabétique) ou une archive .zip et liste les fichiers à extraire.
+        Les archives .zip rencontrées dans un dossier sont parcourues à leur tour, sans être décompressées sur le disque.
+        Les fichiers .tex inclus par un autre fichier .tex du dossier sont extraits avec leur fichier principal.
+        Walks a folder (recursively, in alphabetical order) or a .zip archive and lists the files to extract.
+        .zip archives found in a folder are walked as well, without being unpacked to disk.
+        .tex files included by another .tex file of the folder are extracted with their main file.
+
+    Args:
+        path (str): Dossier ou archive .zip.
+                    Folder or .zip archive.
+
+    Yields:
+        tuple: (source, chemin, membre ou None) pour un fichier pris en charge,
+               ou (source, None, None) pour un fichier ignoré (extension non prise en charge, fichier .tex inclus).
+               (source, path, member or None) for a supported file,
+               or (source, None, None) for a skipped file (unsupported extension, included .tex file).
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = []
+        for dirpath, dirnames, filenames in os.walk(path):
+            # Dossiers et fichiers cachés (.git, .DS_Store...) et fichiers verrous d'Office (~$...) ignorés.
+            # Hidden folders and files (.git, .DS_Store...) and Office lock files (~$...) skipped.
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            files.extend(Path(dirpath) / filename for filename in filenames if not filename.startswith(('.', '~$')))
+        root = path
+    else:
+        files = [path]
+        root = path.parent
+
+    # Chapitres d'un projet LaTeX : déjà présents dans le texte de leur fichier principal.
+    # Chapters of a LaTeX project: already part of the text of their main file.
+    included = set()
+    for file_path in files:
+        if file_path.suffix.lower() == '.tex':
+            main_path = str(file_path.resolve())
+            try:
+                included.update(included_path for included_path in resolve_latex_project(file_path) if included_path != main_path)
+            except (OSError, UnicodeDecodeError):
+                pass
+
+    for file_path in sorted(files):
+        source = file_path.relative_to(root).as_posix()
+        extension = _file_extension(file_path)
+        if str(file_path.resolve()) in included:
+            yield source, None, None
+        elif extension == '.zip':
+            with zipfile.ZipFile(file_path) as archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        continue
+                    member_source = f"{source}/{info.filename}"
+                    if _file_extension(info.filename) in SUPPORTED_EXTENSIONS:
+                        yield member_source, str(file_path), info.filename
+                    else:
+                        yield member_source, None, None
+        elif extension in SUPPORTED_EXTENSIONS:
+            yield source, str(file_path), None
+        else:
+            yield source, None, None
+
+
+def ingest_path(path, max_workers=None, separator="\n\n"):
+    """
+    Description:
+        Importe un dossier ou une archive .zip en un seul corpus : chaque fichier est envoyé à l'extracteur de son type
+        dans un pool de processus, les membres d'archive sont lus en mémoire, et les textes sont fusionnés dans l'ordre
+        du parcours avec la position de chaque fichier dans le texte fusionné.
+        Imports a folder or a .zip archive as a single corpus: each file is sent to the extractor of its type
+        in a process pool, archive members are read in memory, and the texts are merged in walk order
+        with the position of each file in the merged text.
+
+    Args:
+        path (str): Dossier ou archive .zip.
+                    Folder or .zip archive.
+        max_workers (int, optional): Nombre de processus d'extraction. Par défaut INGEST_WORKERS ; 1 = séquentiel.
+                                     Number of extraction processes. Defaults to INGEST_WORKERS; 1 = sequential.
+        separator (str): Séparateur inséré entre deux documents dans le texte fusionné.
+                         Separator inserted between two documents in the merged text.
+
+    Returns:
+        dict: Corpus :
+              - 'text' (str): Texte fusionné.
+              - 'documents' (list[dict]): Un dict par fichier pris en charge {'source', 'bytes', 'chars', 'seconds',
+                'error', 'start', 'end'} ; text[start:end] est le texte du fichier (start et end None en cas d'erreur).
+              - 'skipped' (list[str]): Fichiers ignorés (extension non prise en charge, fichier .tex inclus).
+              - 'stats' (dict): {'files', 'extracted', 'failed', 'skipped', 'bytes', 'chars', 'seconds',
+                'files_per_second', 'mb_per_second'}.
+              Corpus:
+              - 'text' (str): Merged text.
+              - 'documents' (list[dict]): One dict per supported file {'source', 'bytes', 'chars', 'seconds',
+                'error', 'start', 'end'}; text[start:end] is the text of the file (start and end None on error).
+              - 'skipped' (list[str]): Skipped files (unsupported extension).
+              - 'stats' (dict): {'files', 'extracted', 'failed', 'skipped', 'bytes', 'chars', 'seconds',
+                'files_per_second', 'mb_per_second'}.
+    """
+    #Timers Start
+    start_time = time.time()
+    print(f"Début ingest_path : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+    tasks = []
+    skipped = []
+    for source, file_path, member in iter_ingest_tasks(path):
+        if file_path is None:
+            skipped.append(source)
+        else:
+            tasks.append((source, file_path, member))
+
+    workers = min(max_workers or INGEST_WORKERS, len(tasks)) if tasks else 1
+    if workers <= 1:
+        results = map(_ingest_task, tasks)
+        pool = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_ingest_worker)
+        results = pool.map(_ingest_task, tasks)
+
+    parts = []
+    documents = []
+    offset = 0
+    try:
+        for index, result in enumerate(results, 1):
+            text = result.pop("text")
+            if result["error"]:
+                result["start"] = result["end"] = None
+                print(f"[Ingestion][ERREUR] {result['source']} : {result['error']}")
+            else:
+                if parts:
+                    parts.append(separator)
+                    offset += len(separator)
+                parts.append(text)
+                result["start"], result["end"] = offset, offset + len(text)
+                offset += len(text)
+            documents.append(result)
+            print(f"[Ingestion] {index}/{len(tasks)} — {result['source']} ({result['seconds']:.2f} secondes)")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.time() - start_time
+    total_bytes = sum(document["bytes"] for document in documents)
+    failed = sum(1 for document in documents if document["error"])
+    stats = {
+        "files": len(documents),
+        "extracted": len(documents) - failed,
+        "failed": failed,
+        "skipped": len(skipped),
+        "bytes": total_bytes,
+        "chars": offset,
+        "seconds": elapsed,
+        "files_per_second": len(documents) / elapsed if elapsed > 0 else 0.0,
+        "mb_per_second": total_bytes / 1e6 / elapsed if elapsed > 0 else 0.0,
+    }
+
+    # Timers End
+    print(f"Fin ingest_path: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes — "
+          f"{stats['extracted']}/{stats['files']} fichiers extraits, {failed} échecs, {len(skipped)} ignorés — "
+          f"{stats['files_per_second']:.2f} fichiers/s, {stats['mb_per_second']:.2f} Mo/s")
+    return {"text": "".join(parts), "documents": documents, "skipped": skipped, "stats": stats}
+
 
 def detect_main_language(text):
     """
@@ -6,8 +6,11 @@ Module d’analyse textuelle du projet Podcast Generator.
 Il permet d'effectuer :
 
 - La détection automatique de la langue d'un texte
-- Le découpage en chunks de taille contrôlée
+- Le découpage en chunks de taille contrôlée, en gardant les sections entières quand la structure du document est connue
 - Le résumé de documents entiers, chunk par chunk, en mode RAG-compatible
+- Le retrait des passages répétés avant résumé (index MinHash/LSH de `NearDuplicateIndex`)
+- Le résumé en flux d'un fichier, l'extraction et les résumés se chevauchant (`summarize_file_streaming`)
+- Le résumé d'un corpus de documents via un pool de workers partagé (`summarize_corpus`)
 - L’extraction de mots-clés essentiels à partir d’un contenu textuel
 - L’identification des grands thèmes d’un texte ou d’un résumé
 
@@ -123,41 +126,134 @@ def split_text_into_chunks(text: str, max_chars: int = 1500) -> list[str]:
         chunks.append(current.strip())
     return chunks
 
-#Main
+def iter_token_chunks(sections, chunk_token_limit: int = 1024, tokenizer_model: str = "gpt-3.5-turbo"):
+    """
+    Découpe incrémentalement un flux de sections de texte en chunks de `chunk_token_limit` tokens.
 
-def summarize_with_meta_summary(
-    text: str,
-    backend: str = "server",
-    model_path: str = None,
-    max_tokens: int = 512,
-    chunk_token_limit: int = 1024,
-    output_language: str = None,
-    tokenizer_model: str = "gpt-3.5-turbo"
-) -> list[str]:
+    Chaque chunk est retourné dès qu'il est plein, sans attendre la fin du flux : un chunk
+    peut donc chevaucher plusieurs pages. Le nombre de tokens est tenu à jour mot par mot
+    (un mot précédé d'une espace est encodé indépendamment par tiktoken), ce qui donne les
+    mêmes coupures qu'un ré-encodage complet du chunk à chaque mot, en temps linéaire.
+
+    Args:
+        sections (Iterable[str]): Sections de texte (pages, paragraphes...) dans l'ordre.
+        chunk_token_limit (int): Nombre max de tokens par chunk.
+        tokenizer_model (str): Modèle pour tiktoken (pour encoder les chunks correctement).
+
+    Yields:
+        str: Chunks de texte, mots séparés par une espace.
     """
-    Résume un texte long en deux étapes :
-    - Résumés partiels par chunk (découpés en fonction des tokens réels)
-    - Résumé final global à partir de tous les résumés intermédiaires
+    enc = tiktoken.encoding_for_model(tokenizer_model)
+    current_chunk = []
+    token_count = 0
+
+    for section in sections:
+        for word in section.split():
+            token_count += len(enc.encode(" " + word if current_chunk else word))
+            current_chunk.append(word)
+            if token_count >= chunk_token_limit:
+                yield " ".join(current_chunk)
+                current_chunk = []
+                token_count = 0
+
+    if current_chunk:
+        yield " ".join(current_chunk)
+
+def split_text_into_token_chunks(text: str, chunk_token_limit: int = 1024, tokenizer_model: str = "gpt-3.5-turbo") -> list[str]:
+    """
+    Découpe un texte en chunks de mots dont la taille en tokens (tiktoken) atteint `chunk_token_limit`.
 
     Args:
-        text (str): Texte source à résumer.
-        backend (str): "server" ou "local".
-        model_path (str): Modèle local à utiliser si backend == "local".
-        max_tokens (int): Nombre de tokens à générer par appel.
-        chunk_token_limit (int): Nombre max de tokens par chunk (entrée).
-        output_language (str): Langue de sortie (sinon détectée automatiquement). "fr"; "en"; "ja"; "zh-tw"; "zh-cn"
+        text (str): Texte source à découper.
+        chunk_token_limit (int): Nombre max de tokens par chunk.
         tokenizer_model (str): Modèle pour tiktoken (pour encoder les chunks correctement).
 
     Returns:
-        list[str]: Liste contenant :
-            [0] → Résumé global synthétique
-            [1:] → Résumés partiels de chaque chunk
+        list[str]: Liste de chunks.
     """
-    #Timers Start
-    start_time = time.time()
-    print(f"Début summarize_with_meta_summary : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    return list(iter_token_chunks([text], chunk_token_limit=chunk_token_limit, tokenizer_model=tokenizer_model))
+
+def _section_units(section: dict, chunk_token_limit: int, tokenizer_model: str, enc) -> list[tuple[str, int]]:
+    """
+    Découpe un arbre de sections en unités d'au plus `chunk_token_limit` tokens, dans l'ordre du document :
+    une section qui tient dans le budget reste entière ; sinon son titre et son texte propre forment une unité
+    (découpée par mots si nécessaire) suivie des unités de ses sous-sections.
+
+    Returns:
+        list[tuple[str, int]]: (texte de l'unité, nombre de tokens).
+    """
+    own_parts = [part for part in (section["title"], section["text"].strip()) if part]
+    own_text = "\n".join(own_parts)
+    own_tokens = len(enc.encode(own_text)) if own_text else 0
+    children = [_section_units(child, chunk_token_limit, tokenizer_model, enc) for child in section["children"]]
+
+    # Section entière : texte propre + sous-sections (chacune entière) + un token par séparateur.
+    parts = [(own_text, own_tokens)] * bool(own_text) + [unit for units in children for unit in units]
+    total_tokens = sum(tokens for _, tokens in parts) + max(len(parts) - 1, 0)
+    if total_tokens <= chunk_token_limit and all(len(units) <= 1 for units in children):
+        return [("\n\n".join(text for text, _ in parts), total_tokens)] if parts else []
+
+    units = []
+    if own_tokens > chunk_token_limit:
+        units.extend((chunk, len(enc.encode(chunk))) for chunk in
+                     iter_token_chunks([own_text], chunk_token_limit=chunk_token_limit, tokenizer_model=tokenizer_model))
+    elif own_text:
+        units.append((own_text, own_tokens))
+    for child_units in children:
+        units.extend(child_units)
+    return units
+
+def split_sections_into_token_chunks(sections: dict, chunk_token_limit: int = 1024, tokenizer_model: str = "gpt-3.5-turbo") -> list[str]:
+    """
+    Découpe un arbre de sections (voir `SourceImporter.extract_sections`) en chunks d'au plus `chunk_token_limit` tokens
+    qui respectent la structure du document : les sections entières sont regroupées tant qu'elles tiennent dans le
+    budget, une section trop longue est découpée au niveau de ses sous-sections, puis par mots en dernier recours.
+
+    Un document sans structure (racine seule) donne les mêmes chunks que `split_text_into_token_chunks`.
+
+    Args:
+        sections (dict): Racine de l'arbre de sections {'title', 'level', 'text', 'children'}.
+        chunk_token_limit (int): Nombre max de tokens par chunk.
+        tokenizer_model (str): Modèle pour tiktoken (pour encoder les chunks correctement).
+
+    Returns:
+        list[str]: Liste de chunks.
+    """
+    enc = tiktoken.encoding_for_model(tokenizer_model)
+    if not sections["children"]:
+        return split_text_into_token_chunks(sections["text"], chunk_token_limit=chunk_token_limit, tokenizer_model=tokenizer_model)
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for text, tokens in _section_units(sections, chunk_token_limit, tokenizer_model, enc):
+        if current and current_tokens + 1 + tokens > chunk_token_limit:
+            chunks.append("\n\n".join(current))
+            current = []
+            current_tokens = 0
+        current_tokens += tokens + (1 if current else 0)
+        current.append(text)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
 
-    # Si aucun chunk_token_limit explicite, le déduire du modèle local (GGUF)
+# Summary helpers
+
+def resolve_chunk_token_limit(chunk_token_limit: int = None, backend: str = "server", model_path: str = None) -> int:
+    """
+    Détermine la limite de tokens par chunk.
+
+    Si aucune limite explicite n'est donnée, elle est déduite du modèle local (GGUF)
+    en gardant 20% de marge pour la génération, sinon 1024.
+
+    Args:
+        chunk_token_limit (int): Limite explicite (prioritaire si non None).
+        backend (str): "server" ou "local".
+        model_path (str): Modèle local à utiliser si backend == "local".
+
+    Returns:
+        int: Nombre max de tokens par chunk.
+    """
     if chunk_token_limit is None and backend == "local" and model_path:
         try:
             # On laisse une marge de 20% pour la génération du résumé (context = input + output)
@@ -169,9 +265,21 @@ def summarize_with_meta_summary(
             chunk_token_limit = 1024
     elif chunk_token_limit is None:
         chunk_token_limit = 1024  # fallback
+    return chunk_token_limit
 
-    lang = SourceImporter.detect_main_language(text)
-    lang_out = (output_language if output_language else lang).strip().lower()
+def resolve_summary_language(text: str, output_language: str = None) -> str:
+    """
+    Détermine la langue de sortie des résumés (clé de PROMPTS_RAG).
+
+    Args:
+        text (str): Texte source (utilisé pour la détection si `output_language` est None).
+        output_language (str): Langue forcée. "fr"; "en"; "ja"; "zh-tw"; "zh-cn"
+
+    Returns:
+        str: Code langue supporté par PROMPTS_RAG ("en" par défaut).
+    """
+    lang = SourceImporter.detect_main_language(text) if not output_language else output_language
+    lang_out = lang.strip().lower()
     lang_out = {
         "fra": "fr",
         "fre": "fr",
@@ -185,43 +293,194 @@ def summarize_with_meta_summary(
     if lang_out not in PROMPTS_RAG:
         print(f"[Info] Langue '{lang_out}' non supportée, fallback vers 'en'")
         lang_out = "en"
+    return lang_out
 
-    prompt_summary = PROMPTS_RAG[lang_out]["summary_rag"]
+def summarize_chunk(chunk: str, prompt_summary: str, backend: str = "server", model_path: str = None, max_tokens: int = 512) -> str:
+    """
+    Résume un chunk unique (résumé partiel).
 
-    # Découpage réel basé sur tiktoken
-    enc = tiktoken.encoding_for_model(tokenizer_model)
-    words = text.split()
-    chunks = []
-    current_chunk = []
+    Args:
+        chunk (str): Chunk à résumer.
+        prompt_summary (str): Prompt "summary_rag" de la langue de sortie.
+        backend (str): "server" ou "local".
+        model_path (str): Modèle local à utiliser si backend == "local".
+        max_tokens (int): Nombre de tokens à générer.
 
-    for word in words:
-        current_chunk.append(word)
-        token_count = len(enc.encode(" ".join(current_chunk)))
-        if token_count >= chunk_token_limit:
-            chunks.append(" ".join(current_chunk))
-            current_chunk = []
+    Returns:
+        str: Résumé partiel.
+    """
+    prompt = f"{prompt_summary}\n\n---\n{chunk}\n\nRésumé :"
+    return LocalIAIManager.call_model(prompt, backend=backend, model_path=model_path, max_tokens=max_tokens).strip()
 
-    if current_chunk:
-        chunks.append(" ".join(current_chunk))
+def summarize_partial_summaries(summaries: list[str], prompt_summary: str, backend: str = "server", model_path: str = None, max_tokens: int = 512) -> str:
+    """
+    Produit le résumé global synthétique à partir des résumés partiels.
+
+    Args:
+        summaries (list[str]): Résumés partiels, dans l'ordre du document.
+        prompt_summary (str): Prompt "summary_rag" de la langue de sortie.
+        backend (str): "server" ou "local".
+        model_path (str): Modèle local à utiliser si backend == "local".
+        max_tokens (int): Nombre de tokens à générer.
+
+    Returns:
+        str: Résumé global.
+    """
+    joint_summaries = "\n\n".join(summaries)
+    final_prompt = f"{prompt_summary}\n\n---\n{joint_summaries}\n\nRésumé final synthétique :"
+    return LocalIAIManager.call_model(final_prompt, backend=backend, model_path=model_path, max_tokens=max_tokens).strip()
+
+#Main
+
+def summarize_with_meta_summary(
+    text: str,
+    backend: str = "server",
+    model_path: str = None,
+    max_tokens: int = 512,
+    chunk_token_limit: int = 1024,
+    output_language: str = None,
+    tokenizer_model: str = "gpt-3.5-turbo",
+    deduplicate: bool = True,
+    sections: dict = None
+) -> list[str]:
+    """
+    Résume un texte long en deux étapes :
+    - Résumés partiels par chunk (découpés en fonction des tokens réels, par sections entières si `sections` est fourni)
+    - Résumé final global à partir de tous les résumés intermédiaires
+
+    Args:
+        text (str): Texte source à résumer.
+        backend (str): "server" ou "local".
+        model_path (str): Modèle local à utiliser si backend == "local".
+        max_tokens (int): Nombre de tokens à générer par appel.
+        chunk_token_limit (int): Nombre max de tokens par chunk (entrée).
+        output_language (str): Langue de sortie (sinon détectée automatiquement). "fr"; "en"; "ja"; "zh-tw"; "zh-cn"
+        tokenizer_model (str): Modèle pour tiktoken (pour encoder les chunks correctement).
+        deduplicate (bool): Si True, les chunks quasi identiques à un chunk précédent ne sont pas résumés.
+        sections (dict, optional): Arbre de sections du texte (voir `SourceImporter.extract_sections`) :
+            les chunks regroupent des sections entières (voir `split_sections_into_token_chunks`).
+
+    Returns:
+        list[str]: Liste contenant :
+            [0] → Résumé global synthétique
+            [1:] → Résumés partiels de chaque chunk
+    """
+    #Timers Start
+    start_time = time.time()
+    print(f"Début summarize_with_meta_summary : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+    chunk_token_limit = resolve_chunk_token_limit(chunk_token_limit, backend=backend, model_path=model_path)
+    lang_out = resolve_summary_language(text, output_language)
+    prompt_summary = PROMPTS_RAG[lang_out]["summary_rag"]
+
+    # Découpage réel basé sur tiktoken (par sections si la structure du document est connue)
+    if sections is not None:
+        chunks = split_sections_into_token_chunks(sections, chunk_token_limit=chunk_token_limit, tokenizer_model=tokenizer_model)
+    else:
+        chunks = split_text_into_token_chunks(text, chunk_token_limit=chunk_token_limit, tokenizer_model=tokenizer_model)
+
+    # Passages répétés (pages dupliquées, annexes reprises...) : un seul résumé
+    if deduplicate:
+        from Podcast_Generator import NearDuplicateIndex
+        report = {}
+        chunks = NearDuplicateIndex.deduplicate_chunks(chunks, report=report)
+        if report["removed"]:
+            print(f"[Doublons] {report['removed']} chunk(s) quasi identique(s) ignoré(s) sur {report['chunks']}")
 
     # Résumés partiels
     summaries = []
     for i, chunk in enumerate(chunks):
         print(f"[Chunk {i + 1}/{len(chunks)}] Résumé partiel...")
-        prompt = f"{prompt_summary}\n\n---\n{chunk}\n\nRésumé :"
-        summaries.append(LocalIAIManager.call_model(prompt, backend=backend, model_path=model_path, max_tokens=max_tokens).strip())
+        summaries.append(summarize_chunk(chunk, prompt_summary, backend=backend, model_path=model_path, max_tokens=max_tokens))
 
     # Résumé global sur les résumés partiels
     print(f"[Final] Résumé global en cours...")
-    joint_summaries = "\n\n".join(summaries)
-    final_prompt = f"{prompt_summary}\n\n---\n{joint_summaries}\n\nRésumé final synthétique :"
-    global_summary = LocalIAIManager.call_model(final_prompt, backend=backend, model_path=model_path, max_tokens=max_tokens).strip()
+    global_summary = summarize_partial_summaries(summaries, prompt_summary, backend=backend, model_path=model_path, max_tokens=max_tokens)
     # Timers End
     end_time = time.time()
     elapsed = end_time - start_time
     print(f"Fin summarize_with_meta_summary: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
     return [global_summary] + summaries
 
+def summarize_file_streaming(
+    path: str,
+    backend: str = "server",
+    model_path: str = None,
+    max_tokens: int = 512,
+    chunk_token_limit: int = 1024,
+    output_language: str = None,
+    tokenizer_model: str = "gpt-3.5-turbo",
+    max_workers: int = 2,
+    deduplicate: bool = True
+) -> list[str]:
+    """
+    Résume une source en pipeline : extraction, découpage et résumés partiels se chevauchent.
+
+    Les sections (pages d'un PDF, paragraphes d'un DOCX) produites par `SourceImporter.iter_file_sections` sont découpées au fil
+    de l'eau par `iter_token_chunks`, et chaque chunk plein est envoyé au modèle immédiatement
+    dans un pool de threads. Sur un PDF scanné, l'OCR des pages suivantes tourne donc pendant
+    que le modèle résume les premiers chunks.
+
+    Args:
+        path (str): Chemin du fichier ou URL à résumer.
+        backend (str): "server" ou "local".
+        model_path (str): Modèle local à utiliser si backend == "local".
+        max_tokens (int): Nombre de tokens à générer par appel.
+        chunk_token_limit (int): Nombre max de tokens par chunk (entrée).
+        output_language (str): Langue de sortie (sinon détectée sur le premier chunk). "fr"; "en"; "ja"; "zh-tw"; "zh-cn"
+        tokenizer_model (str): Modèle pour tiktoken.
+        max_workers (int): Nombre d'appels au modèle simultanés (1 forcé si backend == "local").
+        deduplicate (bool): Si True, les chunks quasi identiques à un chunk déjà envoyé ne sont pas résumés.
+
+    Returns:
+        list[str]: Même format que `summarize_with_meta_summary` :
+            [0] → Résumé global synthétique
+            [1:] → Résumés partiels de chaque chunk
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from Podcast_Generator import NearDuplicateIndex
+
+    #Timers Start
+    start_time = time.time()
+    print(f"Début summarize_file_streaming : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+    if backend == "local":
+        max_workers = 1
+    chunk_token_limit = resolve_chunk_token_limit(chunk_token_limit, backend=backend, model_path=model_path)
+
+    futures = []
+    prompt_summary = None
+    duplicate_index = NearDuplicateIndex.NearDuplicateIndex() if deduplicate else None
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sections = SourceImporter.iter_file_sections(path)
+        for i, chunk in enumerate(iter_token_chunks(sections, chunk_token_limit=chunk_token_limit, tokenizer_model=tokenizer_model)):
+            if duplicate_index is not None:
+                signature = duplicate_index.signature(chunk)
+                original = duplicate_index.find_duplicate(signature=signature)
+                if original is not None:
+                    print(f"[Chunk {i + 1}] Quasi identique au chunk {original + 1} : ignoré")
+                    continue
+                duplicate_index.add(i, signature=signature)
+            if prompt_summary is None:
+                prompt_summary = PROMPTS_RAG[resolve_summary_language(chunk, output_language)]["summary_rag"]
+            print(f"[Chunk {i + 1}] Envoi du résumé partiel ({time.time() - start_time:.2f} s)...")
+            futures.append(pool.submit(summarize_chunk, chunk, prompt_summary, backend=backend, model_path=model_path, max_tokens=max_tokens))
+
+        summaries = [future.result() for future in futures]
+
+    if not summaries:
+        raise ValueError(f"Aucun texte extrait depuis {path}")
+
+    # Résumé global sur les résumés partiels
+    print(f"[Final] Résumé global en cours...")
+    global_summary = summarize_partial_summaries(summaries, prompt_summary, backend=backend, model_path=model_path, max_tokens=max_tokens)
+
+    # Timers End
+    end_time = time.time()
+    elapsed = end_time - start_time
+    print(f"Fin summarize_file_streaming: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
+    return [global_summary] + summaries
+
 def group_semantic_concepts(concepts: list[str], language: str = "fr", backend="server", model_path=None) -> list[str]:
     """
     Regroupe sémantiquement une liste de concepts similaires.
@@ -327,6 +586,249 @@ def extract_concepts(
 
     return group_semantic_concepts(cleaned, language=out_lang, backend=backend, model_path=model_path) if semantic_grouping else cleaned
 
+# Corpus
+
+def _corpus_entry_name(index: int, source: str) -> str:
+    """
+    Construit un nom de dossier lisible et unique pour un document du corpus.
+
+    Args:
+        index (int): Position du document dans le corpus.
+        source (str): Chemin ou URL du document.
+
+    Returns:
+        str: Nom de dossier (ex: "03_rapport_annuel").
+    """
+    stem = Path(source.rstrip("/")).stem or "document"
+    stem = re.sub(r"[^\w\-]+", "_", stem).strip("_")[:60] or "document"
+    return f"{index:02d}_{stem}"
+
+def _extract_and_chunk(source: str, output_language: str, chunk_token_limit: int, tokenizer_model: str) -> tuple[str, list[str]]:
+    """
+    Tâche du pool : extraction d'une source (avec sa structure, voir `SourceImporter.extract_sections`)
+    puis découpage en chunks par sections entières.
+
+    Args:
+        source (str): Chemin ou URL du document.
+        output_language (str): Langue de sortie forcée (ou None).
+        chunk_token_limit (int): Nombre max de tokens par chunk.
+        tokenizer_model (str): Modèle pour tiktoken.
+
+    Returns:
+        tuple[str, list[str]]: (langue de sortie, chunks).
+
+    Raises:
+        ValueError: Si aucun texte n'a pu être extrait.
+    """
+    sections = SourceImporter.extract_sections(source)
+    text = SourceImporter.section_tree_text(sections)
+    if not text or not text.strip():
+        raise ValueError(f"Aucun texte extrait depuis {source}")
+    lang_out = resolve_summary_language(text, output_language)
+    return lang_out, split_sections_into_token_chunks(sections, chunk_token_limit=chunk_token_limit, tokenizer_model=tokenizer_model)
+
+def summarize_corpus(
+    sources: list[str],
+    backend: str = "server",
+    model_path: str = None,
+    max_tokens: int = 512,
+    chunk_token_limit: int = 1024,
+    output_language: str = None,
+    tokenizer_model: str = "gpt-3.5-turbo",
+    max_workers: int = 4,
+    output_dir: str = None,
+    semantic_grouping: bool = False,
+    deduplicate: bool = True
+) -> dict:
+    """
+    Résume un corpus de documents avec un pool de workers partagé et borné.
+
+    Toutes les étapes (extraction + découpage, résumés partiels, résumé global, mots-clés, thèmes)
+    de tous les documents passent par le même pool : dès qu'une tâche se termine, les tâches
+    suivantes du document sont soumises, ce qui garde le serveur LLM occupé au lieu d'attendre
+    la fin d'un document avant de commencer le suivant.
+
+    Pour chaque document, un dossier est créé dans `output_dir` avec summary.json, keywords.json
+    et themes.json (même format que `save_list_to_json`), directement utilisable par
+    `create_script_rag_modulaire`.
+
+    Args:
+        sources (list[str]): Chemins de fichiers ou URLs à traiter.
+        backend (str): "server" ou "local".
+        model_path (str): Modèle local à utiliser si backend == "local".
+        max_tokens (int): Nombre de tokens à générer par appel.
+        chunk_token_limit (int): Nombre max de tokens par chunk (entrée).
+        output_language (str): Langue de sortie (sinon détectée par document). "fr"; "en"; "ja"; "zh-tw"; "zh-cn"
+        tokenizer_model (str): Modèle pour tiktoken.
+        max_workers (int): Nombre de tâches simultanées (1 forcé si backend == "local").
+        output_dir (str, optional): Dossier racine. Si None, utilise Result/CORPUS-<datetime>.
+        semantic_grouping (bool): Si True, regroupe les concepts proches via LLM.
+        deduplicate (bool): Si True, les chunks quasi identiques à un chunk déjà retenu (du même document ou d'un
+                            autre document du corpus) ne sont pas résumés.
+
+    Returns:
+        dict: Rapport du corpus :
+            - 'output_dir' (str): Dossier racine.
+            - 'documents' (dict): {source: {'folder', 'chunks', 'duplicate_chunks', 'llm_tasks', 'elapsed', 'error'}}
+            - 'llm_tasks' (int): Nombre total de tâches LLM (résumés, mots-clés, thèmes).
+            - 'elapsed' (float): Durée totale en secondes.
+            - 'throughput' (float): Tâches LLM par minute.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from Podcast_Generator import NearDuplicateIndex
+
+    #Timers Start
+    start_time = time.time()
+    print(f"Début summarize_corpus : {datetime.now().strftime('%Y-%m-%d %H:%M')} — {len(sources)} documents")
+
+    if backend == "local" and max_workers > 1:
+        # llama-cpp charge le modèle à chaque appel : pas d'appels concurrents en local.
+        print("[Info] Backend local : le pool du corpus est limité à 1 worker.")
+        max_workers = 1
+    chunk_token_limit = resolve_chunk_token_limit(chunk_token_limit, backend=backend, model_path=model_path)
+
+    if output_dir is None:
+        output_dir = Path("Result") / f"CORPUS-{datetime.now().strftime('%Y%m%d-%H%M')}"
+    output_dir = Path(output_dir)
+
+    docs = {}
+    for index, source in enumerate(sources, 1):
+        docs[source] = {
+            "folder": str(output_dir / _corpus_entry_name(index, source)),
+            "chunks": 0,
+            "duplicate_chunks": 0,
+            "llm_tasks": 0,
+            "elapsed": 0.0,
+            "error": None,
+            "_start": None,
+            "_summaries": [],
+            "_remaining": 0,
+            "_concepts": {},
+            "_extracted": None
+        }
+
+    llm_args = {"backend": backend, "model_path": model_path, "max_tokens": max_tokens}
+    # Index partagé par tout le corpus, alimenté uniquement par la boucle principale et dans l'ordre de `sources`
+    # (et non dans l'ordre de fin des extractions) : les chunks retenus ne dépendent pas du parallélisme.
+    duplicate_index = NearDuplicateIndex.NearDuplicateIndex() if deduplicate else None
+    order = list(docs)
+    released = 0
+    pending = {}
+    llm_tasks = 0
+    done_docs = 0
+
+    def report_progress():
+        elapsed_total = time.time() - start_time
+        rate = llm_tasks / elapsed_total * 60 if elapsed_total > 0 else 0.0
+        print(f"[Corpus] Documents {done_docs}/{len(docs)} — tâches LLM {llm_tasks} — "
+              f"{rate:.1f} tâches/min — tâches en cours {len(pending)}")
+
+    def finish(source, error=None):
+        nonlocal done_docs
+        doc = docs[source]
+        doc["error"] = error
+        doc["elapsed"] = time.time() - doc["_start"]
+        done_docs += 1
+        if error:
+            print(f"[Corpus][ERREUR] {source} : {error}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit(source, stage, fn, *args, **kwargs):
+            pending[pool.submit(fn, *args, **kwargs)] = (source, stage)
+
+        def release_extractions():
+            # Extractions terminées mises en attente puis libérées dans l'ordre des documents.
+            nonlocal released
+            while released < len(order):
+                source = order[released]
+                doc = docs[source]
+                if doc["error"]:
+                    released += 1
+                    continue
+                if doc["_extracted"] is None:
+                    return
+                released += 1
+                doc["_lang"], chunks = doc["_extracted"]
+                if duplicate_index is not None:
+                    report = {}
+                    unique_chunks = NearDuplicateIndex.deduplicate_chunks(chunks, index=duplicate_index,
+                                                                          key_prefix=source, report=report)
+                    # Document entièrement en double : résumé quand même pour que son dossier soit complet.
+                    if unique_chunks:
+                        chunks = unique_chunks
+                        doc["duplicate_chunks"] = report["removed"]
+                doc["_prompt"] = PROMPTS_RAG[doc["_lang"]]["summary_rag"]
+                doc["chunks"] = len(chunks)
+                doc["_summaries"] = [None] * len(chunks)
+                doc["_remaining"] = len(chunks)
+                for i, chunk in enumerate(chunks):
+                    submit(source, ("chunk", i), summarize_chunk, chunk, doc["_prompt"], **llm_args)
+
+        for source, doc in docs.items():
+            doc["_start"] = time.time()
+            submit(source, ("extract",), _extract_and_chunk, source, output_language, chunk_token_limit, tokenizer_model)
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                source, stage = pending.pop(future)
+                doc = docs[source]
+                if doc["error"]:
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    finish(source, error=str(e))
+                    if stage[0] == "extract":
+                        release_extractions()
+                    continue
+
+                if stage[0] != "extract":
+                    llm_tasks += 1
+                    doc["llm_tasks"] += 1
+
+                if stage[0] == "extract":
+                    doc["_extracted"] = result
+                    release_extractions()
+
+                elif stage[0] == "chunk":
+                    doc["_summaries"][stage[1]] = result
+                    doc["_remaining"] -= 1
+                    if doc["_remaining"] == 0:
+                        submit(source, ("final",), summarize_partial_summaries, doc["_summaries"], doc["_prompt"], **llm_args)
+
+                elif stage[0] == "final":
+                    doc["_summaries"] = [result] + doc["_summaries"]
+                    for mode in ("keywords", "themes"):
+                        submit(source, ("concepts", mode), extract_concepts, result, mode=mode,
+                               output_language=doc["_lang"], semantic_grouping=semantic_grouping, **llm_args)
+
+                elif stage[0] == "concepts":
+                    doc["_concepts"][stage[1]] = result
+                    if len(doc["_concepts"]) == 2:
+                        save_list_to_json(doc["_summaries"], suffix="summary", path=doc["folder"])
+                        save_list_to_json(doc["_concepts"]["keywords"], suffix="keywords", path=doc["folder"])
+                        save_list_to_json(doc["_concepts"]["themes"], suffix="themes", path=doc["folder"])
+                        finish(source)
+                        print(f"[Corpus] Terminé : {source} → {doc['folder']} ({doc['elapsed']:.2f} secondes)")
+
+                report_progress()
+
+    # Timers End
+    end_time = time.time()
+    elapsed = end_time - start_time
+    throughput = llm_tasks / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"Fin summarize_corpus: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes — "
+          f"{llm_tasks} tâches LLM ({throughput:.1f}/min)")
+
+    return {
+        "output_dir": str(output_dir),
+        "documents": {source: {k: v for k, v in doc.items() if not k.startswith("_")} for source, doc in docs.items()},
+        "llm_tasks": llm_tasks,
+        "elapsed": elapsed,
+        "throughput": throughput
+    }
+
 # Save and Load Results (json)
 
 def save_list_to_json(
@@ -0,0 +1,465 @@
+"""
+VectorIndex.py
+==============
+
+Index vectoriel persistant du projet Podcast Generator.
+
+`create_script_rag_modulaire` ne cherchait les extraits pertinents que parmi les résumés partiels d'un seul
+document, encodés à chaque appel. Ce module garde sur le disque les vecteurs des résumés partiels de nombreux
+dossiers de résumés (un dossier = une source) pour chercher dans tout un corpus :
+
+- Vecteurs float32 rangés dans un fichier binaire lu par `numpy.memmap` (recherche exacte par blocs)
+- Textes et sources dans un fichier JSON Lines, complété ligne à ligne comme les vecteurs
+- Petit index JSON (nombre de lignes, sources, suppressions, génération) écrit de façon atomique après les ajouts :
+  les lignes écrites au-delà (écriture interrompue) sont retirées à l'ouverture
+- Ajout et suppression incrémentaux : une suppression marque les lignes (compactage à la demande)
+- Compactage dans des fichiers de génération suivante, adoptés par le remplacement atomique de l'index :
+  une interruption laisse l'index précédent intact ; l'index n'est jamais supprimé
+- Recherche filtrée par source
+- Recherche approchée optionnelle (IVF : k-moyennes sphériques, seules les listes les plus proches sont parcourues)
+
+Les écritures sont prévues pour un seul processus à la fois.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+# Dossier des index (surchargeable par la variable d'environnement PODCAST_VECTOR_INDEX_DIR).
+INDEX_DIR = Path(os.environ.get("PODCAST_VECTOR_INDEX_DIR", Path(__file__).resolve().parent / "Cache" / "VectorIndex"))
+
+# Nombre de vecteurs à partir duquel index_summary_folders construit l'IVF (en dessous, la recherche exacte suffit).
+IVF_MIN_VECTORS = int(os.environ.get("PODCAST_VECTOR_INDEX_IVF_MIN", "20000"))
+
+# Nombre de listes IVF parcourues par recherche.
+IVF_NPROBE = int(os.environ.get("PODCAST_VECTOR_INDEX_NPROBE", "8"))
+
+# Nombre de lignes lues à la fois lors d'une recherche exacte.
+SEARCH_BLOCK_ROWS = 65536
+
+# Fichiers de données d'une génération : "vectors.f32" (génération 0), "vectors.3.f32" (génération 3), fichiers temporaires.
+_DATA_FILE_PATTERN = re.compile(r"^(vectors|rows|lists)(\.\d+)?\.(f32|jsonl|i32)(\.\d+\.tmp)?$")
+
+
+class VectorIndex:
+    """
+    Vecteurs normalisés (un par texte) rattachés à une source, conservés sur le disque.
+
+    Exemple :
+        index = VectorIndex()
+        index.add("output/RSM-20250426-1019", chunks, service.encode(chunks))
+        index.search(service.encode("photosynthèse"), top_k=5)   # [{'row', 'source', 'text', 'score'}, ...]
+    """
+
+    def __init__(self, directory=None, model_name=None):
+        """
+        Args:
+            directory (str, optional): Dossier de l'index. Par défaut un sous-dossier de INDEX_DIR par modèle.
+            model_name (str, optional): Modèle d'embedding des vecteurs. Par défaut celui d'EmbeddingService.
+        """
+        if model_name is None:
+            from Podcast_Generator.EmbeddingService import EMBEDDING_MODEL
+            model_name = EMBEDDING_MODEL
+        self.model_name = model_name
+        self.directory = Path(directory) if directory else INDEX_DIR / re.sub(r"[^\w.-]+", "_", model_name)
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._load()
+
+    @property
+    def _index_path(self):
+        return self.directory / "index.json"
+
+    def _data_path(self, stem, suffix, generation=None):
+        generation = self.generation if generation is None else generation
+        return self.directory / (f"{stem}.{generation}{suffix}" if generation else f"{stem}{suffix}")
+
+    @property
+    def _vectors_path(self):
+        return self._data_path("vectors", ".f32")
+
+    @property
+    def _rows_path(self):
+        return self._data_path("rows", ".jsonl")
+
+    @property
+    def _lists_path(self):
+        return self._data_path("lists", ".i32")
+
+    @property
+    def _centroids_path(self):
+        return self.directory / "centroids.npy"
+
+    def _load(self):
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            # Sans index, les fichiers de données ne peuvent pas être interprétés : ils ne sont pas tronqués.
+            if self.directory.is_dir() and any(_DATA_FILE_PATTERN.match(path.name) for path in self.directory.iterdir()):
+                raise ValueError(f"Index vectoriel sans {self._index_path.name} : {self.directory} "
+                                 "(supprimer le dossier pour le reconstruire)")
+            index = {}
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Index vectoriel illisible : {self._index_path} ({e})") from e
+        self.generation = index.get("generation", 0)
+        self.dimension = index.get("dimension")
+        self._sources = index.get("sources", {})
+        count = index.get("count", 0)
+
+        # Lignes écrites sans index (processus interrompu avant l'écriture de l'index) : retirées.
+        self._rows = []
+        rows_size = 0
+        if self._rows_path.exists():
+            with open(self._rows_path, "rb") as f:
+                for line in f:
+                    if len(self._rows) == count:
+                        break
+                    self._rows.append(json.loads(line))
+                    rows_size += len(line)
+        count = len(self._rows)
+        self._truncate(self._rows_path, rows_size)
+        self._truncate(self._vectors_path, count * (self.dimension or 0) * 4)
+
+        self.centroids = np.load(self._centroids_path) if index.get("ivf") and self._centroids_path.exists() else None
+        if self.centroids is not None:
+            self._truncate(self._lists_path, count * 4)
+            self._lists = np.fromfile(self._lists_path, dtype=np.int32)
+        else:
+            self._lists = np.zeros(0, dtype=np.int32)
+        self._alive = np.ones(count, dtype=bool)
+        self._alive[[row for row in index.get("deleted", []) if row < count]] = False
+        self._row_sources = np.array([row["source"] for row in self._rows], dtype=object)
+        self._vectors = None
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        # Fichiers d'une autre génération (compactage interrompu ou terminé) : jamais désignés par l'index.
+        current = {self._vectors_path.name, self._rows_path.name, self._lists_path.name}
+        if self.directory.is_dir():
+            for path in self.directory.iterdir():
+                if _DATA_FILE_PATTERN.match(path.name) and path.name not in current:
+                    path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _truncate(path, size):
+        if path.exists() and path.stat().st_size != size:
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+    def _save(self):
+        index = {"model": self.model_name, "dimension": self.dimension, "count": len(self._rows), "sources": self._sources,
+                 "deleted": np.flatnonzero(~self._alive).tolist(), "ivf": self.centroids is not None,
+                 "generation": self.generation}
+        tmp_path = self._index_path.with_name(f"index.json.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path)
+
+    def _memmap(self):
+        if self._vectors is None or len(self._vectors) != len(self._rows):
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(self._rows), self.dimension))
+        return self._vectors
+
+    def __len__(self):
+        """Nombre de vecteurs non supprimés."""
+        return int(self._alive.sum())
+
+    def sources(self):
+        """
+        Returns:
+            dict: {source: nombre de vecteurs non supprimés}.
+        """
+        counts = {}
+        for source in self._row_sources[self._alive]:
+            counts[source] = counts.get(source, 0) + 1
+        return counts
+
+    def source_digest(self, source):
+        """Empreinte enregistrée avec les textes d'une source (voir add), None si la source est absente."""
+        return self._sources.get(source)
+
+    def add(self, source, texts, vectors, digest=None):
+        """
+        Ajoute des textes et leurs vecteurs à l'index.
+
+        Args:
+            source (str): Source des textes (ex : dossier de résumés), utilisée pour filtrer et supprimer.
+            texts (list[str]): Textes indexés.
+            vectors (np.ndarray): Matrice (len(texts), dimension) des vecteurs normalisés.
+            digest (str, optional): Empreinte du contenu de la source (permet de sauter une réindexation inutile).
+
+        Returns:
+            list[int]: Numéros des lignes ajoutées.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(texts) != len(vectors):
+            raise ValueError(f"{len(texts)} textes pour {len(vectors)} vecteurs")
+        with self._lock:
+            if len(texts) and self.dimension is None:
+                self.dimension = int(vectors.shape[1])
+            elif len(texts) and vectors.shape[1] != self.dimension:
+                raise ValueError(f"Dimension {vectors.shape[1]} incompatible avec l'index ({self.dimension})")
+
+            first_row = len(self._rows)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if not self._index_path.exists():
+                # Index écrit avant les premières lignes : des données sans index signalent toujours un index perdu.
+                self._save()
+            if len(texts):
+                # Lignes d'abord, index ensuite : l'index ne désigne jamais une ligne absente.
+                # Projection fermée avant l'ajout (Windows refuse d'agrandir un fichier projeté).
+                self._vectors = None
+                rows = [{"source": source, "text": text} for text in texts]
+                with open(self._vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+                with open(self._rows_path, "ab") as f:
+                    f.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8"))
+                if self.centroids is not None:
+                    # IVF déjà construit : les nouveaux vecteurs rejoignent la liste du centroïde le plus proche.
+                    lists = (vectors @ self.centroids.T).argmax(axis=1).astype(np.int32)
+                    with open(self._lists_path, "ab") as f:
+                        f.write(lists.tobytes())
+                    self._lists = np.concatenate([self._lists, lists])
+                self._rows.extend(rows)
+                self._row_sources = np.concatenate([self._row_sources, np.array([source] * len(texts), dtype=object)])
+                self._alive = np.concatenate([self._alive, np.ones(len(texts), dtype=bool)])
+            self._sources[source] = digest
+            self._save()
+        return list(range(first_row, first_row + len(texts)))
+
+    def remove(self, source):
+        """
+        Supprime les vecteurs d'une source (lignes marquées, fichier inchangé jusqu'au prochain compact).
+
+        Args:
+            source (str): Source à retirer.
+
+        Returns:
+            int: Nombre de vecteurs supprimés.
+        """
+        with self._lock:
+            rows = self._alive & (self._row_sources == source)
+            removed = int(rows.sum())
+            if source not in self._sources and not removed:
+                return 0
+            self._alive[rows] = False
+            self._sources.pop(source, None)
+            self._save()
+        return removed
+
+    def compact(self):
+        """
+        Réécrit les fichiers de données sans les lignes supprimées (les numéros de ligne changent).
+
+        Les nouveaux fichiers portent la génération suivante ; le remplacement atomique de l'index les adopte,
+        puis les fichiers de l'ancienne génération sont supprimés. Une interruption avant ce remplacement
+        laisse l'index et les fichiers précédents intacts.
+
+        Returns:
+            int: Nombre de lignes retirées du fichier.
+        """
+        with self._lock:
+            dead = int((~self._alive).sum())
+            if not dead:
+                return 0
+            keep = np.flatnonzero(self._alive)
+            vectors = np.array(self._memmap()[keep]) if len(keep) else np.zeros((0, self.dimension or 0), dtype=np.float32)
+            rows = [self._rows[row] for row in keep]
+            generation = self.generation + 1
+            self._write_atomic(self._data_path("vectors", ".f32", generation), vectors.tobytes())
+            self._write_atomic(self._data_path("rows", ".jsonl", generation),
+                               "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8"))
+            lists = self._lists[keep] if self.centroids is not None else self._lists
+            if self.centroids is not None:
+                self._write_atomic(self._data_path("lists", ".i32", generation), lists.tobytes())
+
+            # Projection fermée avant la suppression des anciens fichiers (Windows refuse de supprimer un fichier projeté).
+            self._vectors = None
+            self._rows = rows
+            self._row_sources = self._row_sources[keep]
+            self._lists = lists
+            self._alive = np.ones(len(keep), dtype=bool)
+            self.generation = generation
+            self._save()
+            self._remove_stale_files()
+        return dead
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def build_ivf(self, n_lists=None, iterations=10, sample_size=None, seed=0):
+        """
+        Construit l'index approché IVF : k-moyennes sphériques sur les vecteurs, une liste par centroïde.
+        Les vecteurs ajoutés ensuite sont rangés au fil de l'eau (pas besoin de reconstruire).
+
+        Args:
+            n_lists (int, optional): Nombre de listes. Par défaut √(nombre de vecteurs).
+            iterations (int): Itérations des k-moyennes.
+            sample_size (int, optional): Vecteurs tirés pour l'apprentissage. Par défaut 256 par liste.
+            seed (int): Graine du tirage.
+
+        Returns:
+            int: Nombre de listes.
+        """
+        start_time = time.time()
+        print(f"Début build_ivf : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        with self._lock:
+            alive_rows = np.flatnonzero(self._alive)
+            if not len(alive_rows):
+                return 0
+            n_lists = max(1, min(n_lists or int(np.sqrt(len(alive_rows))), len(alive_rows)))
+            rng = np.random.default_rng(seed)
+            sample_size = min(sample_size or 256 * n_lists, len(alive_rows))
+            vectors = self._memmap()
+            sample = np.array(vectors[np.sort(rng.choice(alive_rows, sample_size, replace=False))])
+
+            centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+            for _ in range(iterations):
+                assignment = (sample @ centroids.T).argmax(axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sample)
+                counts = np.bincount(assignment, minlength=n_lists)
+                # Liste vide : centroïde remplacé par un vecteur tiré au hasard.
+                empty = counts == 0
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+                centroids = sums / np.clip(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12, None)
+
+            lists = np.empty(len(self._rows), dtype=np.int32)
+            for start in range(0, len(self._rows), SEARCH_BLOCK_ROWS):
+                lists[start:start + SEARCH_BLOCK_ROWS] = (vectors[start:start + SEARCH_BLOCK_ROWS] @ centroids.T).argmax(axis=1)
+            self.centroids = centroids.astype(np.float32)
+            self._lists = lists
+            self._write_atomic(self._lists_path, lists.tobytes())
+            tmp_path = self._centroids_path.with_name(f"centroids.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, self.centroids)
+            os.replace(tmp_path, self._centroids_path)
+            self._save()
+        elapsed = time.time() - start_time
+        print(f"Fin build_ivf: {datetime.now().strftime('%Y-%m-%d %H:%M')} — Temps écoulé : {elapsed:.2f} secondes")
+        return n_lists
+
+    def search(self, query_vector, top_k=5, sources=None, nprobe=IVF_NPROBE, with_vectors=False):
+        """
+        Recherche les textes les plus proches d'une requête (vecteurs normalisés : produit scalaire = cosinus).
+
+        Recherche exacte si une liste de sources est donnée ou si l'IVF n'est pas construit ;
+        sinon seules les nprobe listes les plus proches sont parcourues.
+
+        Args:
+            query_vector (np.ndarray): Vecteur de la requête (dimension,).
+            top_k (int): Nombre de résultats.
+            sources (list[str], optional): Sources autorisées. None : tout l'index.
+            nprobe (int): Listes IVF parcourues.
+            with_vectors (bool): Ajoute à chaque résultat le vecteur conservé ('vector'), pour le réutiliser sans réencoder le texte.
+
+        Returns:
+            list[dict]: {'row', 'source', 'text', 'score'[, 'vector']}, du plus proche au moins proche.
+        """
+        if top_k <= 0:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        with self._lock:
+            if not len(self._rows) or not self._alive.any():
+                return []
+            vectors = self._memmap()
+            if sources is not None:
+                candidates = np.flatnonzero(self._alive & np.isin(self._row_sources, list(sources)))
+            elif self.centroids is not None and nprobe < len(self.centroids):
+                probe = np.argsort(-(self.centroids @ query))[:nprobe]
+                candidates = np.flatnonzero(self._alive & np.isin(self._lists, probe))
+            else:
+                candidates = None
+
+            if candidates is None:
+                scores = np.empty(len(self._rows), dtype=np.float32)
+                for start in range(0, len(self._rows), SEARCH_BLOCK_ROWS):
+                    scores[start:start + SEARCH_BLOCK_ROWS] = vectors[start:start + SEARCH_BLOCK_ROWS] @ query
+                scores[~self._alive] = -np.inf
+                candidates = np.arange(len(self._rows))
+            else:
+                scores = np.empty(len(candidates), dtype=np.float32)
+                for start in range(0, len(candidates), SEARCH_BLOCK_ROWS):
+                    scores[start:start + SEARCH_BLOCK_ROWS] = vectors[candidates[start:start + SEARCH_BLOCK_ROWS]] @ query
+
+            top_k = min(top_k, int(np.isfinite(scores).sum()))
+            if top_k <= 0:
+                return []
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            hits = [{"row": int(candidates[position]), "source": self._rows[candidates[position]]["source"],
+                     "text": self._rows[candidates[position]]["text"], "score": float(scores[position])}
+                    for position in best]
+            if with_vectors:
+                for hit in hits:
+                    hit["vector"] = np.array(vectors[hit["row"]])
+            return hits
+
+
+def _texts_digest(texts):
+    return hashlib.sha256("\x00".join(texts).encode("utf-8")).hexdigest()
+
+
+def index_summary_folder(index, folder_path, embedding_service=None):
+    """
+    Indexe (ou réindexe) les résumés partiels d'un dossier de résumés ; sans effet si son contenu n'a pas changé.
+
+    Args:
+        index (VectorIndex): Index à compléter.
+        folder_path (str): Dossier de résumés (voir TextAnalyzer.load_summary_bundle_from_folder).
+        embedding_service (EmbeddingService, optional): Service d'encodage. Par défaut le service partagé.
+
+    Returns:
+        int: Nombre de vecteurs ajoutés (0 si le dossier était déjà à jour).
+    """
+    from Podcast_Generator.TextAnalyzer import load_summary_bundle_from_folder
+
+    source = str(Path(folder_path).resolve())
+    chunks = load_summary_bundle_from_folder(folder_path)["summary"][1:]
+    digest = _texts_digest(chunks)
+    if index.source_digest(source) == digest:
+        return 0
+
+    if embedding_service is None:
+        from Podcast_Generator.EmbeddingService import get_embedding_service
+        embedding_service = get_embedding_service()
+    index.remove(source)
+    vectors = embedding_service.encode(chunks) if chunks else np.zeros((0, index.dimension or 0), dtype=np.float32)
+    index.add(source, chunks, vectors, digest=digest)
+    return len(chunks)
+
+
+def index_summary_folders(folders, index=None, embedding_service=None, build_ivf=None):
+    """
+    Indexe les dossiers de résumés de plusieurs exécutions (dossiers déjà à jour ignorés).
+
+    Args:
+        folders (list[str]): Dossiers de résumés.
+        index (VectorIndex, optional): Index à compléter. Par défaut l'index du modèle dans INDEX_DIR.
+        embedding_service (EmbeddingService, optional): Service d'encodage. Par défaut le service partagé.
+        build_ivf (bool, optional): Construit l'IVF. None : seulement au-delà de IVF_MIN_VECTORS vecteurs,
+                                    s'il n'existe pas encore.
+
+    Returns:
+        VectorIndex: Index à jour.
+    """
+    start_time = time.time()
+    print(f"Début index_summary_folders : {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    index = index if index is not None else VectorIndex()
+    added = sum(index_summary_folder(index, folder, embedding_service) for folder in folders)
+    if build_ivf or (build_ivf is None and index.centroids is None and len(index) >= IVF_MIN_VECTORS):
+        index.build_ivf()
+    elapsed = time.time() - start_time
+    print(f"Fin index_summary_folders: {datetime.now().strftime('%Y-%m-%d %H:%M')} — {added} vecteurs ajoutés, "
+          f"{len(index)} indexés — Temps écoulé : {elapsed:.2f} secondes")
+    return index
@@ -6,7 +6,7 @@ import json
 
 from PromptDialogueGenerator import PROMPTS_DIALOGUE
 from pathlib import Path
-from SourceImporter import extract_file_handler
+from SourceImporter import extract_sections, section_tree_text
 from Podcast_Generator.TextAnalyzer import summarize_with_meta_summary, extract_concepts, save_list_to_json
 from Podcast_Generator.PodcastScriptGenerator import create_script_rag_modulaire, save_script_to_json
 from Podcast_Generator.PodcastDialogueGenerator import generate_raw_dialogue
@@ -77,7 +77,8 @@ def lancer_pipeline_complet(lang: str, auteur: str):
 
     # 1. Source du texte
     path = input("Entrez le chemin de la source (.pdf, .docx, .txt, .md...) : ").strip()
-    texte = extract_file_handler(path)
+    sections = extract_sections(path)
+    texte = section_tree_text(sections)
 
     if not texte:
         print("[ERREUR] Texte introuvable ou vide.")
@@ -85,7 +86,7 @@ def lancer_pipeline_complet(lang: str, auteur: str):
 
     # 2. Résumé + Concepts
     print("Résumé avec méta-analyse...")
-    text_summaries = summarize_with_meta_summary(texte, output_language=lang)
+    text_summaries = summarize_with_meta_summary(texte, output_language=lang, sections=sections)
 
     print("Extraction des mots-clés...")
     keywords = extract_concepts(text_summaries[0], mode="keywords", output_language=lang)
@@ -161,7 +162,7 @@ def menu_voix():
 
 
 def menu_etapes_pipeline(langue_globale: str):
-    from Podcast_Generator.SourceImporter import extract_file_handler
+    from Podcast_Generator.SourceImporter import extract_file_handler, extract_sections, section_tree_text
     from Podcast_Generator.TextAnalyzer import summarize_with_meta_summary, extract_concepts, save_list_to_json
     from Podcast_Generator.PodcastScriptGenerator import create_script_rag_modulaire, save_script_to_json,generate_discussion_from_file
     from Podcast_Generator.PodcastDialogueGenerator import generate_raw_dialogue
@@ -203,12 +204,13 @@ def menu_etapes_pipeline(langue_globale: str):
 
         elif choix == "2":
             path = input("Chemin vers la source pour le résumé : ").strip().strip('"')
-            texte = extract_file_handler(path)
+            sections = extract_sections(path)
+            texte = section_tree_text(sections)
             if not texte:
                 print("[ERREUR] Impossible d'extraire le texte.")
                 continue
             try:
-                summaries = summarize_with_meta_summary(texte, output_language=current_lang)
+                summaries = summarize_with_meta_summary(texte, output_language=current_lang, sections=sections)
                 path_saved = save_list_to_json(summaries, suffix="summary")
                 print(f"[OK] Résumé sauvegardé : {path_saved}")
             except Exception as e:
@@ -242,12 +244,13 @@ def menu_etapes_pipeline(langue_globale: str):
 
         elif choix == "5":
             path = input("Chemin vers un fichier source à résumer : ").strip().strip('"')
-            texte = extract_file_handler(path)
+            sections = extract_sections(path)
+            texte = section_tree_text(sections)
             if not texte:
                 print("[ERREUR] Impossible d'extraire le texte.")
                 continue
             try:
-                summaries = summarize_with_meta_summary(texte, output_language=current_lang)
+                summaries = summarize_with_meta_summary(texte, output_language=current_lang, sections=sections)
                 path_summary = save_list_to_json(summaries, suffix="summary")
                 keywords = extract_concepts(summaries[0], mode="keywords", output_language=current_lang)
                 save_list_to_json(keywords, suffix="keywords", path=Path(path_summary).parent)
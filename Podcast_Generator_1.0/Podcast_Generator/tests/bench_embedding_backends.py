@@ -0,0 +1,110 @@
+"""
+Benchmark des moteurs d'embedding (PyTorch vs ONNX float32 vs ONNX int8) sur la liste des tons et un jeu de chunks.
+Benchmark of the embedding backends (PyTorch vs ONNX float32 vs ONNX int8) on the tone list and a chunk set.
+
+Mesure le débit (phrases / seconde) et vérifie la compatibilité des vecteurs avec le moteur PyTorch :
+similarité cosinus minimale et ton résolu identique pour chaque requête.
+Measures throughput (sentences / second) and checks vector compatibility with the PyTorch backend:
+minimum cosine similarity and identical resolved tone for each query.
+
+Usage :
+    python Podcast_Generator/tests/bench_embedding_backends.py [--repeat 5] [--chunk-chars 1500] [--tolerance 0.98]
+
+Le fichier ne commence pas par "test_" : il n'est pas exécuté par pytest.
+The file does not start with "test_": it is not run by pytest.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import EmbeddingService
+from Podcast_Generator.TonePresetManager import load_tone_presets
+
+EXPECTED_DIR = Path(__file__).parent / "Expected"
+BACKENDS = {
+    "torch": ("torch", None),
+    "onnx": ("onnx", "onnx/model.onnx"),
+    "onnx-int8": ("onnx", EmbeddingService.EMBEDDING_ONNX_FILE),
+}
+TONE_QUERIES = ["enthousiaste", "posé et rassurant", "très sérieux", "humoristique", "mélancolique"]
+
+
+def load_chunks(chunk_chars):
+    """Découpe les textes attendus des tests en chunks d'environ chunk_chars caractères (taille d'un résumé partiel)."""
+    chunks = []
+    for path in sorted(EXPECTED_DIR.glob("*.txt")):
+        words = path.read_text(encoding="utf-8").split()
+        current, size = [], 0
+        for word in words:
+            current.append(word)
+            size += len(word) + 1
+            if size >= chunk_chars:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+        if current:
+            chunks.append(" ".join(current))
+    return chunks
+
+
+def bench_backend(backend, onnx_file, texts_sets, repeat):
+    """Retourne (temps de chargement, {jeu: phrases / seconde}, {jeu: vecteurs}) pour un moteur."""
+    service = EmbeddingService.EmbeddingService(backend=backend, onnx_file=onnx_file or EmbeddingService.EMBEDDING_ONNX_FILE,
+                                                cache_size=0, persistent_cache=False)
+    start_time = time.time()
+    service.model
+    load_time = time.time() - start_time
+
+    throughput, vectors = {}, {}
+    for name, texts in texts_sets.items():
+        vectors[name] = service.encode(texts)
+        start_time = time.time()
+        for _ in range(repeat):
+            service.encode(texts)
+        throughput[name] = repeat * len(texts) / (time.time() - start_time)
+    return load_time, throughput, vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PyTorch vs ONNX des embeddings")
+    parser.add_argument("--repeat", type=int, default=5, help="Encodages mesurés par jeu de textes")
+    parser.add_argument("--chunk-chars", type=int, default=1500, help="Taille des chunks en caractères")
+    parser.add_argument("--tolerance", type=float, default=0.98, help="Similarité cosinus minimale avec PyTorch")
+    args = parser.parse_args()
+
+    tones = list(load_tone_presets().keys())
+    texts_sets = {"tons": tones, "requêtes": TONE_QUERIES, "chunks": load_chunks(args.chunk_chars)}
+    print(f"Modèle {EmbeddingService.EMBEDDING_MODEL} — " + ", ".join(f"{len(t)} {name}" for name, t in texts_sets.items()))
+
+    results = {}
+    for name, (backend, onnx_file) in BACKENDS.items():
+        try:
+            results[name] = bench_backend(backend, onnx_file, texts_sets, args.repeat)
+        except (ImportError, OSError, ValueError, RuntimeError) as e:
+            print(f"{name:10s} indisponible : {e}")
+            continue
+        load_time, throughput, _ = results[name]
+        print(f"{name:10s} chargement {load_time:6.2f} s — "
+              + " — ".join(f"{set_name} {rate:8.1f} phrases/s" for set_name, rate in throughput.items()))
+
+    if "torch" not in results:
+        return
+    reference = results["torch"][2]
+    for name, (_, throughput, vectors) in results.items():
+        if name == "torch":
+            continue
+        similarity = min(float(np.min(np.sum(vectors[set_name] * reference[set_name], axis=1))) for set_name in texts_sets)
+        same_tones = np.array_equal((vectors["requêtes"] @ vectors["tons"].T).argmax(axis=1),
+                                    (reference["requêtes"] @ reference["tons"].T).argmax(axis=1))
+        status = "OK" if similarity >= args.tolerance and same_tones else "HORS TOLÉRANCE"
+        print(f"{name:10s} cosinus min {similarity:.4f} — tons résolus identiques : {same_tones} — "
+              f"accélération chunks x{throughput['chunks'] / results['torch'][1]['chunks']:.2f} — {status}")
+
+
+if __name__ == "__main__":
+    main()
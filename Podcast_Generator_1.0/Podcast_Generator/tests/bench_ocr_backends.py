@@ -0,0 +1,85 @@
+"""
+Benchmark des moteurs OCR (pytesseract vs tesserocr) sur les échantillons de tests/Samples.
+Benchmark of the OCR engines (pytesseract vs tesserocr) on the tests/Samples files.
+
+Usage :
+    python Podcast_Generator/tests/bench_ocr_backends.py [--pages 5] [--lang eng+fra] [--dpi 150]
+
+Le fichier ne commence pas par "test_" : il n'est pas exécuté par pytest.
+The file does not start with "test_": it is not run by pytest.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import fitz
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import SourceImporter
+
+SAMPLE_DIR = Path(__file__).parent / "Samples"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def load_sample_images(max_pages, dpi):
+    """Rastérise les premières pages des PDF et charge les images des échantillons."""
+    images = []
+    for path in sorted(SAMPLE_DIR.iterdir()):
+        suffix = path.suffix.lower()
+        if suffix == ".pdf":
+            with fitz.open(path) as pdf_document:
+                for page_num in range(min(max_pages, pdf_document.page_count)):
+                    # Copie : l'image ne doit pas dépendre du pixmap pendant tout le benchmark.
+                    images.append((f"{path.name} p{page_num + 1}", SourceImporter._render_pdf_page(pdf_document, page_num, dpi).copy()))
+        elif suffix in IMAGE_EXTENSIONS:
+            images.append((path.name, Image.open(path).convert('L')))
+    return images
+
+
+def bench_backend(backend, images, lang):
+    """Retourne (durée totale, durée du premier appel, nombre de caractères reconnus) pour un moteur."""
+    SourceImporter.close_ocr_engines()
+    SourceImporter._ocr_engines.pid = None
+
+    total_chars = 0
+    first_call = None
+    start_time = time.time()
+    for _, image in images:
+        call_start = time.time()
+        total_chars += len(SourceImporter.ocr_image(image, lang, backend=backend).strip())
+        if first_call is None:
+            first_call = time.time() - call_start
+    return time.time() - start_time, first_call, total_chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pytesseract vs tesserocr")
+    parser.add_argument("--pages", type=int, default=5, help="Pages OCR par PDF")
+    parser.add_argument("--lang", default="eng+fra", help="Langues Tesseract")
+    parser.add_argument("--dpi", type=int, default=SourceImporter.OCR_DPI, help="Résolution de rendu des PDF")
+    args = parser.parse_args()
+
+    images = load_sample_images(args.pages, args.dpi)
+    print(f"{len(images)} images — langues {args.lang} — {args.dpi} dpi")
+
+    results = {}
+    for backend in ("pytesseract", "tesserocr"):
+        try:
+            results[backend] = bench_backend(backend, images, args.lang)
+        except (ImportError, RuntimeError, OSError) as e:
+            print(f"{backend:12s} indisponible : {e}")
+            continue
+        elapsed, first_call, chars = results[backend]
+        print(f"{backend:12s} {elapsed:8.2f} s — {elapsed / len(images):.3f} s/image "
+              f"(premier appel {first_call:.3f} s) — {chars} caractères")
+
+    if len(results) == 2:
+        print(f"Accélération tesserocr : x{results['pytesseract'][0] / results['tesserocr'][0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import EmbeddingCache
+
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class TestEmbeddingCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        self.vectors = np.random.default_rng(0).normal(size=(3, 8)).astype(np.float32)
+
+    def test_round_trip_and_persistence(self):
+        """Vecteurs relus en float32 (précision float16), après réouverture du cache, quel que soit l'espacement"""
+        cache = EmbeddingCache.EmbeddingCache(MODEL, cache_dir=self.cache_dir)
+        self.assertEqual(cache.get_many(["a", "b"]), [None, None])
+        cache.put_many(["a", "b", "a"], self.vectors)
+        self.assertEqual(len(cache), 2)
+
+        reopened = EmbeddingCache.EmbeddingCache(MODEL, cache_dir=self.cache_dir)
+        found = reopened.get_many(["  b\n", "c", "a"])
+        self.assertIsNone(found[1])
+        self.assertEqual(found[0].dtype, np.float32)
+        self.assertTrue(np.allclose(found[0], self.vectors[1], atol=1e-2))
+        self.assertTrue(np.array_equal(found[2], self.vectors[0].astype(np.float16).astype(np.float32)))
+        self.assertEqual(reopened.get_many(["a"], variant="raw"), [None])
+
+        stats = reopened.stats()
+        self.assertEqual((stats["entries"], stats["hits"], stats["misses"]), (2, 2, 2))
+        self.assertEqual(stats["bytes"], 2 * 8 * 2)
+        self.assertEqual(reopened.clear(), 2)
+        self.assertEqual(EmbeddingCache.EmbeddingCache(MODEL, cache_dir=self.cache_dir).get_many(["a"]), [None])
+
+    def test_models_and_dimensions_kept_apart(self):
+        """Un dossier par modèle ; dimension différente refusée"""
+        cache = EmbeddingCache.EmbeddingCache(MODEL, cache_dir=self.cache_dir)
+        cache.put_many(["a"], self.vectors[:1])
+        self.assertEqual(EmbeddingCache.EmbeddingCache("autre-modele", cache_dir=self.cache_dir).get_many(["a"]), [None])
+        with self.assertRaises(ValueError):
+            cache.put_many(["b"], np.zeros((1, 4)))
+
+    def test_orphan_rows_truncated(self):
+        """Vecteurs écrits sans index (écriture interrompue) : retirés à l'ouverture"""
+        cache = EmbeddingCache.EmbeddingCache(MODEL, cache_dir=self.cache_dir)
+        cache.put_many(["a"], self.vectors[:1])
+        with open(cache.directory / "vectors.f16", "ab") as f:
+            f.write(self.vectors[1:].astype(np.float16).tobytes())
+
+        reopened = EmbeddingCache.EmbeddingCache(MODEL, cache_dir=self.cache_dir)
+        self.assertEqual(reopened.stats()["bytes"], 8 * 2)
+        reopened.put_many(["b"], self.vectors[1:2])
+        self.assertTrue(np.allclose(reopened.get_many(["b"])[0], self.vectors[1], atol=1e-2))
+        self.assertTrue(np.allclose(reopened.get_many(["a"])[0], self.vectors[0], atol=1e-2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import unittest
+import os
+import sys
+import tempfile
+import types
+import zlib
+from unittest import mock
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import EmbeddingCache, EmbeddingService
+
+
+class FakeSentenceTransformer:
+    """Modèle factice : vecteurs déterministes dérivés du texte, appels comptés."""
+    instances = 0
+
+    def __init__(self, model_name, device=None):
+        FakeSentenceTransformer.instances += 1
+        self.model_name = model_name
+        self.device = device
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, convert_to_numpy=True, show_progress_bar=False):
+        self.calls.append((list(texts), batch_size))
+        vectors = np.array([np.random.default_rng(zlib.crc32(text.encode("utf-8"))).normal(size=8) for text in texts])
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+class FakeEncoding:
+    def __init__(self, ids, length):
+        self.ids = ids + [0] * (length - len(ids))
+        self.attention_mask = [1] * len(ids) + [0] * (length - len(ids))
+        self.type_ids = [0] * length
+
+
+class FakeTokenizer:
+    """Tokenizer factice : un identifiant par mot (crc32), lots complétés par des zéros."""
+    max_length = None
+
+    @classmethod
+    def from_file(cls, path):
+        return cls()
+
+    def enable_truncation(self, max_length):
+        FakeTokenizer.max_length = max_length
+
+    def enable_padding(self):
+        pass
+
+    def encode_batch(self, texts):
+        ids = [[zlib.crc32(word.encode("utf-8")) % 97 + 1 for word in text.split()][:self.max_length] for text in texts]
+        length = max(len(text_ids) for text_ids in ids)
+        return [FakeEncoding(text_ids, length) for text_ids in ids]
+
+
+class FakeInferenceSession:
+    """Session ONNX factice : embedding de token = ligne d'une table, le remplissage (id 0) vaut 1000."""
+    table = np.random.default_rng(0).normal(size=(98, 8)).astype(np.float32)
+    table[0] = 1000.0
+
+    def __init__(self, path, sess_options=None, providers=None):
+        self.path = path
+        self.batches = []
+
+    def get_inputs(self):
+        return [types.SimpleNamespace(name="input_ids"), types.SimpleNamespace(name="attention_mask")]
+
+    def run(self, output_names, inputs):
+        assert set(inputs) == {"input_ids", "attention_mask"}
+        self.batches.append(inputs["input_ids"].shape)
+        return [self.table[inputs["input_ids"]]]
+
+
+class TestEmbeddingService(unittest.TestCase):
+
+    def setUp(self):
+        FakeSentenceTransformer.instances = 0
+        fake_module = types.SimpleNamespace(SentenceTransformer=FakeSentenceTransformer)
+        patcher = mock.patch.dict(sys.modules, {"sentence_transformers": fake_module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(EmbeddingService.set_embedding_service, None)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        cache_patcher = mock.patch.object(EmbeddingCache, "CACHE_DIR", self.cache_dir)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def test_model_loaded_once_on_first_encode(self):
+        """Aucun chargement à la création ; un seul modèle partagé, sur le périphérique configuré"""
+        EmbeddingService.set_embedding_service(None)
+        service = EmbeddingService.get_embedding_service()
+        self.assertIs(EmbeddingService.get_embedding_service(), service)
+        self.assertFalse(service.stats()["model_loaded"])
+        self.assertEqual(FakeSentenceTransformer.instances, 0)
+
+        service.encode("sérieux")
+        service.encode(["joyeux", "calme"])
+        self.assertEqual(FakeSentenceTransformer.instances, 1)
+
+        custom = EmbeddingService.EmbeddingService(device="cpu", batch_size=4, persistent_cache=False)
+        custom.encode("sérieux")
+        self.assertEqual(custom.model.device, "cpu")
+        self.assertEqual(custom.model.calls[0][1], 4)
+
+    def test_encode_uses_lru_cache(self):
+        """Textes déjà vus servis par le cache ; seuls les nouveaux textes (sans doublon) vont au modèle, en un appel"""
+        service = EmbeddingService.EmbeddingService(cache_size=3, persistent_cache=False)
+        first = service.encode(["sérieux", "joyeux", "sérieux"])
+        self.assertEqual(first.shape, (3, 8))
+        self.assertTrue(np.allclose(np.linalg.norm(first, axis=1), 1.0))
+        self.assertTrue(np.array_equal(first[0], first[2]))
+        self.assertEqual(service.model.calls, [(["sérieux", "joyeux"], EmbeddingService.EMBEDDING_BATCH_SIZE)])
+
+        second = service.encode(["joyeux", "calme"])
+        self.assertTrue(np.array_equal(second[0], first[1]))
+        self.assertEqual(service.model.calls[-1][0], ["calme"])
+        self.assertEqual(service.stats()["hits"], 1)
+        self.assertEqual(service.stats()["misses"], 3)
+
+        # Capacité 3 : "sérieux" (le moins récemment utilisé) est évincé par "triste".
+        service.encode("triste")
+        service.encode("sérieux")
+        self.assertEqual(service.model.calls[-1][0], ["sérieux"])
+        self.assertEqual(service.stats()["cached"], 3)
+        self.assertEqual(service.encode("calme").shape, (8,))
+        self.assertEqual(service.encode([]).shape, (0, 0))
+
+    def test_persistent_cache_avoids_inference(self):
+        """Deuxième exécution (nouveau service, même dossier de cache) : aucun chargement du modèle"""
+        texts = ["sérieux", "joyeux", "calme"]
+        first = EmbeddingService.EmbeddingService().encode(texts)
+        self.assertEqual(FakeSentenceTransformer.instances, 1)
+
+        service = EmbeddingService.EmbeddingService()
+        second = service.encode(["joyeux", "sérieux ", "calme"])
+        self.assertEqual(FakeSentenceTransformer.instances, 1)
+        self.assertFalse(service.stats()["model_loaded"])
+        self.assertTrue(np.array_equal(second, first[[1, 0, 2]]))
+        self.assertEqual(service.stats()["persistent"]["hits"], 3)
+
+        # Vecteurs non normalisés : entrée distincte du cache, nouvelle inférence.
+        raw = service.encode("sérieux", normalize=False)
+        self.assertEqual(service.model.calls, [(["sérieux"], EmbeddingService.EMBEDDING_BATCH_SIZE)])
+        self.assertFalse(np.allclose(raw, first[0]))
+
+    def test_onnx_backend(self):
+        """Moteur ONNX : pooling moyen sur les vrais tokens, ordre des textes conservé, cache disque séparé"""
+        fake_onnxruntime = types.SimpleNamespace(InferenceSession=FakeInferenceSession,
+                                                 SessionOptions=lambda: types.SimpleNamespace(intra_op_num_threads=0))
+        fake_tokenizers = types.SimpleNamespace(Tokenizer=FakeTokenizer)
+        with tempfile.TemporaryDirectory() as model_dir, \
+                mock.patch.dict(sys.modules, {"onnxruntime": fake_onnxruntime, "tokenizers": fake_tokenizers}):
+            with open(os.path.join(model_dir, "sentence_bert_config.json"), "w", encoding="utf-8") as f:
+                f.write('{"max_seq_length": 16}')
+            os.makedirs(os.path.join(model_dir, "onnx"))
+            open(os.path.join(model_dir, EmbeddingService.EMBEDDING_ONNX_FILE), "wb").close()
+
+            texts = ["un ton calme et posé", "joyeux", "un ton sérieux"]
+            onnx_service = EmbeddingService.EmbeddingService(model_name=model_dir, backend="onnx", batch_size=2)
+            vectors = onnx_service.encode(texts)
+            self.assertEqual(FakeSentenceTransformer.instances, 0)
+            self.assertEqual(FakeTokenizer.max_length, 16)
+            self.assertEqual(onnx_service.model.session.batches, [(2, 5), (1, 1)])
+
+            for text, vector in zip(texts, vectors):
+                ids = [zlib.crc32(word.encode("utf-8")) % 97 + 1 for word in text.split()]
+                expected = FakeInferenceSession.table[ids].mean(axis=0)
+                self.assertTrue(np.allclose(vector, expected / np.linalg.norm(expected), atol=1e-3))
+
+            torch_service = EmbeddingService.EmbeddingService(model_name=model_dir)
+            self.assertNotEqual(onnx_service.persistent_cache.directory, torch_service.persistent_cache.directory)
+
+    def test_semantic_search(self):
+        """Résultats triés par score décroissant, top_k borné par le nombre de vecteurs"""
+        service = EmbeddingService.EmbeddingService()
+        tones = ["sérieux", "joyeux", "calme", "triste"]
+        vectors = service.encode(tones)
+        hits = EmbeddingService.semantic_search(service.encode("joyeux"), vectors, top_k=10)
+        self.assertEqual(len(hits), 4)
+        self.assertEqual(hits[0][0], 1)
+        self.assertAlmostEqual(hits[0][1], 1.0, places=5)
+        self.assertEqual([score for _, score in hits], sorted((score for _, score in hits), reverse=True))
+        self.assertEqual(EmbeddingService.semantic_search(vectors[0], vectors, top_k=0), [])
+
+    def test_mmr_select(self):
+        """MMR : doublon écarté au profit d'un candidat moins proche mais nouveau ; budget jamais dépassé"""
+        query = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        near = np.array([0.9, 0.1, 0.0]) / np.linalg.norm([0.9, 0.1, 0.0])
+        other = np.array([0.6, -0.8, 0.0])
+        vectors = np.array([near, near, other, [0.0, 0.0, 1.0]], dtype=np.float32)
+
+        self.assertEqual(EmbeddingService.mmr_select(query, vectors, [10] * 4, budget=20), [0, 2])
+        self.assertEqual(EmbeddingService.mmr_select(query, vectors, [10] * 4, budget=20, diversity=0.0), [0, 1])
+        # Candidat trop coûteux sauté, candidats suivants retenus tant qu'ils tiennent dans le budget.
+        self.assertEqual(EmbeddingService.mmr_select(query, vectors, [10, 10, 50, 5], budget=25), [0, 3, 1])
+        self.assertEqual(EmbeddingService.mmr_select(query, vectors, [30] * 4, budget=20), [])
+        self.assertEqual(EmbeddingService.mmr_select(query, vectors[:0], [], budget=20), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+from pathlib import Path
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import ExtractionCache
+from Podcast_Generator import SourceImporter
+
+
+class TestExtractionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp_dir.name) / "cache"
+        self.source = Path(self.tmp_dir.name) / "source.txt"
+        self.source.write_text("Bonjour, ceci est un document de test.", encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_and_load_extraction(self):
+        """Une extraction enregistrée est retrouvée avec les mêmes paramètres uniquement"""
+        self.assertIsNone(ExtractionCache.load_extraction(self.source, "eng", 72, self.cache_dir))
+
+        pages = [{"page": 1, "method": "ocr", "seconds": 1.5, "chars": 38}]
+        ExtractionCache.save_extraction(self.source, "texte", pages, "eng", 72, self.cache_dir)
+
+        cached = ExtractionCache.load_extraction(self.source, "eng", 72, self.cache_dir)
+        self.assertEqual(cached["text"], "texte")
+        self.assertEqual(cached["pages"], pages)
+        self.assertIsNone(ExtractionCache.load_extraction(self.source, "fra", 72, self.cache_dir))
+        self.assertIsNone(ExtractionCache.load_extraction(self.source, "eng", 300, self.cache_dir))
+
+    def test_modified_file_invalidates_entry(self):
+        """Un fichier modifié change d'empreinte : l'ancienne entrée n'est plus utilisée"""
+        ExtractionCache.save_extraction(self.source, "texte", [], "eng", 72, self.cache_dir)
+        self.source.write_text("Contenu différent, et plus long que le précédent.", encoding="utf-8")
+        self.assertIsNone(ExtractionCache.load_extraction(self.source, "eng", 72, self.cache_dir))
+
+    def test_file_digest_skips_hashing_when_unchanged(self):
+        """Taille et mtime inchangés : l'empreinte est lue dans l'index sans relire le fichier"""
+        digest = ExtractionCache.file_digest(self.source, self.cache_dir)
+        with mock.patch.object(ExtractionCache.hashlib, "sha256") as sha256:
+            self.assertEqual(ExtractionCache.file_digest(self.source, self.cache_dir), digest)
+        sha256.assert_not_called()
+
+    def test_file_digest_index_shared_by_processes(self):
+        """Empreintes calculées par plusieurs processus : aucune entrée d'index perdue"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        paths = []
+        for i in range(8):
+            path = Path(self.tmp_dir.name) / f"doc_{i}.txt"
+            path.write_text(f"Document {i}", encoding="utf-8")
+            paths.append(path)
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            digests = list(executor.map(ExtractionCache.file_digest, paths, [self.cache_dir] * len(paths)))
+
+        self.assertEqual(len(list((self.cache_dir / "index").glob("*.json"))), len(paths))
+        with mock.patch.object(ExtractionCache.hashlib, "sha256") as sha256:
+            self.assertEqual([ExtractionCache.file_digest(path, self.cache_dir) for path in paths], digests)
+        sha256.assert_not_called()
+
+    def test_clear_cache(self):
+        ExtractionCache.save_extraction(self.source, "texte", [], "eng", 72, self.cache_dir)
+        self.assertEqual(ExtractionCache.clear_cache(self.cache_dir), 1)
+        self.assertIsNone(ExtractionCache.load_extraction(self.source, "eng", 72, self.cache_dir))
+
+    def test_extract_file_handler_uses_cache(self):
+        """Le second appel d'extract_file_handler sur un fichier inchangé n'appelle plus l'extracteur"""
+        pdf_path = Path(self.tmp_dir.name) / "scan.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 contenu factice")
+        pages = [{"page": 1, "method": "ocr", "lang": "fra", "seconds": 2.0, "chars": 12}]
+
+        def fake_extract(path, languages, report, dpi, page_texts=None):
+            report.extend(pages)
+            page_texts.append("texte OCR")
+            return "texte OCR"
+
+        with mock.patch.object(ExtractionCache, "CACHE_DIR", self.cache_dir), \
+                mock.patch.object(SourceImporter, "extract_text_from_pdf", side_effect=fake_extract) as extract:
+            first = SourceImporter.extract_file_handler(str(pdf_path))
+            report = []
+            second = SourceImporter.extract_file_handler(str(pdf_path), report=report)
+            third = SourceImporter.extract_file_handler(str(pdf_path), use_cache=False)
+
+        self.assertEqual(first, "texte OCR")
+        self.assertEqual(second, "texte OCR")
+        self.assertEqual(third, "texte OCR")
+        self.assertEqual(report, pages)
+        self.assertEqual(extract.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
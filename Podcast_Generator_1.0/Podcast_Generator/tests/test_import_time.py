@@ -0,0 +1,60 @@
+import unittest
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Bibliothèques propres à un format ou à un backend : chargées seulement au premier usage.
+HEAVY_MODULES = ["fitz", "PyPDF2", "pytesseract", "tesserocr", "PIL", "numpy", "docx2txt", "markdown",
+                 "selenium", "bs4", "requests", "llama_cpp", "concurrent.futures.process"]
+
+# Plafond de durée d'import en secondes, vérifié seulement si la variable d'environnement PODCAST_MAX_IMPORT_SECONDS
+# est définie (ex : 0.3 ; avant chargement différé, plus de 500 ms) : la durée dépend trop de la machine pour la CI.
+MAX_IMPORT_SECONDS = float(os.environ["PODCAST_MAX_IMPORT_SECONDS"]) if os.environ.get("PODCAST_MAX_IMPORT_SECONDS") else None
+
+
+def import_time(module):
+    """
+    Importe un module dans un nouvel interpréteur avec `python -X importtime`.
+
+    Returns:
+        tuple[set[str], float]: Modules importés et durée cumulée de l'import demandé (secondes).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    modules = set()
+    cumulative = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        if not cumulative_us.isdigit():
+            continue
+        modules.add(name)
+        if name == module:
+            cumulative = int(cumulative_us) / 1e6
+    return modules, cumulative
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_text_analyzer_import_is_cheap(self):
+        """Importer TextAnalyzer (et donc SourceImporter, LocalIAIManager) ne charge aucun extracteur ni llama-cpp"""
+        modules, seconds = import_time("Podcast_Generator.TextAnalyzer")
+        self.assertIn("Podcast_Generator.SourceImporter", modules)
+        loaded = sorted(name for name in HEAVY_MODULES if name in modules)
+        self.assertEqual(loaded, [])
+        if MAX_IMPORT_SECONDS is not None:
+            self.assertLess(seconds, MAX_IMPORT_SECONDS)
+
+    def test_embedding_service_import_is_cheap(self):
+        """Importer le service d'embeddings ne charge ni sentence-transformers ni PyTorch"""
+        modules, seconds = import_time("Podcast_Generator.EmbeddingService")
+        self.assertEqual(sorted(name for name in ("sentence_transformers", "torch") if name in modules), [])
+        if MAX_IMPORT_SECONDS is not None:
+            self.assertLess(seconds, MAX_IMPORT_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
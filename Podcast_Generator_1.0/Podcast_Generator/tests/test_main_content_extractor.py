@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import MainContentExtractor
+from Podcast_Generator import SourceImporter
+
+BLOG_PAGE = """<html><head><title>Blog</title></head><body>
+<header class="site-header"><a href="/">Accueil</a> <a href="/blog">Blog</a> <a href="/contact">Contact</a></header>
+<nav><ul><li><a href="/a">Rubrique A</a></li><li><a href="/b">Rubrique B</a></li></ul></nav>
+<div id="onetrust-banner-sdk">Nous utilisons des cookies pour améliorer votre expérience. Accepter tout, refuser tout, paramétrer.</div>
+<div class="layout">
+ <div class="article-body">
+  <h1>Les podcasts et la mémoire</h1>
+  <p>Écouter un cours sous forme de podcast, en marchant ou dans les transports, aide à mémoriser, selon plusieurs études récentes menées auprès d'étudiants.</p>
+  <p>Les chercheurs ont comparé trois groupes, un groupe lisant le cours, un groupe l'écoutant, et un groupe combinant les deux approches, pendant six semaines.</p>
+  <p>Le groupe combinant lecture et écoute obtient les meilleurs résultats, avec une progression nette, durable, et mesurée sur plusieurs examens successifs.</p>
+ </div>
+ <div class="sidebar"><h3>Articles liés</h3><ul><li><a href="/1">Dix astuces pour réviser efficacement avant les examens</a></li><li><a href="/2">Pourquoi la lecture à voix haute aide la mémoire</a></li></ul></div>
+</div>
+<div class="share">Partager sur Facebook, Twitter, LinkedIn</div>
+<footer>(c) 2025 Blog Éducation - Mentions légales - Politique de confidentialité - Plan du site</footer>
+</body></html>"""
+
+
+class TestMainContentExtractor(unittest.TestCase):
+
+    def test_extract_main_content(self):
+        """Article conservé ; menus, bandeau de cookies, articles liés, partage et pied de page retirés"""
+        report = {}
+        text = MainContentExtractor.extract_main_content(BLOG_PAGE, report)
+
+        self.assertIn("Les podcasts et la mémoire", text)
+        self.assertIn("Écouter un cours sous forme de podcast", text)
+        self.assertIn("plusieurs examens successifs", text)
+        for boilerplate in ("Rubrique A", "cookies", "Dix astuces", "Partager", "Mentions légales", "Contact"):
+            self.assertNotIn(boilerplate, text)
+
+        self.assertFalse(report["fallback"])
+        self.assertEqual(report["bytes_after"], len(text.encode("utf-8")))
+        self.assertGreater(report["bytes_removed"], 0)
+        self.assertGreater(report["tokens_removed"], 0)
+        self.assertEqual(report["tokens_before"] - report["tokens_after"], report["tokens_removed"])
+
+    def test_short_page_falls_back_to_full_text(self):
+        """Sans contenu principal identifiable, le texte complet de la page est retourné"""
+        report = {}
+        html = "<html><body><div><a href='/'>Accueil</a></div><div>Bienvenue</div></body></html>"
+        self.assertEqual(MainContentExtractor.extract_main_content(html, report), "Accueil Bienvenue")
+        self.assertTrue(report["fallback"])
+        self.assertEqual(report["tokens_removed"], 0)
+
+    def test_extract_text_from_html_file(self):
+        """Fichier .html : encodage de la balise meta respecté, contenu principal seul via extract_file_handler"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "page.html")
+            html = BLOG_PAGE.replace("<head>", "<head><meta charset='iso-8859-1'>")
+            with open(path, "wb") as f:
+                f.write(html.encode("iso-8859-1"))
+
+            text = SourceImporter.extract_file_handler(path, use_cache=False)
+            full_text = SourceImporter.extract_text_from_html(path, main_content=False)
+
+        self.assertIn("Écouter un cours sous forme de podcast", text)
+        self.assertNotIn("Mentions légales", text)
+        self.assertIn("Mentions légales", full_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
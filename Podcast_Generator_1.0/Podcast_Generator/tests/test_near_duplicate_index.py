@@ -0,0 +1,54 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import NearDuplicateIndex
+
+PARAGRAPH = ("Les podcasts éducatifs permettent de réviser un cours en marchant, en cuisinant ou dans les transports. "
+             "Chaque épisode reprend un chapitre et se termine par trois questions de révision. ")
+OTHER = ("La photosynthèse permet aux plantes de produire du sucre à partir de lumière, d'eau et de dioxyde de carbone. "
+         "Elle rejette de l'oxygène et se déroule dans les chloroplastes des feuilles. ")
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+
+    def test_query_finds_near_duplicates_only(self):
+        """Texte légèrement modifié retrouvé ; texte différent ignoré"""
+        index = NearDuplicateIndex.NearDuplicateIndex()
+        index.add("cours#0", PARAGRAPH * 3)
+        index.add("bio#0", OTHER * 3)
+
+        edited = (PARAGRAPH * 3).replace("trois questions", "quatre questions", 1)
+        matches = index.query(edited)
+        self.assertEqual([key for key, _ in matches], ["cours#0"])
+        self.assertGreaterEqual(matches[0][1], index.threshold)
+        self.assertIsNone(index.find_duplicate("Un texte sans rapport : recette de la tarte aux pommes. " * 4))
+        self.assertEqual(len(index), 2)
+
+    def test_signatures_are_reproducible(self):
+        """Même graine : signatures comparables entre deux index (ex : deux processus)"""
+        first = NearDuplicateIndex.NearDuplicateIndex().signature(OTHER)
+        second = NearDuplicateIndex.NearDuplicateIndex().signature(OTHER)
+        self.assertTrue((first == second).all())
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex.NearDuplicateIndex(num_perm=100, bands=16)
+
+    def test_deduplicate_chunks_across_documents(self):
+        """Doublons retirés dans un document puis d'un document à l'autre via un index partagé ; texte sans espaces"""
+        japanese = "ポッドキャストは通勤中に授業を復習するのに役立ちます。" * 6
+        report = {}
+        index = NearDuplicateIndex.NearDuplicateIndex()
+        kept = NearDuplicateIndex.deduplicate_chunks([PARAGRAPH, japanese, PARAGRAPH + " ", japanese],
+                                                     index=index, key_prefix="a.pdf", report=report)
+        self.assertEqual(kept, [PARAGRAPH, japanese])
+        self.assertEqual(report["removed"], 2)
+        self.assertEqual(report["duplicates"], [(2, "a.pdf#0"), (3, "a.pdf#1")])
+
+        kept = NearDuplicateIndex.deduplicate_chunks([OTHER, PARAGRAPH], index=index, key_prefix="b.pdf")
+        self.assertEqual(kept, [OTHER])
+        self.assertEqual(len(index), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -119,6 +119,48 @@ class TestPodcastScriptGeneratorExtended:
         assert isinstance(script["parts"], list)
         assert len(script["parts"]) == 4
 
+    def test_create_script_rag_modulaire_top_chunks_mmr_budget(self, tmp_path, monkeypatch):
+        """Extraits choisis par MMR : doublon écarté, budget de tokens respecté dans chaque prompt ;
+        avec un index vectoriel, les vecteurs conservés sont réutilisés sans réencoder les candidats"""
+        import numpy as np
+        import tiktoken
+        from Podcast_Generator.VectorIndex import VectorIndex
+        relevant = "Les réseaux de neurones apprennent à partir d'exemples annotés. " * 5
+        other = "La rétropropagation ajuste les poids couche par couche. " * 5
+        far = "Le podcast se termine par trois questions de révision. " * 5
+        vectors = {relevant: [1.0, 0.1, 0.0], other: [0.6, -0.8, 0.0], far: [0.0, 0.0, 1.0]}
+        for key, content in (("summary", ["Résumé global", relevant, relevant, other, far]),
+                             ("keywords", ["réseaux"]), ("themes", ["apprentissage"])):
+            (tmp_path / f"{key}.json").write_text(json.dumps(content), encoding="utf-8")
+
+        encoded = []
+
+        class FakeEmbeddingService:
+            def encode(self, texts):
+                if isinstance(texts, str):
+                    return np.array([1.0, 0.0, 0.0], dtype=np.float32)
+                encoded.append(len(texts))
+                matrix = np.array([vectors[text] for text in texts], dtype=np.float32)
+                return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+        prompts = []
+        monkeypatch.setattr(psg, "get_embedding_service", lambda: FakeEmbeddingService())
+        monkeypatch.setattr(psg, "call_model", lambda prompt, **kwargs: prompts.append(prompt) or "Texte.")
+        enc = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        budget = 2 * len(enc.encode(f"\n- {relevant}")) + 5
+
+        psg.create_script_rag_modulaire(str(tmp_path), output_language="fr", top_chunks_token_budget=budget)
+        assert len(prompts) == 6
+        assert all(prompt.count(relevant) == 1 and other in prompt and far not in prompt for prompt in prompts)
+
+        encoded.clear()
+        prompts.clear()
+        index = VectorIndex(tmp_path / "index", "fake-model")
+        psg.create_script_rag_modulaire(str(tmp_path), output_language="fr", top_chunks_token_budget=budget, vector_index=index)
+        assert encoded == [4]
+        assert len(prompts) == 6
+        assert all(prompt.count(relevant) == 1 and other in prompt and far not in prompt for prompt in prompts)
+
     def test_save_and_load_script(self, tmp_path):
         dummy_script = {
             "intro": "Introduction de test.",
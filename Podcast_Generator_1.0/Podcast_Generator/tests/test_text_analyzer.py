@@ -1,5 +1,7 @@
 import unittest
+import tempfile
 from pathlib import Path
+from unittest import mock
 from Podcast_Generator import TextAnalyzer, LocalIAIManager, SourceImporter
 
 class TestTextAnalyzerFunctional(unittest.TestCase):
@@ -75,5 +77,131 @@ class TestTextAnalyzerFunctional(unittest.TestCase):
         self.assertIsInstance(grouped, list)
         self.assertGreater(len(grouped), 0)
 
+    def test_split_text_into_token_chunks(self):
+        chunks = TextAnalyzer.split_text_into_token_chunks(self.text * 10, chunk_token_limit=32)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(" ".join(chunks).split(), (self.text * 10).split())
+
+    def test_iter_token_chunks_matches_full_reencoding(self):
+        import tiktoken
+        enc = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        pages = [self.text, "Chapitre 2 : (suite) 1234 éléments...", self.text * 3]
+        expected, current = [], []
+        for word in " ".join(pages).split():
+            current.append(word)
+            if len(enc.encode(" ".join(current))) >= 40:
+                expected.append(" ".join(current))
+                current = []
+        if current:
+            expected.append(" ".join(current))
+        self.assertEqual(list(TextAnalyzer.iter_token_chunks(iter(pages), chunk_token_limit=40)), expected)
+
+    def test_split_sections_into_token_chunks(self):
+        def section(title, text, children=()):
+            return {"title": title, "level": 1, "text": text, "children": list(children)}
+
+        short = "Une phrase courte."
+        tree = section(None, "", [
+            section("Intro", short),
+            section("Méthode", short),
+            section("Résultats", self.text * 6, [section("Tableau 1", short), section("Tableau 2", short)]),
+        ])
+        chunks = TextAnalyzer.split_sections_into_token_chunks(tree, chunk_token_limit=64)
+        # Deux petites sections regroupées ; la section trop longue découpée, ses sous-sections gardées entières.
+        self.assertEqual(chunks[0], f"Intro\n{short}\n\nMéthode\n{short}")
+        self.assertTrue(chunks[1].startswith("Résultats"))
+        for title in ("Tableau 1", "Tableau 2"):
+            self.assertTrue(any(f"{title}\n{short}" in chunk for chunk in chunks))
+        self.assertEqual(" ".join(chunks).split(), SourceImporter.section_tree_text(tree).split())
+
+        flat = section(None, self.text * 10)
+        self.assertEqual(TextAnalyzer.split_sections_into_token_chunks(flat, chunk_token_limit=32),
+                         TextAnalyzer.split_text_into_token_chunks(self.text * 10, chunk_token_limit=32))
+
+    def test_summarize_file_streaming(self):
+        pages = [self.text] * 12
+        with mock.patch.object(SourceImporter, "iter_file_sections", return_value=iter(pages)), \
+                mock.patch.object(LocalIAIManager, "call_model", side_effect=lambda prompt, **kw: prompt[-40:]):
+            summary = TextAnalyzer.summarize_file_streaming("scan.pdf", output_language="fr", chunk_token_limit=64,
+                                                            deduplicate=False)
+        expected_chunks = TextAnalyzer.split_text_into_token_chunks(" ".join(pages), chunk_token_limit=64)
+        self.assertEqual(len(summary), len(expected_chunks) + 1)
+        self.assertTrue(all(isinstance(x, str) and x for x in summary))
+
+    def test_summarize_skips_duplicate_chunks(self):
+        """Passages répétés : un seul résumé partiel par passage distinct"""
+        other = ("La photosynthèse permet aux plantes de produire du sucre à partir de lumière, "
+                 "d'eau et de dioxyde de carbone, en rejetant de l'oxygène.")
+        text = "\n".join([self.text, other, self.text, self.text, other])
+        with mock.patch.object(TextAnalyzer, "split_text_into_token_chunks", return_value=text.split("\n")), \
+                mock.patch.object(LocalIAIManager, "call_model", side_effect=lambda prompt, **kw: prompt[-40:]) as call:
+            summary = TextAnalyzer.summarize_with_meta_summary(text, output_language="fr")
+        self.assertEqual(len(summary), 3)
+        self.assertEqual(call.call_count, 3)
+
+        with mock.patch.object(SourceImporter, "iter_file_sections", return_value=iter([self.text] * 12)), \
+                mock.patch.object(LocalIAIManager, "call_model", side_effect=lambda prompt, **kw: prompt[-40:]):
+            summary = TextAnalyzer.summarize_file_streaming("scan.pdf", output_language="fr", chunk_token_limit=64)
+        self.assertLess(len(summary), len(TextAnalyzer.split_text_into_token_chunks(" ".join([self.text] * 12), 64)) + 1)
+
+    def test_summarize_corpus(self):
+        sources = ["doc_a.txt", "doc_b.txt", "vide.txt"]
+        texts = {"doc_a.txt": self.text * 20, "doc_b.txt": self.text, "vide.txt": ""}
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(SourceImporter, "extract_file_handler", side_effect=lambda p, **kwargs: texts[p]), \
+                mock.patch.object(LocalIAIManager, "call_model", return_value="- intelligence artificielle"):
+            report = TextAnalyzer.summarize_corpus(
+                sources, output_language="fr", chunk_token_limit=64, max_workers=3, output_dir=tmp, deduplicate=False
+            )
+            doc_a = report["documents"]["doc_a.txt"]
+            self.assertIsNone(doc_a["error"])
+            self.assertGreater(doc_a["chunks"], 1)
+            bundle = TextAnalyzer.load_summary_bundle_from_folder(doc_a["folder"])
+            self.assertEqual(len(bundle["summary"]), doc_a["chunks"] + 1)
+            self.assertIsNone(report["documents"]["doc_b.txt"]["error"])
+            self.assertIsNotNone(report["documents"]["vide.txt"]["error"])
+            self.assertEqual(report["llm_tasks"], sum(d["llm_tasks"] for d in report["documents"].values()))
+
+    def test_summarize_corpus_skips_duplicates_across_documents(self):
+        """Chunk déjà vu dans un autre document du corpus : non résumé une seconde fois"""
+        other = ("La photosynthèse permet aux plantes de produire du sucre à partir de lumière, "
+                 "d'eau et de dioxyde de carbone, en rejetant de l'oxygène.")
+        chunks = {"doc_a.txt": [self.text], "doc_b.txt": [self.text, other], "copie.txt": [self.text]}
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(TextAnalyzer, "_extract_and_chunk", side_effect=lambda source, *args: ("fr", chunks[source])), \
+                mock.patch.object(LocalIAIManager, "call_model", return_value="- intelligence artificielle"):
+            report = TextAnalyzer.summarize_corpus(list(chunks), max_workers=1, output_dir=tmp)
+        documents = report["documents"]
+        self.assertEqual(documents["doc_b.txt"]["chunks"], 1)
+        self.assertEqual(documents["doc_b.txt"]["duplicate_chunks"], 1)
+        # Document entièrement en double : résumé malgré tout pour produire son dossier.
+        self.assertEqual(documents["copie.txt"]["chunks"], 1)
+        self.assertTrue(all(d["error"] is None for d in documents.values()))
+
+    def test_summarize_corpus_deduplicates_in_document_order(self):
+        """Extractions terminées dans le désordre : doublons retirés dans l'ordre des documents, erreur non bloquante"""
+        import time
+
+        other = ("La photosynthèse permet aux plantes de produire du sucre à partir de lumière, "
+                 "d'eau et de dioxyde de carbone, en rejetant de l'oxygène.")
+        chunks = {"lent.txt": [self.text], "erreur.txt": None, "rapide.txt": [other, self.text]}
+
+        def extract(source, *args):
+            if source == "lent.txt":
+                time.sleep(0.5)
+            if chunks[source] is None:
+                raise ValueError("fichier illisible")
+            return "fr", chunks[source]
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(TextAnalyzer, "_extract_and_chunk", side_effect=extract), \
+                mock.patch.object(LocalIAIManager, "call_model", return_value="- intelligence artificielle"):
+            report = TextAnalyzer.summarize_corpus(list(chunks), max_workers=3, output_dir=tmp)
+        documents = report["documents"]
+        self.assertEqual((documents["lent.txt"]["chunks"], documents["lent.txt"]["duplicate_chunks"]), (1, 0))
+        self.assertEqual((documents["rapide.txt"]["chunks"], documents["rapide.txt"]["duplicate_chunks"]), (1, 1))
+        self.assertEqual(documents["erreur.txt"]["error"], "fichier illisible")
+        self.assertIsNone(documents["rapide.txt"]["error"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import VectorIndex
+
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def unit_vectors(count, dimension=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class FakeEmbeddingService:
+    """Encodeur factice : vecteurs déterministes dérivés du texte, textes encodés comptés."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        self.encoded += len(texts)
+        vectors = np.array([unit_vectors(1, seed=zlib.crc32(text.encode("utf-8")))[0] for text in texts])
+        return vectors[0] if single else vectors
+
+
+class TestVectorIndex(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+    def test_search_matches_brute_force(self):
+        """Recherche exacte : mêmes résultats qu'un calcul direct, filtrage par source"""
+        vectors = unit_vectors(300)
+        index = VectorIndex.VectorIndex(self.directory, MODEL)
+        index.add("doc_a", [f"a{i}" for i in range(200)], vectors[:200])
+        index.add("doc_b", [f"b{i}" for i in range(100)], vectors[200:])
+        query = vectors[42] + 0.1 * vectors[250]
+        query /= np.linalg.norm(query)
+
+        expected = np.argsort(-(vectors @ query))[:5]
+        hits = index.search(query, top_k=5)
+        self.assertEqual([hit["row"] for hit in hits], expected.tolist())
+        self.assertEqual(hits[0]["text"], "a42")
+        self.assertAlmostEqual(hits[0]["score"], float(vectors[42] @ query), places=5)
+        self.assertNotIn("vector", hits[0])
+        hits = index.search(query, top_k=5, with_vectors=True)
+        np.testing.assert_array_equal(np.array([hit["vector"] for hit in hits]), vectors[expected])
+
+        hits = index.search(query, top_k=3, sources=["doc_b"])
+        self.assertEqual([hit["row"] for hit in hits], (200 + np.argsort(-(vectors[200:] @ query))[:3]).tolist())
+        self.assertTrue(all(hit["source"] == "doc_b" for hit in hits))
+        self.assertEqual(index.search(query, top_k=3, sources=["inconnue"]), [])
+
+    def test_remove_persist_and_compact(self):
+        """Suppression marquée puis compactée ; index rechargé identique ; lignes orphelines retirées"""
+        vectors = unit_vectors(30)
+        index = VectorIndex.VectorIndex(self.directory, MODEL)
+        index.add("doc_a", [f"a{i}" for i in range(10)], vectors[:10])
+        index.add("doc_b", [f"b{i}" for i in range(20)], vectors[10:])
+        self.assertEqual(index.remove("doc_a"), 10)
+        self.assertEqual(index.remove("doc_a"), 0)
+        self.assertEqual(index.sources(), {"doc_b": 20})
+        self.assertTrue(all(hit["source"] == "doc_b" for hit in index.search(vectors[3], top_k=30)))
+
+        # Vecteurs écrits sans index (écriture interrompue) : ignorés au rechargement.
+        with open(Path(self.directory) / "vectors.f32", "ab") as f:
+            f.write(vectors[:2].tobytes())
+        with open(Path(self.directory) / "rows.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"source": "doc_c", "text": "c0"}\n{"source": "doc_c", "text": "c1"}\n')
+        reopened = VectorIndex.VectorIndex(self.directory, MODEL)
+        self.assertEqual(len(reopened), 20)
+        self.assertEqual(reopened.sources(), {"doc_b": 20})
+        self.assertEqual(reopened.search(vectors[15], top_k=1)[0]["text"], "b5")
+
+        self.assertEqual(reopened.compact(), 10)
+        hit = reopened.search(vectors[15], top_k=1)[0]
+        self.assertEqual((hit["row"], hit["text"]), (5, "b5"))
+        self.assertEqual(len(VectorIndex.VectorIndex(self.directory, MODEL)), 20)
+        with self.assertRaises(ValueError):
+            reopened.add("doc_c", ["c"], unit_vectors(1, dimension=8))
+
+    def test_compact_interrupted_and_lost_index(self):
+        """Compactage interrompu : index précédent intact ; index absent ou illisible : données jamais tronquées"""
+        from unittest import mock
+
+        vectors = unit_vectors(30)
+        index = VectorIndex.VectorIndex(self.directory, MODEL)
+        index.add("doc_a", [f"a{i}" for i in range(10)], vectors[:10])
+        index.add("doc_b", [f"b{i}" for i in range(20)], vectors[10:])
+        index.remove("doc_a")
+
+        # Interruption après l'écriture des nouveaux fichiers, avant celle de l'index.
+        with mock.patch.object(VectorIndex.VectorIndex, "_save", side_effect=OSError("disque plein")):
+            with self.assertRaises(OSError):
+                index.compact()
+        reopened = VectorIndex.VectorIndex(self.directory, MODEL)
+        self.assertEqual(reopened.sources(), {"doc_b": 20})
+        self.assertEqual(reopened.search(vectors[15], top_k=1)[0]["text"], "b5")
+        self.assertEqual(sorted(path.name for path in Path(self.directory).iterdir()), ["index.json", "rows.jsonl", "vectors.f32"])
+
+        self.assertEqual(reopened.compact(), 10)
+        self.assertEqual(sorted(path.name for path in Path(self.directory).iterdir()), ["index.json", "rows.1.jsonl", "vectors.1.f32"])
+        self.assertEqual(json.loads((Path(self.directory) / "index.json").read_text(encoding="utf-8"))["generation"], 1)
+        self.assertEqual(VectorIndex.VectorIndex(self.directory, MODEL).search(vectors[15], top_k=1)[0]["text"], "b5")
+
+        sizes = {path.name: path.stat().st_size for path in Path(self.directory).iterdir() if path.name != "index.json"}
+        (Path(self.directory) / "index.json").write_text("{", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            VectorIndex.VectorIndex(self.directory, MODEL)
+        (Path(self.directory) / "index.json").unlink()
+        with self.assertRaises(ValueError):
+            VectorIndex.VectorIndex(self.directory, MODEL)
+        self.assertEqual({path.name: path.stat().st_size for path in Path(self.directory).iterdir()}, sizes)
+
+    def test_ivf_recall(self):
+        """IVF : vecteurs ajoutés après construction rangés au fil de l'eau, rappel élevé en parcourant peu de listes"""
+        rng = np.random.default_rng(1)
+        centers = unit_vectors(20, seed=2)
+        vectors = centers[rng.integers(0, 20, size=4000)] + 0.05 * rng.normal(size=(4000, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        index = VectorIndex.VectorIndex(self.directory, MODEL)
+        index.add("corpus", [str(i) for i in range(3000)], vectors[:3000])
+        self.assertEqual(index.build_ivf(n_lists=20), 20)
+        index.add("corpus_2", [str(i) for i in range(3000, 4000)], vectors[3000:])
+        index = VectorIndex.VectorIndex(self.directory, MODEL)
+
+        recall = []
+        for query in unit_vectors(50, seed=3) * 0.3 + centers[rng.integers(0, 20, size=50)]:
+            query /= np.linalg.norm(query)
+            expected = set(np.argsort(-(vectors @ query))[:10].tolist())
+            found = {hit["row"] for hit in index.search(query, top_k=10, nprobe=4)}
+            recall.append(len(found & expected) / 10)
+        self.assertGreaterEqual(np.mean(recall), 0.9)
+
+    def test_index_summary_folders(self):
+        """Dossiers de résumés indexés une fois ; dossier modifié réindexé"""
+        folders = []
+        for name, chunks in (("run_1", ["Intro IA", "Réseaux de neurones"]), ("run_2", ["Photosynthèse", "Chloroplastes"])):
+            folder = Path(self.directory) / name
+            folder.mkdir()
+            for key, content in (("summary", ["Résumé global"] + chunks), ("keywords", ["mot"]), ("themes", ["thème"])):
+                (folder / f"{key}.json").write_text(json.dumps(content), encoding="utf-8")
+            folders.append(str(folder))
+
+        service = FakeEmbeddingService()
+        index = VectorIndex.VectorIndex(Path(self.directory) / "index", MODEL)
+        VectorIndex.index_summary_folders(folders, index, service)
+        self.assertEqual(len(index), 4)
+        VectorIndex.index_summary_folders(folders, index, service)
+        self.assertEqual(service.encoded, 4)
+
+        (Path(folders[1]) / "summary.json").write_text(json.dumps(["Résumé global", "Chlorophylle"]), encoding="utf-8")
+        VectorIndex.index_summary_folders(folders, index, service)
+        self.assertEqual(index.sources(), {str(Path(folders[0]).resolve()): 2, str(Path(folders[1]).resolve()): 1})
+        hit = index.search(service.encode("Chlorophylle"), top_k=1)[0]
+        self.assertEqual((hit["text"], hit["source"]), ("Chlorophylle", str(Path(folders[1]).resolve())))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+from unittest import mock
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from Podcast_Generator import SourceImporter
+
+ARTICLE = "Les podcasts éducatifs permettent de réviser un cours en marchant. " * 10
+
+# Pages servies par le serveur local de test.
+PAGES = {
+    "/article": ("text/html; charset=utf-8",
+                 f"<html><head><title>Article</title><style>p {{ color: red; }}</style></head>"
+                 f"<body><div id='onetrust-banner-sdk'>Accepter les cookies</div>"
+                 f"<article><h1>Titre</h1><p>{ARTICLE}</p></article><script>var x = 1;</script></body></html>"),
+    "/spa": ("text/html; charset=utf-8",
+             "<html><body><noscript>You need to enable JavaScript to run this app.</noscript>"
+             "<div id='root'></div><script>" + "render();" * 500 + "</script></body></html>"),
+    "/image": ("image/png", "not html"),
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+        content_type, body = PAGES[self.path]
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeDriver:
+    """Session de navigateur factice pour tester le WebDriverPool sans Chrome."""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.switch_to = mock.MagicMock()
+        self.cookies_cleared = 0
+        self.closed = False
+
+    def set_page_load_timeout(self, timeout):
+        self.page_load_timeout = timeout
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def execute_script(self, script):
+        return None
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        self.closed = True
+
+
+class TestWebImport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Serveur HTTP local : aucun accès réseau ni navigateur nécessaire.
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_static_page_without_browser(self):
+        """Page HTML statique : texte extrait par requête HTTP, sans lancer le navigateur"""
+        with mock.patch.object(SourceImporter, "extract_text_from_web_browser") as browser:
+            text = SourceImporter.extract_text_from_web(self.base_url + "/article")
+
+        browser.assert_not_called()
+        self.assertIn("Titre", text)
+        self.assertIn(ARTICLE.strip(), text)
+        self.assertNotIn("Accepter les cookies", text)
+        self.assertNotIn("var x", text)
+        self.assertNotIn("color", text)
+
+    def test_js_rendered_page_escalates_to_browser(self):
+        """Application JavaScript, contenu non HTML ou erreur HTTP : passage au navigateur"""
+        for path in ("/spa", "/image", "/missing"):
+            with mock.patch.object(SourceImporter, "extract_text_from_web_browser", return_value="rendu") as browser:
+                self.assertEqual(SourceImporter.extract_text_from_web(self.base_url + path), "rendu")
+            browser.assert_called_once_with(self.base_url + path, main_content=True, report=None)
+
+    def test_force_browser(self):
+        with mock.patch.object(SourceImporter, "extract_text_from_web_static") as static, \
+                mock.patch.object(SourceImporter, "extract_text_from_web_browser", return_value="rendu"):
+            self.assertEqual(SourceImporter.extract_text_from_web(self.base_url + "/article", force_browser=True), "rendu")
+        static.assert_not_called()
+
+    def test_extract_urls_reuses_browser_sessions(self):
+        """Lot d'URLs : au plus `size` navigateurs créés et réutilisés, nettoyés entre les pages, erreurs isolées"""
+        drivers = []
+
+        def factory():
+            drivers.append(_FakeDriver())
+            return drivers[-1]
+
+        def fake_browser(url, driver=None, timeout=None, main_content=True):
+            self.assertIn(driver, drivers)
+            if url.endswith("/3"):
+                raise RuntimeError("page inaccessible")
+            return f"texte {url}"
+
+        urls = [f"{self.base_url}/page/{i}" for i in range(8)]
+        pool = SourceImporter.WebDriverPool(size=2, driver_factory=factory)
+        with mock.patch.object(SourceImporter, "extract_text_from_web_browser", side_effect=fake_browser):
+            results = SourceImporter.extract_urls(urls, max_workers=4, timeout=5, driver_pool=pool, force_browser=True)
+
+        self.assertEqual(list(results), urls)
+        self.assertLessEqual(len(drivers), 2)
+        self.assertIn("page inaccessible", results[urls[3]]["error"])
+        self.assertEqual(results[urls[0]]["text"], f"texte {urls[0]}")
+        self.assertTrue(all(driver.page_load_timeout == 5 for driver in drivers))
+        # Sept pages réussies : chacune suivie d'un nettoyage de la session ; la session en erreur est fermée.
+        self.assertEqual(sum(driver.cookies_cleared for driver in drivers), 7)
+        self.assertEqual(sum(driver.closed for driver in drivers), 1)
+
+        pool.close()
+        self.assertTrue(all(driver.closed for driver in drivers))
+
+    def test_extract_urls_http_then_browser(self):
+        """Page statique par HTTP, application JavaScript par le navigateur du pool"""
+        pool = SourceImporter.WebDriverPool(size=1, driver_factory=_FakeDriver)
+        with mock.patch.object(SourceImporter, "extract_text_from_web_browser", return_value="rendu") as browser:
+            results = SourceImporter.extract_urls([self.base_url + "/article", self.base_url + "/spa"], driver_pool=pool)
+        pool.close()
+
+        self.assertEqual(results[self.base_url + "/article"]["method"], "http")
+        self.assertIn("Titre", results[self.base_url + "/article"]["text"])
+        self.assertEqual(results[self.base_url + "/spa"]["method"], "browser")
+        self.assertEqual(results[self.base_url + "/spa"]["text"], "rendu")
+        browser.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()